@@ -0,0 +1,41 @@
+"""add woot_porf_ingest_jobs"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "011_add_porf_ingest_jobs"
+down_revision = "010_add_order_records"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "woot_porf_ingest_jobs",
+        sa.Column("id", sa.String(length=32), primary_key=True),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="wootporfingeststatus"
+            ),
+            nullable=False,
+        ),
+        sa.Column("filename", sa.String(length=255), nullable=True),
+        sa.Column("upload_path", sa.String(length=500), nullable=False),
+        sa.Column("porf_id", sa.Integer(), nullable=True),
+        sa.Column("sheet_url", sa.String(length=500), nullable=True),
+        sa.Column("rows_parsed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_stored", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "sheet_rows_written", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column("errors", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("woot_porf_ingest_jobs")
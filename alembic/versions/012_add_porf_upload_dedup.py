@@ -0,0 +1,37 @@
+"""add woot_porf_uploads and ingest job content hash"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "012_add_porf_upload_dedup"
+down_revision = "011_add_porf_ingest_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "woot_porf_uploads",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sha256", sa.String(length=64), nullable=False, unique=True),
+        sa.Column("porf_id", sa.Integer(), nullable=False),
+        sa.Column("sheet_url", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    with op.batch_alter_table("woot_porf_ingest_jobs") as batch:
+        batch.add_column(sa.Column("sha256", sa.String(length=64), nullable=True))
+        batch.add_column(
+            sa.Column(
+                "duplicate", sa.Boolean(), nullable=False, server_default=sa.false()
+            )
+        )
+        batch.create_index("ix_woot_porf_ingest_jobs_sha256", ["sha256"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("woot_porf_ingest_jobs") as batch:
+        batch.drop_index("ix_woot_porf_ingest_jobs_sha256")
+        batch.drop_column("duplicate")
+        batch.drop_column("sha256")
+    op.drop_table("woot_porf_uploads")
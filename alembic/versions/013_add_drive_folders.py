@@ -0,0 +1,29 @@
+"""add drive_folders cache table"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "013_add_drive_folders"
+down_revision = "012_add_porf_upload_dedup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "drive_folders",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("path", sa.String(length=500), nullable=False, unique=True),
+        sa.Column("folder_id", sa.String(length=100), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("external_id", sa.String(length=255), nullable=True, unique=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(op.f("ix_drive_folders_folder_id"), "drive_folders", ["folder_id"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_drive_folders_folder_id"), table_name="drive_folders")
+    op.drop_table("drive_folders")
@@ -0,0 +1,35 @@
+"""add materialized inventory_levels"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "015_add_inventory_levels"
+down_revision = "014_add_sync_cursors"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_levels",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "product_id",
+            sa.Integer(),
+            sa.ForeignKey("master_products.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("channel", sa.String(length=50), nullable=False),
+        sa.Column("on_hand", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_record_id", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("external_id", sa.String(length=255), nullable=True, unique=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("product_id", "channel", name="uq_inventory_levels_product_channel"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("inventory_levels")
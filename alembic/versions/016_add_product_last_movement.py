@@ -0,0 +1,34 @@
+"""add master_products.last_movement_at with composite index"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "016_add_product_last_movement"
+down_revision = "015_add_inventory_levels"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("master_products") as batch:
+        batch.add_column(sa.Column("last_movement_at", sa.DateTime(), nullable=True))
+    op.execute("UPDATE master_products SET last_movement_at = created_at")
+    op.execute(
+        """
+        UPDATE master_products SET last_movement_at = newest.moved_at
+        FROM (
+            SELECT product_id, MAX(created_at) AS moved_at FROM inventory_records GROUP BY product_id
+        ) AS newest
+        WHERE master_products.id = newest.product_id AND newest.moved_at > master_products.created_at
+        """
+    )
+    with op.batch_alter_table("master_products") as batch:
+        batch.alter_column("last_movement_at", existing_type=sa.DateTime(), nullable=False)
+        batch.create_index("ix_master_products_last_movement_at_id", ["last_movement_at", "id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("master_products") as batch:
+        batch.drop_index("ix_master_products_last_movement_at_id")
+        batch.drop_column("last_movement_at")
@@ -0,0 +1,46 @@
+"""score reallocation candidates and make (product_id, from_channel) unique"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "017_reallocation_candidate_scores"
+down_revision = "016_add_product_last_movement"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the newest row of any duplicate pair so the unique constraint can be added.
+    op.execute(
+        """
+        DELETE FROM reallocation_candidates WHERE id NOT IN (
+            SELECT MAX(id) FROM reallocation_candidates GROUP BY product_id, from_channel
+        )
+        """
+    )
+    with op.batch_alter_table("reallocation_candidates") as batch:
+        batch.add_column(sa.Column("score", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("on_hand", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("days_of_cover", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("idle_days", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("value_at_risk", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch.add_column(sa.Column("external_id", sa.String(length=255), nullable=True))
+        batch.add_column(
+            sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now())
+        )
+        # Batch mode on SQLite needs every constraint named, so not ``unique=True`` above.
+        batch.create_unique_constraint("uq_reallocation_candidates_external_id", ["external_id"])
+        batch.create_unique_constraint(
+            "uq_reallocation_candidates_product_channel", ["product_id", "from_channel"]
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("reallocation_candidates") as batch:
+        batch.drop_constraint("uq_reallocation_candidates_product_channel", type_="unique")
+        batch.drop_constraint("uq_reallocation_candidates_external_id", type_="unique")
+        for column in ("updated_at", "external_id", "is_active", "value_at_risk", "idle_days", "days_of_cover",
+                       "on_hand", "score"):
+            batch.drop_column(column)
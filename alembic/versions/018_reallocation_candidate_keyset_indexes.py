@@ -0,0 +1,22 @@
+"""keyset indexes for reallocation candidate listing"""
+
+from alembic import op
+
+revision = "018_reallocation_candidate_keyset_indexes"
+down_revision = "017_reallocation_candidate_scores"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_reallocation_candidates_created_at_id", "reallocation_candidates", ["created_at", "id"])
+    op.create_index(
+        "ix_reallocation_candidates_channel_created_at_id",
+        "reallocation_candidates",
+        ["from_channel", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reallocation_candidates_channel_created_at_id", table_name="reallocation_candidates")
+    op.drop_index("ix_reallocation_candidates_created_at_id", table_name="reallocation_candidates")
@@ -0,0 +1,20 @@
+"""indexes backing keyset pages of products' ledger rows, PORFs and POs"""
+
+from alembic import op
+
+revision = "019_add_list_keyset_indexes"
+down_revision = "018_reallocation_candidate_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_inventory_records_product_id_id", "inventory_records", ["product_id", "id"])
+    op.create_index("ix_woot_porfs_created_at_id", "woot_porfs", ["created_at", "id"])
+    op.create_index("ix_woot_pos_created_at_id", "woot_pos", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_woot_pos_created_at_id", table_name="woot_pos")
+    op.drop_index("ix_woot_porfs_created_at_id", table_name="woot_porfs")
+    op.drop_index("ix_inventory_records_product_id_id", table_name="inventory_records")
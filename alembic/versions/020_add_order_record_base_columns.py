@@ -0,0 +1,35 @@
+"""add BaseModel columns to order_records and order_lines"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "020_add_order_record_base_columns"
+down_revision = "019_add_list_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("order_records") as batch:
+        batch.add_column(sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch.add_column(sa.Column("external_id", sa.String(length=255), nullable=True))
+        batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()))
+        batch.create_unique_constraint("uq_order_records_external_id", ["external_id"])
+    with op.batch_alter_table("order_lines") as batch:
+        batch.add_column(sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch.add_column(sa.Column("external_id", sa.String(length=255), nullable=True))
+        batch.add_column(sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()))
+        batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()))
+        batch.create_unique_constraint("uq_order_lines_external_id", ["external_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("order_lines") as batch:
+        batch.drop_constraint("uq_order_lines_external_id", type_="unique")
+        for column in ("updated_at", "created_at", "external_id", "is_active"):
+            batch.drop_column(column)
+    with op.batch_alter_table("order_records") as batch:
+        batch.drop_constraint("uq_order_records_external_id", type_="unique")
+        for column in ("updated_at", "external_id", "is_active"):
+            batch.drop_column(column)
@@ -7,5 +7,6 @@ from app.api.catalog import bp as catalog_bp
 from app.api.export import bp as export_bp
 from app.api.auth import bp as auth_bp
 from app.api.webhook import bp as webhook_bp
+from app.api.insights import bp as insights_bp
 
-__all__ = ["catalog_bp", "export_bp", "auth_bp", "webhook_bp"]
+__all__ = ["catalog_bp", "export_bp", "auth_bp", "webhook_bp", "insights_bp"]
@@ -3,19 +3,47 @@
 Layer: api
 """
 
-from flask import Blueprint, request, jsonify
+from datetime import datetime, timedelta
+
+import click
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from app.core.logic.catalog import CatalogManager
+from app.core.logic.ledger import compact_inventory_ledger
+from app.core.logic.pagination import DEFAULT_PAGE_SIZE, list_query, paginate, parse_fields
 from app.core.models.product import MasterProduct, InventoryRecord
 from app.core.services.sheets import SheetsService
+from app.core.streaming import stream_mimetype, stream_query
 from app.extensions import db
 
 bp = Blueprint('catalog', __name__, url_prefix='/api/catalog')
 
+def _page(model, **kwargs):
+    """Serve one keyset page of ``model`` honouring ``fields``, ``limit`` and ``cursor``.
+
+    With ``Accept: application/x-ndjson`` or ``text/csv`` every matching row
+    is streamed instead, in the same order, and ``limit``/``cursor`` are ignored.
+    """
+    try:
+        fields = parse_fields(request.args.get('fields'), model)
+        mimetype = stream_mimetype(request.accept_mimetypes)
+        if mimetype:
+            rows = stream_query(db.session, list_query(model, fields, **kwargs), fields, mimetype)
+            return Response(stream_with_context(rows), mimetype=mimetype)
+        return jsonify(paginate(
+            db.session,
+            model,
+            fields=fields,
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+            cursor=request.args.get('cursor'),
+            **kwargs,
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
 @bp.route('/products', methods=['GET'])
 def get_products():
-    """Get all products."""
-    session = db.session
-    products = session.query(MasterProduct).all()
-    return jsonify([product.to_dict() for product in products])
+    """List products by id, one page at a time."""
+    return _page(MasterProduct)
 
 @bp.route('/products/<int:product_id>', methods=['GET'])
 def get_product(product_id: int):
@@ -55,18 +83,49 @@ def update_product(product_id: int):
 
 @bp.route('/inventory', methods=['GET'])
 def get_inventory():
-    """Get inventory records."""
-    session = db.session
-    records = session.query(InventoryRecord).all()
-    return jsonify([record.to_dict() for record in records])
+    """List inventory records newest first, optionally for one ``product_id``/``source``."""
+    where = []
+    if request.args.get('product_id'):
+        where.append(InventoryRecord.product_id == request.args.get('product_id', type=int))
+    if request.args.get('source'):
+        where.append(InventoryRecord.source == request.args['source'])
+    return _page(InventoryRecord, descending=True, where=where)
 
 @bp.route('/inventory', methods=['POST'])
 def create_inventory_record():
     """Create a new inventory record."""
     data = request.get_json()
-    session = db.session
-    record = InventoryRecord.from_dict(data)
-    session.add(record)
-    session.commit()
-    session.refresh(record)
-    return jsonify(record.to_dict()), 201 
\ No newline at end of file
+    # Goes through CatalogManager so inventory_levels stays in step with the ledger.
+    record = CatalogManager(db.session).adjust_inventory(
+        product_id=data['product_id'],
+        quantity_delta=data['quantity_delta'],
+        source=data['source'],
+        notes=data.get('notes'),
+    )
+    return jsonify(record.to_dict()), 201
+
+@bp.route('/inventory/levels', methods=['GET'])
+def get_inventory_levels():
+    """Get current on-hand quantities per product and channel."""
+    levels = CatalogManager(db.session).get_inventory_levels(
+        product_id=request.args.get('product_id', type=int),
+        channel=request.args.get('channel'),
+    )
+    return jsonify([level.to_dict() for level in levels])
+
+@bp.cli.command('rebuild-inventory-levels')
+def rebuild_inventory_levels_command():
+    """Recompute inventory_levels and product last-movement times from the ledger."""
+    manager = CatalogManager(db.session)
+    count = manager.rebuild_inventory_levels()
+    manager.refresh_last_movement()
+    click.echo(f'Rebuilt {count} inventory levels')
+
+@bp.cli.command('compact-ledger')
+@click.option('--days', default=365, show_default=True, help='Keep raw ledger rows newer than this.')
+@click.option('--archive-dir', default=None, help='Defaults to LEDGER_ARCHIVE_DIR or ./ledger-archive.')
+def compact_ledger_command(days: int, archive_dir: str):
+    """Roll old inventory ledger rows into checkpoints and archive the originals."""
+    archive_dir = archive_dir or current_app.config.get('LEDGER_ARCHIVE_DIR', 'ledger-archive')
+    result = compact_inventory_ledger(db.session, datetime.utcnow() - timedelta(days=days), archive_dir)
+    click.echo(f"Compacted {result['rows']} rows into {result['checkpoints']} checkpoints ({result['archive']})")
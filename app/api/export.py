@@ -5,18 +5,38 @@ Layer: api
 
 from flask import Blueprint, jsonify, request, current_app
 
+from app.core.logic.pagination import list_query, parse_fields
 from app.core.models.product import InventoryRecord, MasterProduct
 from app.core.services import DriveService
-from app.core.services.google.drive import DriveServiceDisabled
-from app.core.services.sheets import SheetsService
+from app.core.services.google.sheets import SheetsAppendError
+from app.core.services.sheets import SheetColumn, SheetSchema, SheetsService
+from app.core.streaming import iter_batches, spool_csv
 from app.extensions import db
 
 bp = Blueprint("export", __name__, url_prefix="/api/export")
 
-
-@bp.route("/sheets/products", methods=["POST"])
-def export_products_to_sheets():
-    """Export products to Google Sheets."""
+PRODUCT_SHEET = SheetSchema(MasterProduct, [
+    SheetColumn("ID", "id"),
+    SheetColumn("SKU", "sku"),
+    SheetColumn("Title", "title"),
+    SheetColumn("Description", "description"),
+    SheetColumn("Active", "is_active"),
+    SheetColumn("Last Movement", "last_movement_at"),
+    SheetColumn("Created", "created_at"),
+    SheetColumn("Updated", "updated_at"),
+])
+INVENTORY_SHEET = SheetSchema(InventoryRecord, [
+    SheetColumn("ID", "id"),
+    SheetColumn("Product ID", "product_id"),
+    SheetColumn("Quantity Delta", "quantity_delta"),
+    SheetColumn("Source", "source"),
+    SheetColumn("Notes", "notes"),
+    SheetColumn("Created", "created_at"),
+])
+
+
+def _export_to_sheets(schema: SheetSchema):
+    """Append every row of ``schema`` to ``spreadsheet_id``/``range_name`` and report throughput."""
     data = request.get_json()
     spreadsheet_id = data.get("spreadsheet_id")
     range_name = data.get("range_name")
@@ -24,70 +44,69 @@ def export_products_to_sheets():
     if not spreadsheet_id or not range_name:
         return jsonify({"error": "spreadsheet_id and range_name are required"}), 400
 
-    session = db.session
-    products = session.query(MasterProduct).all()
-    data = [product.to_dict() for product in products]
-
     sheets_service = SheetsService(None)  # TODO: Get credentials from config
-    sheets_service.update_sheet_data(spreadsheet_id, range_name, data)
+    try:
+        report = sheets_service.export_schema(
+            db.session, schema, spreadsheet_id, range_name, start_offset=int(data.get("start_offset", 0))
+        )
+    except SheetsAppendError as e:
+        return jsonify({"error": str(e), "committed": e.committed}), 502
 
-    return jsonify({"message": "Export completed successfully"})
+    return jsonify({"message": "Export completed successfully", **report.as_dict()})
+
+
+@bp.route("/sheets/products", methods=["POST"])
+def export_products_to_sheets():
+    """Export products to Google Sheets."""
+    return _export_to_sheets(PRODUCT_SHEET)
 
 
 @bp.route("/sheets/inventory", methods=["POST"])
 def export_inventory_to_sheets():
     """Export inventory records to Google Sheets."""
-    data = request.get_json()
-    spreadsheet_id = data.get("spreadsheet_id")
-    range_name = data.get("range_name")
-
-    if not spreadsheet_id or not range_name:
-        return jsonify({"error": "spreadsheet_id and range_name are required"}), 400
-
-    session = db.session
-    records = session.query(InventoryRecord).all()
-    data = [record.to_dict() for record in records]
+    return _export_to_sheets(INVENTORY_SHEET)
 
-    sheets_service = SheetsService(None)  # TODO: Get credentials from config
-    sheets_service.update_sheet_data(spreadsheet_id, range_name, data)
-
-    return jsonify({"message": "Export completed successfully"})
 
+def _export_to_drive(model, default_filename: str):
+    """Stream every row of ``model`` as CSV into a Drive file.
 
-@bp.route("/drive/products", methods=["POST"])
-def export_products_to_drive():
-    """Export products to Google Drive."""
+    Rows come off a server-side cursor and are written to a spooled temporary
+    file, gzip-compressed when ``gzip`` is true.  The file is then uploaded in
+    resumable chunks, so memory holds one batch of rows or one upload chunk.
+    """
     data = request.get_json()
     folder_id = data.get("folder_id")
-    filename = data.get("filename", "products.csv")
+    compress = bool(data.get("gzip"))
+    filename = data.get("filename", f"{default_filename}.gz" if compress else default_filename)
 
     if not folder_id:
         return jsonify({"error": "folder_id is required"}), 400
 
-    session = db.session
-    products = session.query(MasterProduct).all()
-    data = [product.to_dict() for product in products]
-
-    import csv
-    from io import BytesIO, StringIO
-
-    output = StringIO()
-    if data:
-        writer = csv.DictWriter(output, fieldnames=data[0].keys())
-        writer.writeheader()
-        writer.writerows(data)
-    csv_bytes = BytesIO(output.getvalue().encode())
-
     drive_service = DriveService(None)  # TODO: Get credentials from config
-    try:
-        file = drive_service.upload_file_from_memory(
+    if not drive_service.is_enabled:
+        current_app.logger.info("Drive disabled; skipping upload")
+        return "", 204
+
+    fields = parse_fields(None, model)
+    spool, rows = spool_csv(iter_batches(db.session, list_query(model, fields)), fields, compress=compress)
+    with spool:
+        file = drive_service.upload_stream(
             filename,
-            csv_bytes,
-            "text/csv",
+            spool,
+            "application/gzip" if compress else "text/csv",
             parents=[folder_id],
         )
-    except DriveServiceDisabled:
-        current_app.logger.info("Drive disabled; skipping upload")
-        return "", 204
 
-    return jsonify({"message": "Export completed successfully", "file_id": file["id"]})
+    return jsonify({"message": "Export completed successfully", "file_id": file["id"], "rows_written": rows})
+
+
+@bp.route("/drive/products", methods=["POST"])
+def export_products_to_drive():
+    """Export products to Google Drive as CSV."""
+    return _export_to_drive(MasterProduct, "products.csv")
+
+
+@bp.route("/drive/inventory", methods=["POST"])
+def export_inventory_to_drive():
+    """Export inventory records to Google Drive as CSV."""
+    return _export_to_drive(InventoryRecord, "inventory.csv")
@@ -0,0 +1,96 @@
+"""Insights API endpoints.
+
+Layer: api
+"""
+
+import click
+from flask import Blueprint, jsonify, request
+
+from app.core.insights import InventoryInsights, ReallocationService
+from app.core.logic.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from app.extensions import db
+
+bp = Blueprint("insights", __name__, url_prefix="/api/insights")
+
+
+def _page_args():
+    """Return ``(limit, key)`` from the query string; both pages key on ``(timestamp, id)``.
+
+    Raises:
+        ValueError: If ``cursor`` is malformed or does not hold a two-part key
+    """
+    limit = max(1, min(request.args.get("limit", 100, type=int), MAX_PAGE_SIZE))
+    cursor = request.args.get("cursor")
+    if not cursor:
+        return limit, None
+    key = decode_cursor(cursor)
+    if len(key) != 2:
+        raise ValueError("invalid cursor")
+    return limit, key
+
+
+@bp.route("/slow-movers", methods=["GET"])
+def get_slow_movers():
+    """List products without inventory movement in ``days`` days, stalest first."""
+    days = request.args.get("days", 60, type=int)
+    try:
+        limit, after = _page_args()
+    except ValueError:
+        return jsonify({"error": "invalid cursor"}), 400
+
+    rows, next_key = InventoryInsights(db.session).slow_mover_page(days=days, limit=limit, after=after)
+    # Projected Core rows serialize straight to {"id", "sku", "title", "last_movement_at"}.
+    return jsonify({"items": rows, "next_cursor": encode_cursor(next_key) if next_key else None})
+
+
+@bp.route("/reallocation-candidates", methods=["GET"])
+def get_reallocation_candidates():
+    """List reallocation candidates newest first, filtered by ``channel``/``reason``."""
+    active = request.args.get("active", "true").lower()
+    try:
+        limit, before = _page_args()
+    except ValueError:
+        return jsonify({"error": "invalid cursor"}), 400
+
+    rows, next_key = ReallocationService(db.session).candidate_page(
+        channel=request.args.get("channel"),
+        reason=request.args.get("reason"),
+        active=None if active == "all" else active != "false",
+        limit=limit,
+        before=before,
+    )
+    return jsonify(
+        {
+            "items": [
+                {
+                    "id": row.id,
+                    "product": {"id": row.product.id, "sku": row.product.sku, "title": row.product.title},
+                    "from_channel": row.from_channel,
+                    "reason": row.reason,
+                    "score": row.score,
+                    "on_hand": row.on_hand,
+                    "days_of_cover": row.days_of_cover,
+                    "idle_days": row.idle_days,
+                    "value_at_risk": row.value_at_risk,
+                    "is_active": row.is_active,
+                    "created_at": row.created_at,
+                }
+                for row in rows
+            ],
+            "next_cursor": encode_cursor(next_key) if next_key else None,
+        }
+    )
+
+
+@bp.cli.command("reallocation-candidates")
+@click.option("--min-cover-days", default=90.0, show_default=True, help="Flag stock with at least this much cover.")
+@click.option("--target-cover-days", default=30.0, show_default=True, help="Cover to keep; the rest is at risk.")
+def reallocation_candidates_command(min_cover_days: float, target_cover_days: float):
+    """Score overstocked products per channel and upsert reallocation candidates."""
+    result = ReallocationService(db.session).generate_candidates(
+        min_cover_days=min_cover_days, target_cover_days=target_cover_days
+    )
+    click.echo(
+        f"Scanned {result['scanned']} product/channel pairs: {result['upserted']} candidates, "
+        f"{result['deactivated']} deactivated"
+    )
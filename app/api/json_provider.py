@@ -0,0 +1,27 @@
+"""Flask JSON provider backed by :mod:`app.core.serialization`.
+
+Layer: api
+"""
+
+from typing import Any
+
+from flask.json.provider import JSONProvider
+
+from app.core.serialization import dumps, loads
+
+
+class OrjsonProvider(JSONProvider):
+    """Encode responses with orjson; mapped instances and ``Row`` objects can be returned directly."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response without the bytes -> str -> bytes round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            dumps(obj, indent=self._app.debug), mimetype="application/json"
+        )
@@ -0,0 +1,204 @@
+"""Asynchronous Woot API client.
+
+Layer: channels
+
+:class:`AsyncWootClient` mirrors :class:`~app.channels.woot.client.WootClient`.
+It adds four things:
+
+- a bounded ``httpx`` connection pool
+- explicit timeouts
+- jittered retries that honour ``Retry-After``
+- concurrent page fetching for ``/orders`` and ``/inventory``
+
+Paged endpoints are expected to answer ``{"items": [...], "total_pages": n}``
+when called with ``page``/``per_page``.  A plain list is treated as the whole
+result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["AsyncWootClient", "RETRY_STATUSES"]
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Retrying these cannot create a second order.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Return the ``Retry-After`` delay in seconds, if the header is usable."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class AsyncWootClient:
+    """Async client for the Woot API; use as ``async with AsyncWootClient(...) as client``."""
+
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = "https://api.woot.com/v1",
+        *,
+        max_connections: int = 20,
+        timeout: float | httpx.Timeout = httpx.Timeout(30.0, connect=5.0),
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        page_size: int = 100,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """Initialize the client.
+
+        Args:
+            api_key: Woot API key
+            api_url: Base URL for the Woot API
+            max_connections: Upper bound on open connections (and concurrent pages)
+            timeout: Seconds, or an ``httpx.Timeout`` for per-phase limits
+            max_retries: Retries per request on 429/5xx and transport errors
+            backoff: Base delay for the exponential backoff
+            max_backoff: Cap on any single delay, including ``Retry-After``
+            page_size: ``per_page`` sent to paged endpoints
+            transport: Optional transport (e.g. ``httpx.MockTransport`` in tests)
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.page_size = page_size
+        self._pages = asyncio.Semaphore(max_connections)
+        self._client = httpx.AsyncClient(
+            base_url=api_url.rstrip("/"),
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncWootClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self._client.aclose()
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        hinted = _retry_after(response) if response is not None else None
+        if hinted is not None:
+            return min(hinted, self.max_backoff)
+        # Full jitter keeps concurrent pages from retrying in lockstep.
+        return random.uniform(0, min(self.backoff * 2**attempt, self.max_backoff))
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs: Any) -> Any:
+        """Make a request to the Woot API, retrying transient failures.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            **kwargs: Additional arguments for ``httpx.AsyncClient.request``
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            httpx.HTTPStatusError: If the API answers with an error status
+            httpx.TransportError: If the request cannot be completed
+        """
+        method = method.upper()
+        url = f"/{endpoint.lstrip('/')}"
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if method not in IDEMPOTENT_METHODS or attempt == self.max_retries:
+                    raise
+            else:
+                retryable = response.status_code == 429 or (
+                    response.status_code in RETRY_STATUSES and method in IDEMPOTENT_METHODS
+                )
+                if not retryable or attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response.json()
+            delay = self._delay(attempt, response)
+            logger.info(
+                "Woot %s %s failed (%s); retrying in %.2fs",
+                method,
+                url,
+                response.status_code if response is not None else "transport error",
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    async def _get_page(self, endpoint: str, params: Dict[str, Any], page: int) -> Any:
+        async with self._pages:
+            return await self._make_request(
+                "GET", endpoint, params={**params, "page": page, "per_page": self.page_size}
+            )
+
+    async def _get_all(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Fetch page 1, then every remaining page concurrently, in page order."""
+        params = params or {}
+        first = await self._get_page(endpoint, params, 1)
+        if isinstance(first, list):
+            return first
+        items = list(first.get("items", []))
+        pages = await asyncio.gather(
+            *(self._get_page(endpoint, params, page) for page in range(2, int(first.get("total_pages", 1)) + 1))
+        )
+        for page in pages:
+            items.extend(page.get("items", []))
+        return items
+
+    async def get_inventory(self) -> List[Dict[str, Any]]:
+        """Get current inventory levels across all pages."""
+        return await self._get_all("/inventory")
+
+    async def get_orders(
+        self, start_date: Optional[datetime] = None, updated_since: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Get orders across all pages, optionally filtered by ``start_date``/``updated_since``."""
+        params = {}
+        if start_date:
+            params["start_date"] = start_date.isoformat()
+        if updated_since:
+            params["updated_since"] = updated_since.isoformat()
+        return await self._get_all("/orders", params)
+
+    async def create_order(self, order_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new order (retried only on 429)."""
+        return await self._make_request("POST", "/orders", json=order_data)
+
+    async def update_order(self, order_id: str, order_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update an existing order."""
+        return await self._make_request("PUT", f"/orders/{order_id}", json=order_data)
+
+    async def get_order(self, order_id: str) -> Dict[str, Any]:
+        """Get a single order."""
+        return await self._make_request("GET", f"/orders/{order_id}")
+
+    async def get_order_status(self, order_id: str) -> str:
+        """Get the status of an order."""
+        order = await self.get_order(order_id)
+        return order["status"]
@@ -49,18 +49,32 @@ class WootClient:
         """
         return self._make_request('GET', '/inventory')
     
-    def get_orders(self, start_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    def get_orders(
+        self,
+        start_date: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        page: Optional[int] = None,
+        per_page: int = 100,
+    ) -> Any:
         """Get orders from Woot.
         
         Args:
             start_date: Optional start date to filter orders
+            updated_since: Optional lower bound (inclusive) on order ``updated_at``
+            page: Page to fetch; the answer is then ``{"items": [...], "total_pages": n}``
+            per_page: Orders per page when ``page`` is given
             
         Returns:
-            List of orders
+            List of orders, or one page of them
         """
         params = {}
         if start_date:
             params['start_date'] = start_date.isoformat()
+        if updated_since:
+            params['updated_since'] = updated_since.isoformat()
+        if page:
+            params['page'] = page
+            params['per_page'] = per_page
         
         return self._make_request('GET', '/orders', params=params)
     
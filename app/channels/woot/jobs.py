@@ -0,0 +1,238 @@
+"""Background PORF ingest jobs.
+
+Layer: channels
+
+Uploads are spooled to disk and recorded in ``woot_porf_ingest_jobs``; a
+per-application thread pool then runs :func:`ingest_porf` and writes progress
+back to the job row, so the web worker returns as soon as the file is saved.
+
+A job that fails part-way has its partial PORF discarded.  When a queue
+starts it picks up jobs a dead process left queued or running (see
+:meth:`PorfIngestQueue.recover`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from flask import Flask, current_app
+from sqlalchemy import update
+from werkzeug.datastructures import FileStorage
+
+from app.core.services import DriveService
+from app.core.services.google.folder_cache import get_folder_cache
+from app.core.services.google.ratelimit import background
+from app.core.services.sheets import SheetsService
+from app.extensions import db
+
+from .logic import HASH_BLOCK_SIZE, discard_porf, find_porf_upload, ingest_porf
+from .models import WootPorfIngestJob, WootPorfIngestStatus
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["PorfIngestQueue", "get_ingest_queue"]
+
+_queue_lock = threading.Lock()
+
+PENDING_STATUSES = (WootPorfIngestStatus.QUEUED, WootPorfIngestStatus.RUNNING)
+# Pending jobs untouched for this long when a queue starts belong to a dead process.
+STALE_AFTER = timedelta(minutes=15)
+
+
+class PorfIngestQueue:
+    """In-process worker pool backed by the persistent job table."""
+
+    def __init__(self, app: Flask, max_workers: int = 2) -> None:
+        self._app = app
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="porf-ingest")
+        self._futures: Dict[str, Future] = {}
+        with app.app_context():
+            try:
+                self.recover(app.config.get("PORF_INGEST_STALE_AFTER", STALE_AFTER))
+            finally:
+                db.session.remove()
+
+    def submit(self, upload: FileStorage) -> WootPorfIngestJob:
+        """Spool ``upload`` to disk, record a job and schedule it.
+
+        The upload is hashed while it is spooled.  If identical bytes were
+        ingested before, the job is recorded as an already-succeeded duplicate
+        pointing at the original PORF and nothing is scheduled.  If identical
+        bytes are still queued or running, that job is returned instead.
+        """
+        fd, path = tempfile.mkstemp(prefix="porf-", dir=self._app.config.get("PORF_UPLOAD_DIR"))
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as fh:
+            for block in iter(lambda: upload.stream.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+                fh.write(block)
+        sha256 = digest.hexdigest()
+
+        pending = (
+            db.session.query(WootPorfIngestJob)
+            .filter(WootPorfIngestJob.sha256 == sha256, WootPorfIngestJob.status.in_(PENDING_STATUSES))
+            .order_by(WootPorfIngestJob.created_at)
+            .first()
+        )
+        if pending is not None:
+            os.remove(path)
+            logger.info("PORF upload matches pending ingest job %s", pending.id)
+            return pending
+
+        job = WootPorfIngestJob(filename=upload.filename, upload_path=path, sha256=sha256)
+        existing = find_porf_upload(sha256)
+        if existing is not None:
+            os.remove(path)
+            job.status = WootPorfIngestStatus.SUCCEEDED
+            job.duplicate = True
+            job.porf_id = int(existing["porf_id"])
+            job.sheet_url = existing["sheet_url"]
+            job.finished_at = datetime.utcnow()
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+        if existing is not None:
+            logger.info("PORF upload %s duplicates PORF %s", job_id, existing["porf_id"])
+            return job
+
+        self._schedule(job_id)
+        logger.info("queued PORF ingest job %s", job_id)
+        return job
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> None:
+        """Block until ``job_id`` has finished (if it was queued here)."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def recover(self, stale_after: timedelta = STALE_AFTER) -> int:
+        """Requeue jobs left queued or running by a process that went away.
+
+        Only jobs not updated for ``stale_after`` are touched, so jobs another
+        live process is working on are left alone; each one is claimed with a
+        conditional update so concurrent starts recover it once.  A running
+        job's partial PORF is discarded first.  Jobs whose spooled file is
+        gone are marked failed.
+
+        Returns:
+            Number of jobs requeued
+        """
+        now = datetime.utcnow()
+        stale = (
+            db.session.query(WootPorfIngestJob)
+            .filter(WootPorfIngestJob.status.in_(PENDING_STATUSES), WootPorfIngestJob.updated_at < now - stale_after)
+            .all()
+        )
+        requeued = []
+        drive = DriveService(None, folder_cache=get_folder_cache())
+        for job in stale:
+            claimed = db.session.execute(
+                update(WootPorfIngestJob)
+                .where(WootPorfIngestJob.id == job.id, WootPorfIngestJob.updated_at == job.updated_at)
+                .values(updated_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if not claimed:
+                continue
+            if job.porf_id is not None:
+                discard_porf(job.porf_id, drive)
+            job.porf_id = None
+            job.rows_parsed = job.rows_stored = job.sheet_rows_written = 0
+            if os.path.exists(job.upload_path):
+                job.status = WootPorfIngestStatus.QUEUED
+                requeued.append(job.id)
+            else:
+                job.status = WootPorfIngestStatus.FAILED
+                job.errors = (job.errors or []) + [{"reason": "upload file lost before the job finished"}]
+                job.finished_at = now
+        db.session.commit()
+        for job_id in requeued:
+            self._schedule(job_id)
+        if stale:
+            logger.info("recovered %d stale PORF ingest jobs, requeued %d", len(stale), len(requeued))
+        return len(requeued)
+
+    def _schedule(self, job_id: str) -> None:
+        future = self._executor.submit(self._run, job_id)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(job_id, None))
+
+    def _run(self, job_id: str) -> None:
+        with self._app.app_context():
+            try:
+                self._ingest(job_id)
+            finally:
+                db.session.remove()
+
+    def _ingest(self, job_id: str) -> None:
+        # Claim the job so a recovering process and this one never both run it.
+        claimed = db.session.execute(
+            update(WootPorfIngestJob)
+            .where(WootPorfIngestJob.id == job_id, WootPorfIngestJob.status == WootPorfIngestStatus.QUEUED)
+            .values(status=WootPorfIngestStatus.RUNNING, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            logger.info("PORF ingest job %s already claimed", job_id)
+            return
+        job = db.session.get(WootPorfIngestJob, job_id)
+        drive = DriveService(None, folder_cache=get_folder_cache())
+
+        def progress(porf_id: int, **counts: int) -> None:
+            # Committed with the first chunk, so a failure can find the partial PORF.
+            job.porf_id = porf_id
+            for key, value in counts.items():
+                setattr(job, key, value)
+
+        try:
+            with open(job.upload_path, "rb") as fh, background():
+                result = ingest_porf(
+                    fh,
+                    drive,
+                    SheetsService(None),
+                    progress=progress,
+                    sha256=job.sha256,
+                )
+        except Exception as exc:
+            logger.exception("PORF ingest job %s failed", job_id)
+            db.session.rollback()
+            if job.porf_id is not None and discard_porf(job.porf_id, drive):
+                logger.info("discarded partial PORF %s of job %s", job.porf_id, job_id)
+                job.porf_id = None
+            job.status = WootPorfIngestStatus.FAILED
+            job.errors = (job.errors or []) + [{"reason": str(exc)}]
+        else:
+            job.status = WootPorfIngestStatus.SUCCEEDED
+            job.porf_id = int(result["porf_id"])
+            job.sheet_url = result["sheet_url"]
+            job.errors = result["errors"]
+            job.duplicate = result["duplicate"]
+        finally:
+            if os.path.exists(job.upload_path):
+                os.remove(job.upload_path)
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+
+def get_ingest_queue() -> PorfIngestQueue:
+    """Return the ingest queue of the current application, creating it once."""
+    app = current_app._get_current_object()
+    queue = app.extensions.get("porf_ingest_queue")
+    if queue is None:
+        with _queue_lock:
+            queue = app.extensions.get("porf_ingest_queue")
+            if queue is None:
+                queue = PorfIngestQueue(app, app.config.get("PORF_INGEST_WORKERS", 2))
+                app.extensions["porf_ingest_queue"] = queue
+    return queue
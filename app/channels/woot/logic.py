@@ -6,58 +6,241 @@ Layer: channels
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
 import logging
-from typing import BinaryIO, Dict, List
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from googleapiclient.errors import HttpError
+from openpyxl import load_workbook
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
 
 from app.core.services import DriveService
 from app.core.services.sheets import SheetsService
 from app.extensions import db
 
-from .models import WootPorf, WootPorfLine, WootPorfStatus
+from .models import WootPorf, WootPorfLine, WootPorfStatus, WootPorfUpload
+from .validation import validate_chunk
 
 logger = logging.getLogger(__name__)
 
 TEMPLATE_ID = "TEMPLATE_ID"
+CHUNK_SIZE = 5000
+# Cap on per-cell errors kept in memory and returned to the caller.
+MAX_REPORTED_ERRORS = 1000
+# .xlsx files are zip archives.
+XLSX_MAGIC = b"PK\x03\x04"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_upload(upload_file: BinaryIO) -> str:
+    """Return the SHA-256 of ``upload_file`` read in blocks, rewinding it afterwards."""
+    digest = hashlib.sha256()
+    for block in iter(lambda: upload_file.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    upload_file.seek(0)
+    return digest.hexdigest()
+
+
+def find_porf_upload(sha256: str) -> Optional[Dict[str, Any]]:
+    """Return the result of an earlier ingest of identical bytes, if any."""
+    upload = db.session.query(WootPorfUpload).filter_by(sha256=sha256).one_or_none()
+    if upload is None:
+        return None
+    return {"porf_id": str(upload.porf_id), "sheet_url": upload.sheet_url or "", "errors": [], "duplicate": True}
+
+
+def discard_porf(porf_id: int, drive: Optional[DriveService] = None) -> bool:
+    """Delete a partially ingested PORF, its lines and (when ``drive`` is enabled) its Sheets copy.
+
+    PORFs recorded in ``woot_porf_uploads`` finished ingesting and are left
+    alone.  The caller commits.
+
+    Returns:
+        ``True`` if the PORF was deleted
+    """
+    if db.session.query(WootPorfUpload.id).filter_by(porf_id=porf_id).first() is not None:
+        return False
+    porf = db.session.get(WootPorf, porf_id)
+    if porf is None:
+        return False
+    if porf.sheets_file_id and drive is not None and drive.is_enabled:
+        try:
+            drive.delete_file(porf.sheets_file_id)
+        except HttpError:
+            logger.warning("could not delete Sheets copy %s of PORF %s", porf.sheets_file_id, porf_id)
+    db.session.execute(delete(WootPorfLine).where(WootPorfLine.porf_id == porf_id))
+    db.session.delete(porf)
+    return True
+
+
+def _iter_csv_rows(upload_file: BinaryIO) -> Iterator[Dict[str, str]]:
+    """Yield CSV rows while decoding ``upload_file`` incrementally."""
+    text = io.TextIOWrapper(upload_file, encoding="utf-8", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        # Hand the binary stream back to the caller instead of closing it.
+        text.detach()
+
+
+def _cell_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _iter_xlsx_rows(upload_file: BinaryIO) -> Iterator[Dict[str, str]]:
+    """Yield rows of the active worksheet using openpyxl's read-only mode.
+
+    Cells are streamed from the archive rather than loaded into a workbook
+    DOM and converted to text so they go through the same validation as CSV.
+    """
+    workbook = load_workbook(upload_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_cell_text(value).strip() for value in next(rows, ())]
+        for values in rows:
+            if all(value is None for value in values):
+                continue
+            yield {name: _cell_text(value) for name, value in zip(header, values) if name}
+    finally:
+        workbook.close()
+
+
+def _iter_upload_rows(upload_file: BinaryIO) -> Iterator[Dict[str, str]]:
+    """Yield rows from a CSV or XLSX upload, detected from its leading bytes."""
+    head = upload_file.read(len(XLSX_MAGIC))
+    upload_file.seek(0)
+    if head == XLSX_MAGIC:
+        return _iter_xlsx_rows(upload_file)
+    return _iter_csv_rows(upload_file)
+
+
+def _iter_chunks(rows: Iterable[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    """Group ``rows`` into lists of at most ``size`` items."""
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _canonical_row(line: Dict[str, Any]) -> List[str]:
+    return [
+        line["product_id"],
+        line["product_name"],
+        str(line["quantity"]),
+        str(line["unit_price"]),
+        str(line["total_price"]),
+    ]
+
+
+def _create_porf_sheet(drive: DriveService, sheets: SheetsService, porf_id: int) -> Tuple[str, str]:
+    """Copy the PORF template into the workspace folder.
+
+    Folder IDs may come from the Drive folder cache; if Drive answers 404 the
+    cached workspace is forgotten and the folders are resolved once more.
+    """
+    workspace = drive.ensure_workspace("default")
+    try:
+        dst_folder = drive.ensure_subfolder(workspace, "woot/porfs")
+        return sheets.copy_template(TEMPLATE_ID, f"PORF-{porf_id}", dst_folder)
+    except HttpError as error:
+        if error.resp.status != 404:
+            raise
+        logger.info("PORF folder under %s not found; refreshing folder cache", workspace)
+        drive.forget_folder(workspace)
+
+    workspace = drive.ensure_workspace("default")
+    dst_folder = drive.ensure_subfolder(workspace, "woot/porfs")
+    return sheets.copy_template(TEMPLATE_ID, f"PORF-{porf_id}", dst_folder)
 
 
 def ingest_porf(
-    upload_file: BinaryIO, drive: DriveService, sheets: SheetsService
-) -> Dict[str, str]:
-    """Parse PORF spreadsheet, store rows and create a Sheets copy."""
+    upload_file: BinaryIO,
+    drive: DriveService,
+    sheets: SheetsService,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[Callable[..., None]] = None,
+    sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Parse PORF spreadsheet, store rows and create a Sheets copy.
+
+    CSV and XLSX uploads are accepted.  The upload is decoded and parsed as a stream; lines are written with bulk
+    Core ``INSERT`` statements (and appended to the Sheets copy) ``chunk_size``
+    rows at a time, so peak memory is bounded by the chunk, not the file.
+
+    Each chunk is committed on its own.  ``progress`` is called just before
+    every commit with the running ``porf_id``, ``rows_parsed``,
+    ``rows_stored`` and ``sheet_rows_written`` counts, so changes it makes to
+    objects in the session are persisted together with the chunk.
+
+    Rows are validated per chunk (see :func:`validate_chunk`); invalid rows are
+    skipped and reported in ``errors`` (row, column, reason) rather than
+    aborting the upload.  Prices and totals are stored as exact decimals.
+
+    Uploads are identified by the SHA-256 of their bytes (pass ``sha256`` when
+    it was computed while spooling the file).  Re-uploading identical bytes
+    returns the original ``porf_id``/``sheet_url`` with ``duplicate`` set,
+    without writing lines or calling Google APIs.  If an identical upload
+    finishes first while this one is running, this one's PORF is discarded
+    and the other's result is returned.
+    """
     logger.debug("ingest_porf start")
 
-    reader = csv.DictReader(upload_file.read().decode().splitlines())
-    porf = WootPorf(status=WootPorfStatus.DRAFT)
+    sha256 = sha256 or hash_upload(upload_file)
+    existing = find_porf_upload(sha256)
+    if existing is not None:
+        logger.info("ingest_porf duplicate of PORF %s", existing["porf_id"])
+        return existing
+
+    porf = WootPorf(porf_no=f"UPLOAD-{uuid.uuid4().hex[:12]}", status=WootPorfStatus.DRAFT)
     db.session.add(porf)
-    canonical_rows: List[List[str]] = []
-    for row in reader:
-        line = WootPorfLine(
-            porf=porf,
-            product_id=row.get("product_id", ""),
-            product_name=row.get("product_name", ""),
-            quantity=int(row.get("quantity", 0)),
-            unit_price=float(row.get("unit_price", 0)),
-            total_price=float(row.get("quantity", 0)) * float(row.get("unit_price", 0)),
-        )
-        db.session.add(line)
-        canonical_rows.append(
-            [
-                line.product_id,
-                line.product_name,
-                str(line.quantity),
-                str(line.unit_price),
-                str(line.total_price),
-            ]
-        )
-    db.session.commit()
-    if not drive.is_enabled:
+    db.session.flush()
+
+    sheet_id, url = "", ""
+    if drive.is_enabled:
+        sheet_id, url = _create_porf_sheet(drive, sheets, porf.id)
+        porf.sheets_file_id = sheet_id
+    else:
         logger.info("Drive disabled; skipping upload")
-        return {"porf_id": str(porf.id), "sheet_url": ""}
 
-    workspace = drive.ensure_workspace("default")
-    dst_folder = drive.ensure_subfolder(workspace, "woot/porfs")
-    sheet_id, url = sheets.copy_template(TEMPLATE_ID, f"PORF-{porf.id}", dst_folder)
-    sheets.append_rows(sheet_id, canonical_rows)
+    line_table = WootPorfLine.__table__
+    parsed = stored = written = total_cents = 0
+    errors: List[Dict[str, Any]] = []
+    for chunk in _iter_chunks(_iter_upload_rows(upload_file), chunk_size):
+        checked = validate_chunk(chunk, first_row=parsed + 2)
+        parsed += len(chunk)
+        errors.extend(checked.errors[: MAX_REPORTED_ERRORS - len(errors)])
+        lines = checked.lines(porf.id)
+        if lines:
+            db.session.execute(insert(line_table), lines)
+        stored += len(lines)
+        total_cents += int(checked.total_cents[checked.valid].sum())
+        if sheet_id and lines:
+            written += sheets.append_rows_chunked(sheet_id, (_canonical_row(line) for line in lines))
+        if progress is not None:
+            progress(porf_id=porf.id, rows_parsed=parsed, rows_stored=stored, sheet_rows_written=written)
+        db.session.commit()
+    porf.total_value = Decimal(total_cents).scaleb(-2)
+    db.session.add(WootPorfUpload(sha256=sha256, porf_id=porf.id, sheet_url=url))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Identical bytes finished ingesting while this copy ran; keep theirs.
+        db.session.rollback()
+        discard_porf(porf.id, drive)
+        db.session.commit()
+        existing = find_porf_upload(sha256)
+        logger.info("ingest_porf raced a duplicate of PORF %s; discarded PORF %s", existing["porf_id"], porf.id)
+        return existing
 
-    logger.info("ingest_porf success")
-    return {"porf_id": str(porf.id), "sheet_url": url}
+    logger.info("ingest_porf success: %d of %d lines stored", stored, parsed)
+    return {"porf_id": str(porf.id), "sheet_url": url, "errors": errors, "duplicate": False}
@@ -1,8 +1,11 @@
 """Woot channel models."""
 
+import uuid
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Numeric, JSON, Enum as SQLEnum, Boolean, Text
+from sqlalchemy import (
+    Column, Integer, String, DateTime, ForeignKey, Numeric, JSON, Enum as SQLEnum, Boolean, Text, Index
+)
 from sqlalchemy.orm import relationship
 from typing import Dict, List, Optional, Any
 
@@ -27,6 +30,13 @@ class WootPoStatus(str, Enum):
     CANCELLED = 'cancelled'
     COMPLETED = 'completed'
 
+class WootPorfIngestStatus(str, Enum):
+    """Woot PORF ingest job status enum."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
 class PORF(BaseModel):
     """Purchase Order Request Form model."""
     __tablename__ = 'woot_porfs'
@@ -102,6 +112,7 @@ class POLine(BaseModel):
 class WootPorf(db.Model, ChannelModel):
     """Woot PORF model."""
     __tablename__ = 'woot_porfs'
+    __table_args__ = (Index('ix_woot_porfs_created_at_id', 'created_at', 'id'),)
     
     id = Column(Integer, primary_key=True)
     porf_no = Column(String(50), unique=True, nullable=False)
@@ -147,6 +158,7 @@ class WootPorf(db.Model, ChannelModel):
 class WootPo(db.Model, ChannelModel):
     """Woot PO model."""
     __tablename__ = 'woot_pos'
+    __table_args__ = (Index('ix_woot_pos_created_at_id', 'created_at', 'id'),)
     
     id = Column(Integer, primary_key=True)
     po_no = Column(String(50), unique=True, nullable=False)
@@ -255,4 +267,57 @@ class WootPoLine(db.Model):
             'quantity': self.quantity,
             'unit_price': float(self.unit_price),
             'total_price': float(self.total_price)
-        } 
\ No newline at end of file
+        }
+
+class WootPorfIngestJob(db.Model):
+    """Background PORF ingest job and its progress counters."""
+    __tablename__ = 'woot_porf_ingest_jobs'
+    
+    id = Column(String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    status = Column(SQLEnum(WootPorfIngestStatus), nullable=False, default=WootPorfIngestStatus.QUEUED)
+    filename = Column(String(255))
+    upload_path = Column(String(500), nullable=False)
+    sha256 = Column(String(64), index=True)
+    duplicate = Column(Boolean, nullable=False, default=False)
+    porf_id = Column(Integer)
+    sheet_url = Column(String(500))
+    rows_parsed = Column(Integer, nullable=False, default=0)
+    rows_stored = Column(Integer, nullable=False, default=0)
+    sheet_rows_written = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary.
+        
+        Returns:
+            Dictionary representation
+        """
+        return {
+            'job_id': self.id,
+            'status': self.status.value,
+            'filename': self.filename,
+            'sha256': self.sha256,
+            'duplicate': self.duplicate,
+            'porf_id': self.porf_id,
+            'sheet_url': self.sheet_url,
+            'rows_parsed': self.rows_parsed,
+            'rows_stored': self.rows_stored,
+            'sheet_rows_written': self.sheet_rows_written,
+            'errors': self.errors or [],
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+class WootPorfUpload(db.Model):
+    """Content hash of a successfully ingested PORF upload."""
+    __tablename__ = 'woot_porf_uploads'
+    
+    id = Column(Integer, primary_key=True)
+    sha256 = Column(String(64), unique=True, nullable=False)
+    porf_id = Column(Integer, ForeignKey('woot_porfs.id'), nullable=False)
+    sheet_url = Column(String(500))
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -4,40 +4,102 @@ Layer: channels
 """
 
 import os
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, List, Optional, Any
-from flask import Blueprint, request, jsonify, current_app
+import click
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context, url_for
 from flask_login import login_required, current_user
 from google.oauth2.credentials import Credentials
 
 from app.extensions import db
 from app.channels.woot.models import (
     WootPorf,
+    WootPorfIngestJob,
     WootPo,
     WootPorfStatus,
     WootPoStatus,
     PORF,
     PO,
 )
-from app.channels.woot.service import WootService, WootOrderService
-from app.channels.woot.logic import ingest_porf
+from app.channels.woot.service import WootService, WootOrderService, load_lines, summarize_lines
+from app.channels.woot.client import WootClient
+from app.channels.woot.jobs import get_ingest_queue
+from app.channels.woot.suggest import PorfSuggester
+from app.channels.woot.sync import WootOrderSync
 from app.core.auth.service import AuthService
+from app.core.logic.pagination import DEFAULT_PAGE_SIZE, list_query, paginate, parse_fields
+from app.core.services.google.sheets import SheetsAppendError
 from app.core.services.sheets import SheetsService
-from app.core.services import DriveService
+from app.core.streaming import stream_mimetype, stream_query
 
 bp = Blueprint("woot", __name__, url_prefix="/api/woot")
 
+# Columns listed when no ``fields=`` is given; ``lines=summary|full`` adds line data.
+PORF_LIST_FIELDS = ("id", "porf_no", "status", "total_value", "created_at", "updated_at", "sheets_file_id")
+PO_LIST_FIELDS = (
+    "id", "po_no", "porf_id", "status", "total_ordered", "created_at", "updated_at", "expires_at", "ship_by",
+    "drive_file_id",
+)
+
 
 @bp.route("/porf-upload", methods=["POST"])
 def porf_upload():
-    """Upload and ingest a PORF spreadsheet."""
+    """Queue a PORF spreadsheet for background ingestion.
+
+    Re-uploads of identical bytes answer ``200`` straight away with the
+    original ``porf_id``/``sheet_url`` instead of queueing another ingest.
+    """
     if "file" not in request.files:
         return jsonify({"error": "file required"}), 400
-    file = request.files["file"]
-    drive = DriveService(None)  # TODO: credentials
-    sheets = SheetsService(None)
-    result = ingest_porf(file.stream, drive, sheets)
-    return jsonify(result), 201
+    job = get_ingest_queue().submit(request.files["file"])
+    location = url_for("woot.porf_upload_status", job_id=job.id)
+    status = 200 if job.duplicate else 202
+    return jsonify(job.to_dict()), status, {"Location": location}
+
+
+@bp.route("/porf-upload/<job_id>", methods=["GET"])
+def porf_upload_status(job_id: str):
+    """Report progress of a PORF ingest job."""
+    job = db.session.get(WootPorfIngestJob, job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+
+def _page(model, default_fields, where) -> Dict[str, Any]:
+    """Return one ``created_at``/``id`` keyset page of ``model``, newest first.
+
+    ``lines=summary`` adds SQL-computed line counts and totals to each item;
+    ``lines=full`` embeds the lines.  Either costs one extra query per page.
+    """
+    mode = request.args.get("lines")
+    if mode not in (None, "summary", "full"):
+        raise ValueError("lines must be 'summary' or 'full'")
+    fields = parse_fields(request.args.get("fields"), model, default_fields)
+    if mode and "id" not in fields:
+        fields.insert(0, "id")
+    page = paginate(
+        db.session,
+        model,
+        fields=fields,
+        order_by=("created_at", "id"),
+        descending=True,
+        where=where,
+        limit=request.args.get("limit", DEFAULT_PAGE_SIZE, type=int),
+        cursor=request.args.get("cursor"),
+    )
+    if not mode:
+        return page
+    ids = [item["id"] for item in page["items"]]
+    if mode == "summary":
+        summaries = summarize_lines(model, ids)
+        for item in page["items"]:
+            item.update(summaries[item["id"]])
+    else:
+        lines = load_lines(model, ids)
+        for item in page["items"]:
+            item["lines"] = lines[item["id"]]
+    return page
 
 
 def get_woot_service() -> WootService:
@@ -50,6 +112,8 @@ def get_woot_service() -> WootService:
     credentials = auth_service.get_oauth_token(current_user.id, "google")
     if not credentials:
         raise ValueError("Google credentials not found")
+    # The Drive/Sheets clients inside come from the shared pool; WootClient's
+    # requests.Session is not thread-safe, so the service itself is per request.
     return WootService(credentials)
 
 
@@ -189,43 +253,74 @@ def get_po(po_id: int):
 @bp.route("/porfs", methods=["GET"])
 @login_required
 def list_porfs():
-    """List PORFs."""
+    """List PORFs newest first, one keyset page at a time (``fields``, ``limit``, ``cursor``, ``lines``)."""
     try:
-        status = request.args.get("status")
-        if status:
-            status = WootPorfStatus(status)
+        where = []
+        if request.args.get("status"):
+            where.append(WootPorf.status == WootPorfStatus(request.args["status"]))
+        return jsonify(_page(WootPorf, PORF_LIST_FIELDS, where)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        service = get_woot_service()
-        porfs = service.list_porfs(status)
-        return jsonify([porf.to_dict() for porf in porfs]), 200
-    except Exception as e:
-        current_app.logger.error(f"Error listing PORFs: {str(e)}")
+
+@bp.route("/porfs/draft", methods=["GET"])
+@login_required
+def draft_porf():
+    """Suggest a draft PORF from sales velocity, stock on hand and open POs.
+
+    Nothing is stored; the body can be edited, given a ``porf_no`` and POSTed
+    to ``/porfs``.
+    """
+    try:
+        as_of = request.args.get("as_of")
+        suggester = PorfSuggester(
+            db.session,
+            lead_time_days=request.args.get("lead_time_days", 21, type=int),
+            cover_days=request.args.get("cover_days", 30, type=int),
+            safety_days=request.args.get("safety_days", 7, type=int),
+        )
+        draft = suggester.suggest(
+            as_of=date.fromisoformat(as_of) if as_of else None, channel=request.args.get("channel")
+        )
+        return jsonify(draft), 200
+    except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
 
 @bp.route("/pos", methods=["GET"])
 @login_required
 def list_pos():
-    """List POs."""
+    """List POs newest first, one keyset page at a time (``fields``, ``limit``, ``cursor``, ``lines``)."""
     try:
-        status = request.args.get("status")
-        if status:
-            status = WootPoStatus(status)
-
-        service = get_woot_service()
-        pos = service.list_pos(status)
-        return jsonify([po.to_dict() for po in pos]), 200
-    except Exception as e:
-        current_app.logger.error(f"Error listing POs: {str(e)}")
+        where = []
+        if request.args.get("status"):
+            where.append(WootPo.status == WootPoStatus(request.args["status"]))
+        return jsonify(_page(WootPo, PO_LIST_FIELDS, where)), 200
+    except ValueError as e:
         return jsonify({"error": str(e)}), 400
 
 
 @bp.route("/orders", methods=["GET"])
 def get_orders():
-    """Get orders within a date range."""
+    """Get orders within a date range.
+
+    With ``Accept: application/x-ndjson`` or ``text/csv`` the orders are
+    streamed by id, one row of order columns (``fields=``, no lines) each.
+    """
     start_date = datetime.fromisoformat(request.args.get("start_date"))
     end_date = datetime.fromisoformat(request.args.get("end_date"))
 
+    mimetype = stream_mimetype(request.accept_mimetypes)
+    if mimetype:
+        try:
+            fields = parse_fields(request.args.get("fields"), WootPorf)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        query = list_query(
+            WootPorf, fields, where=[WootPorf.created_at >= start_date, WootPorf.created_at <= end_date]
+        )
+        return Response(stream_with_context(stream_query(db.session, query, fields, mimetype)), mimetype=mimetype)
+
     service = get_service()
     orders = service.fetch_orders(start_date, end_date)
     return jsonify(orders)
@@ -284,8 +379,11 @@ def export_to_sheets():
         return jsonify({"error": "spreadsheet_id and range_name are required"}), 400
 
     service = get_service()
-    service.export_to_sheets(spreadsheet_id, range_name)
-    return jsonify({"message": "Export completed successfully"})
+    try:
+        report = service.export_to_sheets(spreadsheet_id, range_name, int(data.get("start_offset", 0)))
+    except SheetsAppendError as e:
+        return jsonify({"error": str(e), "committed": e.committed}), 502
+    return jsonify({"message": "Export completed successfully", **report.as_dict()})
 
 
 @bp.route("/inventory", methods=["GET"])
@@ -299,3 +397,14 @@ def get_inventory():
     except Exception as e:
         current_app.logger.error(f"Error getting inventory: {str(e)}")
         return jsonify({"error": str(e)}), 400
+
+
+@bp.cli.command("sync-orders")
+def sync_orders_command():
+    """Pull Woot orders changed since the last sync (schedule with cron)."""
+    client = WootClient(api_key=os.environ["WOOT_API_KEY"], api_url=os.environ["WOOT_API_URL"])
+    result = WootOrderSync(db.session, client).run()
+    click.echo(
+        f"fetched {result['fetched']} orders, wrote {result['synced']}; "
+        f"cursor at {result['cursor']['updated_at']} {result['cursor']['ext_id']}"
+    )
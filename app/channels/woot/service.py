@@ -5,7 +5,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from google.oauth2.credentials import Credentials
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
 
 from app.channels.base import ChannelInterface
 from app.channels.woot.client import WootClient
@@ -20,10 +21,57 @@ from app.channels.woot.models import (
 )
 from app.core.interfaces import BaseChannelOrderService
 from app.core.services import DriveService
-from app.core.services.sheets import SheetsService
+from app.core.services.sheets import SheetColumn, SheetExportReport, SheetSchema, SheetsService
 from app.extensions import db
 
 
+# Line model and its parent foreign key for each document type.
+_LINES = {
+    WootPorf: (WootPorfLine, WootPorfLine.porf_id),
+    WootPo: (WootPoLine, WootPoLine.po_id),
+}
+
+# Columns of the order export sheet, one row per PORF.  Mapped on ``WootPorf``:
+# the legacy ``PORF`` model declares columns the migrated table does not have.
+ORDER_SHEET = SheetSchema(WootPorf, [
+    SheetColumn("ID", "id"),
+    SheetColumn("PORF No", "porf_no"),
+    SheetColumn("Status", "status"),
+    SheetColumn("Total Value", "total_value"),
+    SheetColumn("Sheets File", "sheets_file_id"),
+    SheetColumn("Created", "created_at"),
+    SheetColumn("Updated", "updated_at"),
+])
+
+
+def summarize_lines(parent: type, ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """Return ``line_count``, ``line_quantity`` and ``line_total`` per parent id in one grouped query.
+
+    Args:
+        parent: ``WootPorf`` or ``WootPo``
+        ids: Parent ids to summarize; parents without lines get zeros
+    """
+    line, parent_id = _LINES[parent]
+    rows = db.session.execute(
+        select(parent_id, func.count(line.id), func.sum(line.quantity), func.sum(line.total_price))
+        .where(parent_id.in_(ids))
+        .group_by(parent_id)
+    ).all()
+    summaries = {pid: {"line_count": 0, "line_quantity": 0, "line_total": 0.0} for pid in ids}
+    for pid, count, quantity, total in rows:
+        summaries[pid] = {"line_count": count, "line_quantity": quantity, "line_total": float(total)}
+    return summaries
+
+
+def load_lines(parent: type, ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Return serialized lines per parent id, fetched with one ``IN`` query."""
+    line, parent_id = _LINES[parent]
+    lines: Dict[int, List[Dict[str, Any]]] = {pid: [] for pid in ids}
+    for row in db.session.execute(select(line).where(parent_id.in_(ids)).order_by(line.id)).scalars():
+        lines[getattr(row, parent_id.key)].append(row.to_dict())
+    return lines
+
+
 class WootService(ChannelInterface):
     """Service for Woot channel operations."""
 
@@ -165,29 +213,23 @@ class WootService(ChannelInterface):
             sheets=[{"title": "Lines", "gridProperties": {"rowCount": 1000, "columnCount": 10}}],
         )
 
-        # Add headers
+        # Headers and data go out in a single values.batchUpdate round trip
         headers = ["Product ID", "Product Name", "Quantity", "Unit Price", "Total Price"]
-        self.sheets_service.update_values(
-            spreadsheet_id=spreadsheet_id, range_name="Lines!A1:E1", values=[headers]
-        )
-
-        # Add data
-        rows = []
-        for line in porf.lines:
-            rows.append(
-                [
-                    line.product_id,
-                    line.product_name,
-                    line.quantity,
-                    float(line.unit_price),
-                    float(line.total_price),
-                ]
-            )
-
+        rows = [
+            [
+                line.product_id,
+                line.product_name,
+                line.quantity,
+                float(line.unit_price),
+                float(line.total_price),
+            ]
+            for line in porf.lines
+        ]
+        writer = self.sheets_service.batch_writer(spreadsheet_id)
+        writer.add_values("Lines!A1:E1", [headers])
         if rows:
-            self.sheets_service.update_values(
-                spreadsheet_id=spreadsheet_id, range_name="Lines!A2", values=rows
-            )
+            writer.add_values("Lines!A2", rows)
+        writer.flush()
 
         porf.sheets_file_id = spreadsheet_id
         db.session.commit()
@@ -243,7 +285,7 @@ class WootService(ChannelInterface):
         Returns:
             PORF instance
         """
-        return WootPorf.query.get_or_404(porf_id)
+        return WootPorf.query.options(selectinload(WootPorf.lines)).get_or_404(porf_id)
 
     def get_po(self, po_id: int) -> WootPo:
         """Get a PO by ID.
@@ -254,7 +296,7 @@ class WootService(ChannelInterface):
         Returns:
             PO instance
         """
-        return WootPo.query.get_or_404(po_id)
+        return WootPo.query.options(selectinload(WootPo.lines)).get_or_404(po_id)
 
     def list_porfs(self, status: Optional[str] = None) -> List[WootPorf]:
         """List PORFs.
@@ -265,7 +307,7 @@ class WootService(ChannelInterface):
         Returns:
             List of PORF instances
         """
-        query = WootPorf.query
+        query = WootPorf.query.options(selectinload(WootPorf.lines))
         if status:
             query = query.filter_by(status=WootPorfStatus(status))
         return query.order_by(WootPorf.created_at.desc()).all()
@@ -279,7 +321,7 @@ class WootService(ChannelInterface):
         Returns:
             List of PO instances
         """
-        query = WootPo.query
+        query = WootPo.query.options(selectinload(WootPo.lines))
         if status:
             query = query.filter_by(status=WootPoStatus(status))
         return query.order_by(WootPo.created_at.desc()).all()
@@ -353,8 +395,8 @@ class WootOrderService(BaseChannelOrderService):
             raise ValueError(f"Order {order_id} not found")
         return porf.status
 
-    def export_to_sheets(self, spreadsheet_id: str, range_name: str) -> None:
-        """Export orders to Google Sheets."""
-        porfs = self.db.query(PORF).all()
-        data = [porf.to_dict() for porf in porfs]
-        self.sheets_service.update_sheet_data(spreadsheet_id, range_name, data)
+    def export_to_sheets(self, spreadsheet_id: str, range_name: str, start_offset: int = 0) -> SheetExportReport:
+        """Export orders to Google Sheets, resuming after ``start_offset`` rows (header included)."""
+        return self.sheets_service.export_schema(
+            self.db, ORDER_SHEET, spreadsheet_id, range_name, start_offset=start_offset
+        )
@@ -0,0 +1,155 @@
+"""PORF quantity suggestions.
+
+Layer: channels
+
+Suggested quantities come from an order-up-to rule, applied to every SKU at
+once with NumPy::
+
+    target    = ewma_velocity * (lead_time_days + cover_days + safety_days)
+    suggested = ceil(target - on_hand - open_po_quantity), floored at 0
+
+Velocity and on-hand come from :class:`~app.core.insights.VelocityEngine`.
+Open PO quantities are summed per product over non-final ``WootPo`` rows.
+Each SKU is priced at the unit price of its most recent PORF line; prices are
+kept in integer cents and returned as exact ``Decimal`` amounts.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.insights import VelocityEngine
+from app.core.models import MasterProduct
+
+from .models import WootPo, WootPoLine, WootPorfLine, WootPoStatus
+
+__all__ = ["PorfSuggester", "OPEN_PO_STATUSES"]
+
+# POs in these states have stock on the way that is not yet in the ledger.
+OPEN_PO_STATUSES = (WootPoStatus.DRAFT, WootPoStatus.PENDING, WootPoStatus.APPROVED)
+
+
+def _align(keys: np.ndarray, lookup_keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(index into keys, value)`` for every ``lookup_keys`` entry present in sorted ``keys``."""
+    if not len(keys) or not len(lookup_keys):
+        return np.zeros(0, dtype=np.int64), values[:0]
+    idx = np.searchsorted(keys, lookup_keys)
+    idx[idx == len(keys)] = 0
+    found = keys[idx] == lookup_keys
+    return idx[found], values[found]
+
+
+class PorfSuggester:
+    """Build a draft PORF with suggested quantities for the whole catalogue."""
+
+    def __init__(
+        self,
+        db: Session,
+        lead_time_days: int = 21,
+        cover_days: int = 30,
+        safety_days: int = 7,
+        engine: Optional[VelocityEngine] = None,
+    ) -> None:
+        """Initialize the suggester.
+
+        Args:
+            db: Database session
+            lead_time_days: Days from ordering until stock arrives
+            cover_days: Days of demand the order should cover once it lands
+            safety_days: Extra days of demand held against forecast error
+            engine: Velocity engine (defaults to one on ``db``)
+        """
+        self.db = db
+        self.lead_time_days = lead_time_days
+        self.cover_days = cover_days
+        self.safety_days = safety_days
+        self.engine = engine or VelocityEngine(db)
+
+    def open_po_quantities(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``product_id`` and quantity columns summed over open Woot POs."""
+        rows = self.db.execute(
+            select(WootPoLine.product_id, func.sum(WootPoLine.quantity))
+            .join(WootPo, WootPoLine.po_id == WootPo.id)
+            .where(WootPo.status.in_(OPEN_PO_STATUSES))
+            .group_by(WootPoLine.product_id)
+        ).all()
+        skus, quantities = zip(*rows) if rows else ((), ())
+        return np.array(skus, dtype=str), np.array(quantities, dtype=np.float64)
+
+    def last_unit_prices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``product_id`` and unit price (in cents) from each product's newest PORF line."""
+        newest = select(func.max(WootPorfLine.id)).group_by(WootPorfLine.product_id)
+        rows = self.db.execute(
+            select(WootPorfLine.product_id, WootPorfLine.unit_price).where(WootPorfLine.id.in_(newest))
+        ).all()
+        return (
+            np.array([sku for sku, _ in rows], dtype=str),
+            np.array([int(price * 100) for _, price in rows], dtype=np.int64),
+        )
+
+    def suggest(self, as_of: Optional[date] = None, channel: Optional[str] = None) -> Dict[str, Any]:
+        """Return a draft PORF body for ``WootService.create_porf`` (minus ``porf_no``).
+
+        Args:
+            as_of: Last sales day considered; defaults to today
+            channel: Base velocity and stock on one channel instead of all of them
+
+        Returns:
+            ``lines`` with a positive suggested quantity (largest first), their
+            ``total_value`` and the ``parameters`` used
+        """
+        report = self.engine.compute(as_of, channel=channel, combine_channels=channel is None)
+        skus, n = report.sku, len(report)
+
+        po_idx, po_qty = _align(skus, *self.open_po_quantities())
+        on_order = np.bincount(po_idx, weights=po_qty, minlength=n)
+        horizon = self.lead_time_days + self.cover_days + self.safety_days
+        shortfall = report.ewma * horizon - np.maximum(report.on_hand, 0) - on_order
+        # Round before the ceiling so float noise (e.g. 12.000000001) does not add a unit.
+        quantity = np.ceil(np.round(np.maximum(shortfall, 0), 6)).astype(np.int64)
+
+        order = np.flatnonzero(quantity > 0)
+        order = order[np.lexsort((skus[order], -quantity[order]))]
+        price_idx, price_cents = _align(skus, *self.last_unit_prices())
+        unit_cents = np.zeros(n, dtype=np.int64)
+        unit_cents[price_idx] = price_cents
+        names = dict(self.db.execute(select(MasterProduct.sku, MasterProduct.title)).all()) if len(order) else {}
+
+        lines = [
+            {
+                "product_id": sku,
+                "product_name": names.get(sku, sku),
+                "quantity": qty,
+                "unit_price": Decimal(cents).scaleb(-2),
+                "total_price": Decimal(qty * cents).scaleb(-2),
+                "velocity": round(rate, 3),
+                "on_hand": stock,
+                "on_order": int(pending),
+            }
+            for sku, qty, cents, rate, stock, pending in zip(
+                skus[order].tolist(),
+                quantity[order].tolist(),
+                unit_cents[order].tolist(),
+                report.ewma[order].tolist(),
+                report.on_hand[order].tolist(),
+                on_order[order].tolist(),
+            )
+        ]
+        return {
+            "status": "draft",
+            "lines": lines,
+            "total_value": Decimal(int((quantity[order] * unit_cents[order]).sum())).scaleb(-2),
+            "parameters": {
+                "as_of": report.as_of.isoformat(),
+                "channel": channel,
+                "lead_time_days": self.lead_time_days,
+                "cover_days": self.cover_days,
+                "safety_days": self.safety_days,
+            },
+        }
@@ -0,0 +1,129 @@
+"""Columnar PORF row validation.
+
+Layer: channels
+
+A chunk of parsed CSV rows is turned into NumPy columns once and validated
+with vectorised string operations: quantities become ``int64`` and prices
+fixed-point cents, so totals are an exact integer multiply instead of float
+arithmetic repeated per cell.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["PorfChunk", "validate_chunk", "MAX_CENTS"]
+
+# ``Numeric(10, 2)`` holds at most 99,999,999.99.
+MAX_CENTS = 10**10 - 1
+# ``Integer`` columns are 32-bit signed.
+MAX_QUANTITY = 2**31 - 1
+
+
+@dataclass
+class PorfChunk:
+    """Typed columns for a chunk of PORF rows.
+
+    Only rows where ``valid`` is set should be stored; ``errors`` lists one
+    entry per failing cell with the spreadsheet row number (header is row 1).
+    """
+
+    product_id: np.ndarray
+    product_name: np.ndarray
+    quantity: np.ndarray
+    unit_cents: np.ndarray
+    total_cents: np.ndarray
+    valid: np.ndarray
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def lines(self, porf_id: int) -> List[Dict[str, Any]]:
+        """Return insert parameters for the valid rows with exact ``Decimal`` prices."""
+        mask = self.valid
+        return [
+            {
+                "porf_id": porf_id,
+                "product_id": product_id,
+                "product_name": product_name,
+                "quantity": quantity,
+                "unit_price": Decimal(unit).scaleb(-2),
+                "total_price": Decimal(total).scaleb(-2),
+            }
+            for product_id, product_name, quantity, unit, total in zip(
+                self.product_id[mask].tolist(),
+                self.product_name[mask].tolist(),
+                self.quantity[mask].tolist(),
+                self.unit_cents[mask].tolist(),
+                self.total_cents[mask].tolist(),
+            )
+        ]
+
+
+def _column(rows: Sequence[Mapping[str, Any]], name: str) -> np.ndarray:
+    return np.array([row.get(name) or "" for row in rows], dtype=str)
+
+
+def _parse_fixed(values: np.ndarray, scale: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse non-negative decimal strings into integers scaled by ``10**scale``.
+
+    Returns the parsed values and a mask of cells that were well formed.
+    Trailing zeros in the fraction are accepted (``"3.0"`` is a valid quantity).
+    """
+    if not values.size:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    parts = np.char.partition(np.char.strip(values), ".")
+    whole, frac = parts[..., 0], np.char.rstrip(parts[..., 2], "0")
+    whole_len, frac_len = np.char.str_len(whole), np.char.str_len(frac)
+
+    ok = (
+        (np.char.isdecimal(whole) | (whole_len == 0))
+        & (np.char.isdecimal(frac) | (frac_len == 0))
+        & ((whole_len > 0) | (np.char.str_len(parts[..., 2]) > 0))
+        & (frac_len <= scale)
+        & (whole_len <= 12)
+    )
+    parsed = np.where(ok & (whole_len > 0), whole, "0").astype(np.int64) * 10**scale
+    if scale:
+        parsed += np.where(ok, np.char.ljust(frac, scale, "0"), "0").astype(np.int64)
+    return parsed, ok
+
+
+def validate_chunk(rows: Sequence[Mapping[str, Any]], first_row: int) -> PorfChunk:
+    """Validate ``rows`` whose first entry is spreadsheet row ``first_row``."""
+    product_id = np.char.strip(_column(rows, "product_id"))
+    product_name = _column(rows, "product_name")
+    quantity, qty_ok = _parse_fixed(_column(rows, "quantity"), 0)
+    unit_cents, price_ok = _parse_fixed(_column(rows, "unit_price"), 2)
+
+    qty_ok &= quantity <= MAX_QUANTITY
+    price_ok &= unit_cents <= MAX_CENTS
+    # Compare against the quotient so the check itself cannot overflow int64.
+    total_ok = ~(qty_ok & price_ok) | (unit_cents <= MAX_CENTS // np.maximum(quantity, 1))
+    total_cents = np.where(qty_ok & price_ok & total_ok, quantity * unit_cents, 0)
+    id_ok = np.char.str_len(product_id) > 0
+
+    checks = (
+        ("product_id", id_ok, "required"),
+        ("quantity", qty_ok, "not a non-negative whole number"),
+        ("unit_price", price_ok, "not a non-negative amount with at most 2 decimals"),
+        ("total_price", total_ok, "exceeds Numeric(10, 2)"),
+    )
+    errors = [
+        {"row": first_row + int(idx), "column": column, "reason": reason}
+        for column, ok, reason in checks
+        for idx in np.flatnonzero(~ok)
+    ]
+    errors.sort(key=lambda err: err["row"])
+
+    return PorfChunk(
+        product_id=product_id,
+        product_name=product_name,
+        quantity=quantity,
+        unit_cents=unit_cents,
+        total_cents=total_cents,
+        valid=id_ok & qty_ok & price_ok & total_ok,
+        errors=errors,
+    )
@@ -2,5 +2,6 @@
 
 from .analysis import InventoryInsights
 from .reallocation import ReallocationService
+from .velocity import VelocityEngine, VelocityReport
 
-__all__ = ["InventoryInsights", "ReallocationService"]
+__all__ = ["InventoryInsights", "ReallocationService", "VelocityEngine", "VelocityReport"]
@@ -1,13 +1,16 @@
 from datetime import datetime, timedelta
 from logging import getLogger
-from typing import List
+from typing import List, Optional, Sequence, Tuple
 
+from sqlalchemy import Row, select, tuple_
 from sqlalchemy.orm import Session
 
-from app.core.models.product import MasterProduct, InventoryRecord
+from app.core.models.product import MasterProduct
 
 logger = getLogger(__name__)
 
+SLOW_MOVER_COLUMNS = (MasterProduct.id, MasterProduct.sku, MasterProduct.title, MasterProduct.last_movement_at)
+
 
 class InventoryInsights:
     """Simple analytics on product movement."""
@@ -18,11 +21,26 @@ class InventoryInsights:
     def slow_movers(self, days: int = 60) -> List[MasterProduct]:
         """Return products with no inventory movement in ``days`` days."""
         cutoff = datetime.utcnow() - timedelta(days=days)
-        subq = (
-            self.db.query(InventoryRecord.product_id)
-            .filter(InventoryRecord.created_at >= cutoff)
-            .subquery()
-        )
-        products = self.db.query(MasterProduct).filter(~MasterProduct.id.in_(subq)).all()
+        products = self.db.query(MasterProduct).filter(MasterProduct.last_movement_at < cutoff).all()
         logger.debug("%d slow movers found", len(products))
         return products
+
+    def slow_mover_page(
+        self, days: int = 60, limit: int = 100, after: Optional[Sequence] = None
+    ) -> Tuple[List[Row], Optional[Tuple[datetime, int]]]:
+        """Return one page of slow movers, stalest first, and the key to continue from.
+
+        Rows carry only ``id``, ``sku``, ``title`` and ``last_movement_at``.
+        The page is a range scan of ``ix_master_products_last_movement_at_id``
+        that starts after ``after`` (the previous page's last key).
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        query = select(*SLOW_MOVER_COLUMNS).where(MasterProduct.last_movement_at < cutoff)
+        if after is not None:
+            query = query.where(tuple_(MasterProduct.last_movement_at, MasterProduct.id) > tuple_(*after))
+        query = query.order_by(MasterProduct.last_movement_at, MasterProduct.id).limit(limit + 1)
+        rows = self.db.execute(query).all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1].last_movement_at, rows[-1].id)
@@ -1,12 +1,36 @@
 """Manage reallocation candidate list."""
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+import math
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from app.core.models import MasterProduct, ReallocationCandidate
+import numpy as np
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.logic.utils import upsert_insert
+from app.core.models import MasterProduct, PurchaseOrderItem, ReallocationCandidate
+
+from .velocity import VelocityEngine
 
 __all__ = ["ReallocationService"]
 
+# Days of cover and idle days stop adding to the score past two years.
+SCORE_CAP_DAYS = 730
+SCORED_COLUMNS = (
+    "reason", "score", "on_hand", "days_of_cover", "idle_days", "value_at_risk", "is_active", "updated_at",
+)
+
+
+def _positions(keys: np.ndarray, lookup: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return a found mask and, where found, the index into unsorted ``keys`` of each ``lookup`` value."""
+    if not len(keys):
+        return np.zeros(len(lookup), dtype=bool), np.zeros(len(lookup), dtype=np.int64)
+    order = np.argsort(keys)
+    pos = np.searchsorted(keys[order], lookup).clip(max=len(keys) - 1)
+    return keys[order][pos] == lookup, order[pos]
+
 
 class ReallocationService:
     """Create and list reallocation candidates."""
@@ -17,16 +41,178 @@ class ReallocationService:
     def add_candidate(
         self, product: MasterProduct, *, from_channel: str, reason: str
     ) -> ReallocationCandidate:
-        cand = ReallocationCandidate(
-            product=product, from_channel=from_channel, reason=reason
+        cand = (
+            self._db.query(ReallocationCandidate)
+            .filter_by(product_id=product.id, from_channel=from_channel)
+            .one_or_none()
         )
-        self._db.add(cand)
+        if cand is not None:
+            cand.reason, cand.is_active = reason, True
+        else:
+            cand = ReallocationCandidate(
+                product=product, from_channel=from_channel, reason=reason
+            )
+            self._db.add(cand)
         self._db.flush()
         return cand
 
     def all_candidates(self) -> list[ReallocationCandidate]:
         return (
             self._db.query(ReallocationCandidate)
+            .options(joinedload(ReallocationCandidate.product))
             .order_by(ReallocationCandidate.created_at.desc())
             .all()
         )
+
+    def candidate_page(
+        self,
+        *,
+        channel: Optional[str] = None,
+        reason: Optional[str] = None,
+        active: Optional[bool] = True,
+        limit: int = 100,
+        before: Optional[Sequence] = None,
+    ) -> Tuple[List[ReallocationCandidate], Optional[Tuple[datetime, int]]]:
+        """Return one page of candidates, newest first, and the key to continue from.
+
+        Pages are a keyset walk down ``(created_at, id)`` starting below
+        ``before`` (the previous page's last key), so every page costs the
+        same however deep it is.  Products are joined into the same query.
+
+        Args:
+            channel: Only candidates moving stock out of this channel
+            reason: Only candidates whose reason contains this text
+            active: Filter on ``is_active``; ``None`` returns both
+            limit: Page size
+            before: Key returned with the previous page
+        """
+        query = (
+            select(ReallocationCandidate)
+            .options(joinedload(ReallocationCandidate.product))
+            .order_by(ReallocationCandidate.created_at.desc(), ReallocationCandidate.id.desc())
+            .limit(limit + 1)
+        )
+        if channel is not None:
+            query = query.where(ReallocationCandidate.from_channel == channel)
+        if reason:
+            query = query.where(ReallocationCandidate.reason.contains(reason, autoescape=True))
+        if active is not None:
+            query = query.where(ReallocationCandidate.is_active.is_(active))
+        if before is not None:
+            query = query.where(tuple_(ReallocationCandidate.created_at, ReallocationCandidate.id) < tuple_(*before))
+        rows = self._db.execute(query).scalars().all()
+        if len(rows) <= limit:
+            return list(rows), None
+        rows = rows[:limit]
+        return list(rows), (rows[-1].created_at, rows[-1].id)
+
+    def generate_candidates(
+        self,
+        as_of: Optional[date] = None,
+        min_cover_days: float = 90.0,
+        target_cover_days: float = 30.0,
+        engine: Optional[VelocityEngine] = None,
+    ) -> Dict[str, int]:
+        """Score every stocked ``(product, channel)`` and upsert the overstocked ones.
+
+        A pair qualifies when it has stock and at least ``min_cover_days`` of
+        cover (or no sales at all).  Its score adds three terms:
+
+        - ``log10(1 + value_at_risk)``, where value at risk is the stock
+          beyond ``target_cover_days`` of demand at the newest PO unit price
+        - days of cover / 365
+        - days since the product last moved / 365
+
+        The last two are capped at two years.  Candidates are upserted on
+        ``(product_id, from_channel)``.  Earlier generated candidates that no
+        longer qualify are deactivated; hand-added ones are left alone.
+
+        Returns:
+            ``scanned`` pairs, ``upserted`` candidates and ``deactivated`` ones
+        """
+        engine = engine or VelocityEngine(self._db)
+        report = engine.compute(as_of)
+
+        products = self._db.execute(select(MasterProduct.sku, MasterProduct.id, MasterProduct.last_movement_at)).all()
+        ids = np.array([row.id for row in products], dtype=np.int64)
+        moved = np.array([row.last_movement_at for row in products], dtype="datetime64[D]")
+        known, product = _positions(np.array([row.sku for row in products], dtype=str), report.sku)
+
+        keep = np.flatnonzero(known & (report.on_hand > 0) & (report.days_of_cover >= min_cover_days))
+        product = product[keep]
+        on_hand = report.on_hand[keep]
+        cover = report.days_of_cover[keep]
+        rate = report.velocity[engine.cover_window][keep]
+        idle = (np.datetime64(report.as_of, "D") - moved[product]).astype(np.int64).clip(min=0)
+
+        excess = np.maximum(on_hand - rate * target_cover_days, 0)
+        value_at_risk = excess * self._unit_costs(ids)[product]
+        score = (
+            np.log10(1 + value_at_risk)
+            + np.minimum(cover, SCORE_CAP_DAYS) / 365
+            + np.minimum(idle, SCORE_CAP_DAYS) / 365
+        )
+
+        now, created = datetime.utcnow(), datetime.now(timezone.utc)
+        rows = [
+            {
+                "product_id": product_id,
+                "from_channel": channel,
+                "reason": (
+                    f"{days:.0f} days of cover, idle {idle_days}d" if not math.isinf(days)
+                    else f"no sales in {engine.history}d, idle {idle_days}d"
+                ),
+                "score": round(points, 4),
+                "on_hand": stock,
+                "days_of_cover": None if math.isinf(days) else round(days, 1),
+                "idle_days": idle_days,
+                "value_at_risk": round(risk, 2),
+                "is_active": True,
+                "created_at": created,
+                "updated_at": now,
+            }
+            for product_id, channel, stock, days, idle_days, risk, points in zip(
+                ids[product].tolist(),
+                report.channel[keep].tolist(),
+                on_hand.tolist(),
+                cover.tolist(),
+                idle.tolist(),
+                value_at_risk.tolist(),
+                score.tolist(),
+            )
+        ]
+        if rows:
+            self._upsert(rows)
+        deactivated = self._db.execute(
+            update(ReallocationCandidate)
+            .where(
+                ReallocationCandidate.score.is_not(None),
+                ReallocationCandidate.is_active.is_(True),
+                ReallocationCandidate.updated_at < now,
+            )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self._db.commit()
+        return {"scanned": len(report), "upserted": len(rows), "deactivated": deactivated}
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert or refresh ``rows`` with one ``INSERT ... ON CONFLICT`` statement."""
+        table = ReallocationCandidate.__table__
+        stmt = upsert_insert(self._db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.product_id, table.c.from_channel],
+            set_={column: stmt.excluded[column] for column in SCORED_COLUMNS},
+        )
+        self._db.execute(stmt, rows)
+
+    def _unit_costs(self, ids: np.ndarray) -> np.ndarray:
+        """Return the newest purchase-order unit price aligned with ``ids`` (0 when never bought)."""
+        newest = select(func.max(PurchaseOrderItem.id)).group_by(PurchaseOrderItem.product_id)
+        rows = self._db.execute(
+            select(PurchaseOrderItem.product_id, PurchaseOrderItem.unit_price).where(PurchaseOrderItem.id.in_(newest))
+        ).all()
+        costs = np.zeros(len(ids))
+        found, pos = _positions(ids, np.array([product_id for product_id, _ in rows], dtype=np.int64))
+        costs[pos[found]] = np.array([price for _, price in rows], dtype=np.float64)[found]
+        return costs
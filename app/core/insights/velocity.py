@@ -0,0 +1,224 @@
+"""Sales velocity, days-of-cover and sell-through per SKU and channel.
+
+Layer: core
+
+Order lines are summed per ``(channel, sku, day)`` in SQL.  The buckets are
+scattered into one dense ``pairs x days`` NumPy matrix, so every metric is a
+whole-array operation:
+
+- trailing velocities are read off a single reversed cumulative sum
+- the EWMA is one matrix-vector product with a decay vector
+- days of cover and sell-through divide by on-hand totals from
+  ``inventory_levels``, matched on ``(channel, sku)``
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.models import InventoryLevel, MasterProduct, OrderLine, OrderRecord
+
+__all__ = ["VelocityEngine", "VelocityReport", "ALL_CHANNELS"]
+
+WINDOWS = (7, 30, 90)
+# Channel label used when ``combine_channels`` folds every channel together.
+ALL_CHANNELS = "all"
+EXCLUDED_STATUSES = ("cancelled", "canceled")
+
+
+@dataclass
+class VelocityReport:
+    """Per ``(channel, sku)`` metrics as parallel NumPy columns.
+
+    ``velocity`` maps each window length in days to average units sold per
+    day.  ``days_of_cover`` is ``inf`` where nothing sold in the cover window.
+    ``sell_through`` is ``sold / (sold + on_hand)`` over that window.
+    """
+
+    as_of: date
+    channel: np.ndarray
+    sku: np.ndarray
+    velocity: Dict[int, np.ndarray]
+    ewma: np.ndarray
+    on_hand: np.ndarray
+    days_of_cover: np.ndarray
+    sell_through: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.sku)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Return one JSON-safe dict per pair; infinite cover becomes ``None``."""
+        velocities = {window: column.tolist() for window, column in self.velocity.items()}
+        cover = self.days_of_cover.tolist()
+        return [
+            {
+                "channel": channel,
+                "sku": sku,
+                **{f"velocity_{window}d": velocities[window][i] for window in velocities},
+                "ewma": ewma,
+                "on_hand": on_hand,
+                "days_of_cover": None if math.isinf(cover[i]) else cover[i],
+                "sell_through": sell_through,
+            }
+            for i, (channel, sku, ewma, on_hand, sell_through) in enumerate(
+                zip(
+                    self.channel.tolist(),
+                    self.sku.tolist(),
+                    self.ewma.tolist(),
+                    self.on_hand.tolist(),
+                    self.sell_through.tolist(),
+                )
+            )
+        ]
+
+
+def _factorize(channel: np.ndarray, sku: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the distinct ``(channel, sku)`` pairs, sorted, and each input's pair index."""
+    channels, channel_idx = np.unique(channel, return_inverse=True)
+    skus, sku_idx = np.unique(sku, return_inverse=True)
+    pairs, inverse = np.unique(channel_idx.astype(np.int64) * len(skus) + sku_idx, return_inverse=True)
+    return channels[pairs // max(len(skus), 1)], skus[pairs % max(len(skus), 1)], inverse
+
+
+class VelocityEngine:
+    """Compute velocity metrics for every SKU in one vectorised pass."""
+
+    def __init__(
+        self,
+        db: Session,
+        windows: Sequence[int] = WINDOWS,
+        halflife: float = 14.0,
+        cover_window: int = 30,
+    ) -> None:
+        """Initialize the engine.
+
+        Args:
+            db: Database session
+            windows: Trailing windows, in days, to report velocity for
+            halflife: EWMA half-life in days
+            cover_window: Window whose velocity drives days of cover and sell-through
+        """
+        self.db = db
+        self.windows = tuple(sorted(set(windows) | {cover_window}))
+        self.halflife = halflife
+        self.cover_window = cover_window
+        self.history = self.windows[-1]
+
+    def daily_sales(
+        self, as_of: date, channel: Optional[str] = None, combine_channels: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``channel``, ``sku``, day offset and units columns for the history window.
+
+        Day offset 0 is the oldest day; ``history - 1`` is ``as_of``.
+        """
+        start = as_of - timedelta(days=self.history - 1)
+        day = func.date(OrderRecord.placed_at)
+        columns = [OrderLine.sku, day, func.sum(OrderLine.quantity)]
+        if not combine_channels:
+            columns.insert(0, OrderRecord.channel)
+        query = (
+            select(*columns)
+            .join(OrderRecord, OrderLine.order_id == OrderRecord.id)
+            .where(
+                OrderRecord.placed_at >= datetime.combine(start, time.min, timezone.utc),
+                OrderRecord.placed_at < datetime.combine(as_of + timedelta(days=1), time.min, timezone.utc),
+                OrderRecord.status.notin_(EXCLUDED_STATUSES),
+            )
+            .group_by(*columns[:-1])
+        )
+        if channel is not None:
+            query = query.where(OrderRecord.channel == channel)
+        rows = self.db.execute(query).all()
+        if not rows:
+            empty = np.array([], dtype=str)
+            return empty, empty, np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        columns = list(zip(*rows))
+        if combine_channels:
+            columns.insert(0, (ALL_CHANNELS,) * len(rows))
+        days = np.array(columns[2], dtype="datetime64[D]") - np.datetime64(start, "D")
+        return (
+            np.array(columns[0], dtype=str),
+            np.array(columns[1], dtype=str),
+            days.astype(np.int64),
+            np.array(columns[3], dtype=np.float64),
+        )
+
+    def on_hand(
+        self, channel: Optional[str] = None, combine_channels: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``channel``, ``sku`` and on-hand columns from ``inventory_levels``."""
+        columns = [MasterProduct.sku, func.sum(InventoryLevel.on_hand)]
+        if not combine_channels:
+            columns.insert(0, InventoryLevel.channel)
+        query = (
+            select(*columns)
+            .join(MasterProduct, InventoryLevel.product_id == MasterProduct.id)
+            .group_by(*columns[:-1])
+        )
+        if channel is not None:
+            query = query.where(InventoryLevel.channel == channel)
+        rows = self.db.execute(query).all()
+        if not rows:
+            empty = np.array([], dtype=str)
+            return empty, empty, np.array([], dtype=np.float64)
+        columns = list(zip(*rows))
+        if combine_channels:
+            columns.insert(0, (ALL_CHANNELS,) * len(rows))
+        return np.array(columns[0], dtype=str), np.array(columns[1], dtype=str), np.array(columns[2], dtype=np.float64)
+
+    def compute(
+        self, as_of: Optional[date] = None, channel: Optional[str] = None, combine_channels: bool = False
+    ) -> VelocityReport:
+        """Compute metrics for every SKU with sales in the history window or stock on hand.
+
+        Args:
+            as_of: Last day (UTC) included in the windows; defaults to today
+            channel: Restrict sales and stock to one channel
+            combine_channels: Report one row per SKU across all channels
+
+        Returns:
+            A :class:`VelocityReport` sorted by ``(channel, sku)``
+        """
+        as_of = as_of or datetime.now(timezone.utc).date()
+        sale_channel, sale_sku, day, units = self.daily_sales(as_of, channel, combine_channels)
+        stock_channel, stock_sku, stock = self.on_hand(channel, combine_channels)
+
+        pair_channel, pair_sku, inverse = _factorize(
+            np.concatenate([sale_channel, stock_channel]), np.concatenate([sale_sku, stock_sku])
+        )
+        n, history = len(pair_sku), self.history
+        sales_pair, stock_pair = inverse[: len(sale_sku)], inverse[len(sale_sku):]
+
+        daily = np.bincount(sales_pair * history + day, weights=units, minlength=n * history).reshape(n, history)
+        # Column w - 1 of the reversed running total is the sum of the newest w days.
+        trailing = np.cumsum(daily[:, ::-1], axis=1)
+        velocity = {window: trailing[:, window - 1] / window for window in self.windows}
+
+        decay = 0.5 ** (np.arange(history - 1, -1, -1) / self.halflife)
+        ewma = daily @ decay / decay.sum()
+
+        on_hand = np.bincount(stock_pair, weights=stock, minlength=n)
+        stocked = np.maximum(on_hand, 0)
+        rate = velocity[self.cover_window]
+        days_of_cover = np.divide(stocked, rate, out=np.full(n, np.inf), where=rate > 0)
+        sold = trailing[:, self.cover_window - 1]
+        sell_through = np.divide(sold, sold + stocked, out=np.zeros(n), where=(sold + stocked) > 0)
+
+        return VelocityReport(
+            as_of=as_of,
+            channel=pair_channel,
+            sku=pair_sku,
+            velocity=velocity,
+            ewma=ewma,
+            on_hand=on_hand.astype(np.int64),
+            days_of_cover=days_of_cover,
+            sell_through=sell_through,
+        )
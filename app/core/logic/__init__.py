@@ -2,6 +2,7 @@
 
 from app.core.logic.catalog import CatalogManager
 from app.core.logic.orders import OrderManager
+from app.core.logic.ledger import compact_inventory_ledger
 from app.core.logic.utils import add_months
 
-__all__ = ['CatalogManager', 'OrderManager', 'add_months']
+__all__ = ['CatalogManager', 'OrderManager', 'add_months', 'compact_inventory_ledger']
@@ -2,7 +2,10 @@
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from sqlalchemy import delete, func, insert, literal, select, true, update
 from sqlalchemy.orm import Session
+from app.core.logic.utils import upsert_insert
+from app.core.models.inventory_level import InventoryLevel
 from app.core.models.product import MasterProduct, InventoryRecord
 
 class CatalogManager:
@@ -113,6 +116,122 @@ class CatalogManager:
             notes=notes
         )
         self.db.add(record)
+        self.db.flush()
+        self._apply_to_level(record)
+        self._touch_product(record)
         self.db.commit()
         self.db.refresh(record)
-        return record 
\ No newline at end of file
+        return record
+    
+    def _apply_to_level(self, record: InventoryRecord) -> None:
+        """Fold ``record`` into its ``inventory_levels`` row in one atomic upsert."""
+        now = datetime.utcnow()
+        table = InventoryLevel.__table__
+        stmt = upsert_insert(self.db, table).values(
+            product_id=record.product_id,
+            channel=record.source,
+            on_hand=record.quantity_delta,
+            last_record_id=record.id,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.product_id, table.c.channel],
+            set_={
+                'on_hand': table.c.on_hand + stmt.excluded.on_hand,
+                'last_record_id': stmt.excluded.last_record_id,
+                'updated_at': now,
+            },
+        ))
+    
+    def _touch_product(self, record: InventoryRecord) -> None:
+        """Move the product's ``last_movement_at`` forward to ``record``."""
+        self.db.execute(
+            update(MasterProduct)
+            .where(MasterProduct.id == record.product_id, MasterProduct.last_movement_at < record.created_at)
+            .values(last_movement_at=record.created_at)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def refresh_last_movement(self) -> None:
+        """Recompute every product's ``last_movement_at`` from the ledger (backfills, repairs)."""
+        newest = (
+            select(InventoryRecord.product_id, func.max(InventoryRecord.created_at).label('moved_at'))
+            .group_by(InventoryRecord.product_id)
+            .subquery()
+        )
+        # Two linear passes (reset, then UPDATE ... FROM one aggregate) instead of a per-product subquery.
+        self.db.execute(
+            update(MasterProduct)
+            .values(last_movement_at=MasterProduct.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            update(MasterProduct)
+            .where(MasterProduct.id == newest.c.product_id, newest.c.moved_at > MasterProduct.created_at)
+            .values(last_movement_at=newest.c.moved_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+    
+    def get_inventory_levels(
+        self, product_id: Optional[int] = None, channel: Optional[str] = None
+    ) -> List[InventoryLevel]:
+        """Get materialized on-hand quantities.
+        
+        Args:
+            product_id: Optional product ID to filter by
+            channel: Optional channel to filter by
+            
+        Returns:
+            List of inventory levels
+        """
+        query = self.db.query(InventoryLevel)
+        if product_id:
+            query = query.filter(InventoryLevel.product_id == product_id)
+        if channel:
+            query = query.filter(InventoryLevel.channel == channel)
+        return query.order_by(InventoryLevel.product_id, InventoryLevel.channel).all()
+    
+    def get_on_hand(self, product_id: int, channel: Optional[str] = None) -> int:
+        """Get the on-hand quantity for a product without scanning the ledger.
+        
+        Args:
+            product_id: Product ID
+            channel: Optional channel; all channels are summed when omitted
+            
+        Returns:
+            On-hand quantity
+        """
+        query = select(func.coalesce(func.sum(InventoryLevel.on_hand), 0)).where(
+            InventoryLevel.product_id == product_id
+        )
+        if channel:
+            query = query.where(InventoryLevel.channel == channel)
+        return self.db.execute(query).scalar_one()
+    
+    def rebuild_inventory_levels(self) -> int:
+        """Recompute ``inventory_levels`` from the full ledger (backfills, repairs).
+        
+        Returns:
+            Number of level rows written
+        """
+        now = datetime.utcnow()
+        totals = select(
+            InventoryRecord.product_id,
+            InventoryRecord.source,
+            func.sum(InventoryRecord.quantity_delta),
+            func.max(InventoryRecord.id),
+            true(),
+            literal(now),
+            literal(now),
+        ).group_by(InventoryRecord.product_id, InventoryRecord.source)
+        table = InventoryLevel.__table__
+        self.db.execute(delete(table))
+        result = self.db.execute(insert(table).from_select(
+            ['product_id', 'channel', 'on_hand', 'last_record_id', 'is_active', 'created_at', 'updated_at'],
+            totals,
+        ))
+        self.db.commit()
+        return result.rowcount
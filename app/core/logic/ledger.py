@@ -0,0 +1,148 @@
+"""Inventory ledger compaction.
+
+Layer: core
+
+``inventory_records`` is append-only.  Compaction rolls every delta older than
+a retention horizon into one checkpoint row per ``(product_id, source)``.  The
+checkpoint keeps:
+
+- the exact balance
+- the newest ``created_at``, so movement dates stay correct
+- a SHA-256 over the rows it replaced
+
+Before anything is deleted, the raw rows are streamed to a gzip CSV archive.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.models.product import InventoryRecord
+
+__all__ = ["compact_inventory_ledger", "CHECKPOINT_NOTE"]
+
+CHECKPOINT_NOTE = "ledger checkpoint"
+ARCHIVE_COLUMNS = ("id", "product_id", "quantity_delta", "source", "notes", "extra_data", "created_at", "updated_at")
+
+
+def compact_inventory_ledger(
+    session: Session, before: datetime, archive_dir: os.PathLike | str, batch_size: int = 10_000
+) -> Dict[str, Any]:
+    """Replace ledger rows created before ``before`` with per-product checkpoints.
+
+    Args:
+        session: Database session; the work is committed on success
+        before: Retention horizon; rows created earlier are compacted
+        archive_dir: Directory receiving ``inventory-ledger-<timestamp>.csv.gz``
+        batch_size: Rows fetched per round trip while streaming
+
+    Returns:
+        ``rows`` compacted, ``checkpoints`` written and the ``archive`` path
+        (``None`` if nothing was old enough)
+    """
+    columns = [getattr(InventoryRecord, name) for name in ARCHIVE_COLUMNS]
+    old_rows = (
+        select(*columns)
+        .where(InventoryRecord.created_at < before)
+        .order_by(InventoryRecord.product_id, InventoryRecord.source, InventoryRecord.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    archive = archive_dir / f"inventory-ledger-{datetime.utcnow():%Y%m%dT%H%M%S}.csv.gz"
+
+    checkpoints: List[Dict[str, Any]] = []
+    compacted = max_id = 0
+    now = datetime.utcnow()
+
+    key: Optional[Tuple[int, str]] = None
+    balance = count = first_id = last_id = 0
+    last_at: Optional[datetime] = None
+    hasher = hashlib.sha256()
+
+    def close() -> None:
+        checkpoints.append(
+            {
+                "product_id": key[0],
+                "source": key[1],
+                "quantity_delta": balance,
+                "notes": CHECKPOINT_NOTE,
+                "is_active": True,
+                "created_at": last_at,
+                "updated_at": now,
+                "extra_data": {
+                    "checkpoint": {
+                        "rows": count,
+                        "first_id": first_id,
+                        "last_id": last_id,
+                        "sha256": hasher.hexdigest(),
+                        "archive": archive.name,
+                    }
+                },
+            }
+        )
+
+    with gzip.open(archive, "wt", compresslevel=6, newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(ARCHIVE_COLUMNS)
+        for row_id, product_id, delta, source, notes, extra, created_at, updated_at in session.execute(
+            old_rows
+        ).tuples():
+            created = created_at.isoformat()
+            writer.writerow(
+                (
+                    row_id,
+                    product_id,
+                    delta,
+                    source,
+                    notes or "",
+                    "" if extra is None else json.dumps(extra, sort_keys=True),
+                    created,
+                    updated_at.isoformat(),
+                )
+            )
+            if key != (product_id, source):
+                if key is not None:
+                    close()
+                key = (product_id, source)
+                balance = count = 0
+                first_id, last_at, hasher = row_id, created_at, hashlib.sha256()
+            balance += delta
+            count += 1
+            last_id = row_id
+            if created_at > last_at:
+                last_at = created_at
+            hasher.update(f"{row_id},{product_id},{delta},{source},{created}\n".encode())
+            compacted += 1
+            if row_id > max_id:
+                max_id = row_id
+        if key is not None:
+            close()
+    with open(archive, "rb") as raw:
+        # The archive must be durable before the rows it holds are deleted.
+        os.fsync(raw.fileno())
+
+    if not compacted:
+        archive.unlink()
+        return {"rows": 0, "checkpoints": 0, "archive": None}
+
+    # Rows newer than the scan (max_id) are never removed, even if back-dated.
+    session.execute(
+        delete(InventoryRecord)
+        .where(InventoryRecord.created_at < before, InventoryRecord.id <= max_id)
+        .execution_options(synchronize_session=False)
+    )
+    session.execute(insert(InventoryRecord.__table__), checkpoints)
+    session.commit()
+    return {"rows": compacted, "checkpoints": len(checkpoints), "archive": str(archive)}
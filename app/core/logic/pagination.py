@@ -0,0 +1,160 @@
+"""Keyset pagination with opaque cursors and column projection.
+
+Layer: core
+
+A cursor carries the sort key of the last row on a page.  Values are
+JSON-encoded (datetimes tagged so they round-trip) and wrapped in URL-safe
+base64, so clients pass them back verbatim.
+
+:func:`paginate` serves one page of a model as plain dicts.  It selects only
+the requested columns and seeks past the cursor on the sort key, so a page
+costs the same at any depth.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import ColumnElement, Select, inspect, select, tuple_
+from sqlalchemy.orm import Session
+
+__all__ = [
+    "encode_cursor",
+    "decode_cursor",
+    "parse_fields",
+    "list_query",
+    "paginate",
+    "DEFAULT_PAGE_SIZE",
+    "MAX_PAGE_SIZE",
+]
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"dt"}:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Return an opaque token for the sort key ``values``."""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> List[Any]:
+    """Return the sort key stored in ``token``.
+
+    Raises:
+        ValueError: If ``token`` was not produced by :func:`encode_cursor`
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("invalid cursor")
+    return [_decode_value(value) for value in values]
+
+
+def parse_fields(raw: Optional[str], model: type, default: Optional[Sequence[str]] = None) -> List[str]:
+    """Return the column names requested in a comma-separated ``fields=`` value.
+
+    Args:
+        raw: Query-string value; empty or ``None`` means ``default``
+        model: Mapped class whose column attributes may be requested
+        default: Columns returned when nothing is requested (all columns if ``None``)
+
+    Raises:
+        ValueError: If a requested name is not a column of ``model``
+    """
+    columns = inspect(model).column_attrs.keys()
+    if not raw:
+        return list(default or columns)
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in columns]
+    if unknown or not fields:
+        raise ValueError(f"unknown fields: {', '.join(unknown) or raw}")
+    return fields
+
+
+def list_query(
+    model: type,
+    columns: Sequence[str],
+    *,
+    order_by: Sequence[str] = ("id",),
+    descending: bool = False,
+    where: Iterable[ColumnElement] = (),
+) -> Select:
+    """Return a ``SELECT`` of ``columns`` from ``model``, filtered by ``where`` and sorted on ``order_by``."""
+    keys = [getattr(model, name) for name in order_by]
+    return (
+        select(*(getattr(model, name) for name in columns))
+        .where(*where)
+        .order_by(*(key.desc() if descending else key for key in keys))
+    )
+
+
+def paginate(
+    session: Session,
+    model: type,
+    *,
+    fields: Sequence[str],
+    order_by: Sequence[str] = ("id",),
+    descending: bool = False,
+    where: Iterable[ColumnElement] = (),
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return ``{"items": [...], "next_cursor": ...}`` for one page of ``model``.
+
+    Item values are left as loaded (``datetime``, ``Decimal``, ``Enum``);
+    :mod:`app.core.serialization` encodes them.
+
+    Args:
+        session: Database session
+        model: Mapped class to list
+        fields: Columns to select and return (see :func:`parse_fields`)
+        order_by: Unique sort key; should be backed by an index
+        descending: Walk the key from largest to smallest
+        where: Extra filter criteria
+        limit: Page size, clamped to ``1..MAX_PAGE_SIZE``
+        cursor: ``next_cursor`` from the previous page
+
+    Raises:
+        ValueError: If ``cursor`` is malformed or was issued for another sort key
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    keys = [getattr(model, name) for name in order_by]
+    selected = list(fields) + [name for name in order_by if name not in fields]
+    query = list_query(model, selected, order_by=order_by, descending=descending, where=where).limit(limit + 1)
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != len(keys):
+            raise ValueError("invalid cursor")
+        key, bound = (keys[0], after[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*after))
+        query = query.where(key < bound if descending else key > bound)
+
+    rows = session.execute(query).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], name) for name in order_by])
+    width = len(fields)
+    return {
+        "items": [dict(zip(fields, row[:width])) for row in rows],
+        "next_cursor": next_cursor,
+    }
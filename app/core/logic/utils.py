@@ -5,10 +5,28 @@ Layer: core
 
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
 
-__all__ = ["add_months"]
+__all__ = ["add_months", "upsert_insert"]
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 
 def add_months(dt: datetime, months: int) -> datetime:
     """Return ``dt`` shifted by ``months`` months."""
     return dt + relativedelta(months=months)
+
+
+def upsert_insert(session: Session, table: Table):
+    """Return an ``INSERT`` for ``table`` that supports ``on_conflict_do_update``.
+
+    Both PostgreSQL and SQLite spell upserts as ``INSERT ... ON CONFLICT``;
+    the construct is picked from the session's bound dialect.
+    """
+    dialect = session.get_bind().dialect.name
+    try:
+        return _UPSERT_DIALECTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"upsert not supported for {dialect}") from None
@@ -10,6 +10,9 @@ from app.core.models.order import (
 )
 from app.core.models.reallocation import ReallocationCandidate
 from app.core.models.order_record import OrderRecord, OrderLine
+from app.core.models.drive_folder import DriveFolder
+from app.core.models.sync_cursor import SyncCursor
+from app.core.models.inventory_level import InventoryLevel
 
 __all__ = [
     "Base",
@@ -23,4 +26,7 @@ __all__ = [
     "ReallocationCandidate",
     "OrderRecord",
     "OrderLine",
+    "DriveFolder",
+    "SyncCursor",
+    "InventoryLevel",
 ]
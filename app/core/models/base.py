@@ -5,6 +5,8 @@ from typing import Dict, Any
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import Column, Integer, DateTime, String, Boolean
 
+from app.core.serialization import serializer_for
+
 Base = declarative_base()
 
 class TimestampMixin:
@@ -27,10 +29,7 @@ class BaseModel(Base, TimestampMixin):
         Returns:
             Dictionary representation of the model
         """
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        return serializer_for(type(self))(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'BaseModel':
@@ -0,0 +1,21 @@
+"""Cached Drive folder IDs."""
+from __future__ import annotations
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+from .base import BaseModel
+
+__all__ = ["DriveFolder"]
+
+
+class DriveFolder(BaseModel):
+    """Drive folder ID resolved for a workspace-relative folder path."""
+
+    __tablename__ = "drive_folders"
+
+    path: Mapped[str] = mapped_column(db.String(500), unique=True, nullable=False)
+    folder_id: Mapped[str] = mapped_column(db.String(100), index=True, nullable=False)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<DriveFolder {self.path} -> {self.folder_id}>"
@@ -0,0 +1,36 @@
+"""Materialized on-hand quantities."""
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.extensions import db
+from .base import BaseModel
+from .product import MasterProduct
+
+__all__ = ["InventoryLevel"]
+
+
+class InventoryLevel(BaseModel):
+    """Running ``SUM(quantity_delta)`` of ``inventory_records`` per product and channel.
+
+    ``last_record_id`` is the newest ledger row folded into ``on_hand``.
+    """
+
+    __tablename__ = "inventory_levels"
+    __table_args__ = (db.UniqueConstraint("product_id", "channel", name="uq_inventory_levels_product_channel"),)
+
+    product_id: Mapped[int] = mapped_column(
+        db.Integer,
+        db.ForeignKey("master_products.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    product: Mapped["MasterProduct"] = relationship(MasterProduct)
+
+    channel: Mapped[str] = mapped_column(db.String(50), nullable=False)
+    on_hand: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    last_record_id: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<InventoryLevel {self.product_id}/{self.channel} = {self.on_hand}>"
@@ -1,6 +1,8 @@
 """Core product models for the application."""
 
-from sqlalchemy import Column, String, JSON, Integer, ForeignKey
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, String, JSON, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 from app.core.models.base import BaseModel
 
@@ -14,6 +16,12 @@ class MasterProduct(BaseModel):
     title = Column(String(200), nullable=False)
     description = Column(String(1000))
     extra_data = Column(JSON)
+    # Newest inventory movement (creation time until the first one); kept by CatalogManager.
+    last_movement_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_master_products_last_movement_at_id", "last_movement_at", "id"),
+    )
 
     # Relationships
     inventory_records = relationship(
@@ -34,5 +42,9 @@ class InventoryRecord(BaseModel):
     notes = Column(String(500))
     extra_data = Column(JSON)
 
+    __table_args__ = (
+        Index("ix_inventory_records_product_id_id", "product_id", "id"),
+    )
+
     # Relationships
     product = relationship("MasterProduct", back_populates="inventory_records")
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Optional
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +15,12 @@ __all__ = ["ReallocationCandidate"]
 
 class ReallocationCandidate(BaseModel):
     __tablename__ = "reallocation_candidates"
+    __table_args__ = (
+        db.UniqueConstraint("product_id", "from_channel", name="uq_reallocation_candidates_product_channel"),
+        # Keyset pages walk these newest first, optionally within one channel.
+        db.Index("ix_reallocation_candidates_created_at_id", "created_at", "id"),
+        db.Index("ix_reallocation_candidates_channel_created_at_id", "from_channel", "created_at", "id"),
+    )
 
     product_id: Mapped[int] = mapped_column(
         db.Integer,
@@ -24,6 +31,12 @@ class ReallocationCandidate(BaseModel):
 
     from_channel: Mapped[str] = mapped_column(db.String(50), nullable=False)
     reason: Mapped[str] = mapped_column(db.String(255), nullable=False)
+    # Filled in by ReallocationService.generate_candidates; NULL for hand-added rows.
+    score: Mapped[Optional[float]] = mapped_column(db.Float, nullable=True)
+    on_hand: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
+    days_of_cover: Mapped[Optional[float]] = mapped_column(db.Float, nullable=True)
+    idle_days: Mapped[Optional[int]] = mapped_column(db.Integer, nullable=True)
+    value_at_risk: Mapped[Optional[float]] = mapped_column(db.Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         db.DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
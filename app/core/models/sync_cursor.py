@@ -0,0 +1,43 @@
+"""High-water marks for incremental channel syncs."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+from .base import BaseModel
+
+__all__ = ["SyncCursor"]
+
+
+class SyncCursor(BaseModel):
+    """Last ``(updated_at, ext_id)`` stored for a channel's orders.
+
+    A sync asks the channel only for orders updated at or after
+    ``last_updated_at`` and skips anything not past the full
+    ``(last_updated_at, last_ext_id)`` pair.
+    """
+
+    __tablename__ = "sync_cursors"
+
+    channel: Mapped[str] = mapped_column(db.String(50), unique=True, nullable=False)
+    last_updated_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime(timezone=True), nullable=True)
+    last_ext_id: Mapped[Optional[str]] = mapped_column(db.String(50), nullable=True)
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime(timezone=True), nullable=True)
+    last_run_count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+
+    @property
+    def position(self) -> Optional[tuple]:
+        """Return the cursor as a comparable ``(updated_at, ext_id)`` pair in UTC."""
+        if self.last_updated_at is None:
+            return None
+        updated_at = self.last_updated_at
+        if updated_at.tzinfo is None:
+            # SQLite hands back naive values; cursors are always stored in UTC.
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return updated_at, self.last_ext_id or ""
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<SyncCursor {self.channel} @ {self.last_updated_at} {self.last_ext_id}>"
@@ -0,0 +1,143 @@
+"""Precompiled ORM serializers and a fast JSON encoder.
+
+Layer: core
+
+:class:`SerializerRegistry` builds one row-to-dict function per mapped class
+the first time the class is serialized.  The column list is resolved once.
+Loaded instances are read with an ``itemgetter`` over ``__dict__``, which
+skips the instrumented attribute descriptors; expired or deferred columns
+fall back to normal attribute access.
+
+:func:`dumps` encodes with ``orjson``.  ``datetime``/``date``, ``UUID`` and
+``Enum`` values are encoded natively.  Lists of mapped instances or
+SQLAlchemy ``Row`` objects are converted in one pass before encoding.
+``Decimal`` values, sets and anything nested deeper go through the
+``default`` hook; ``Decimal`` is written as a string, as Flask's default
+provider does, so ``Numeric`` amounts keep their exact digits.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+import orjson
+from sqlalchemy import Row, inspect
+
+__all__ = ["SerializerRegistry", "registry", "serializer_for", "to_dict", "dumps", "dumps_lines", "loads"]
+
+Serializer = Callable[[Any], Dict[str, Any]]
+
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class SerializerRegistry:
+    """Compile and cache ``instance -> dict`` functions per mapped class."""
+
+    def __init__(self) -> None:
+        self._serializers: Dict[type, Serializer] = {}
+        self._overrides: Dict[type, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+    def register(
+        self, model: type, *, fields: Optional[Sequence[str]] = None, exclude: Iterable[str] = ()
+    ) -> None:
+        """Choose which columns ``model`` serializes (default: every column, keyed by column name).
+
+        Args:
+            model: Mapped class
+            fields: Attribute names to include, in output order
+            exclude: Attribute names to leave out (e.g. secrets)
+        """
+        with self._lock:
+            self._overrides[model] = {"fields": fields, "exclude": frozenset(exclude)}
+            self._serializers.pop(model, None)
+
+    def serializer_for(self, model: type) -> Serializer:
+        """Return the compiled serializer for ``model``, building it on first use."""
+        serializer = self._serializers.get(model)
+        if serializer is None:
+            with self._lock:
+                serializer = self._serializers.get(model) or self._compile(model)
+                self._serializers[model] = serializer
+        return serializer
+
+    def _compile(self, model: type) -> Serializer:
+        options = self._overrides.get(model, {})
+        columns = {prop.key: prop.columns[0].name for prop in inspect(model).column_attrs}
+        attrs = [
+            attr for attr in (options.get("fields") or columns)
+            if attr not in options.get("exclude", ())
+        ]
+        names = tuple(columns.get(attr, attr) for attr in attrs)
+        if len(attrs) == 1:
+            attr, name = attrs[0], names[0]
+            return lambda obj: {name: getattr(obj, attr)}
+        loaded, instrumented = itemgetter(*attrs), attrgetter(*attrs)
+
+        def serialize(obj: Any) -> Dict[str, Any]:
+            try:
+                values = loaded(obj.__dict__)
+            except KeyError:
+                values = instrumented(obj)
+            return dict(zip(names, values))
+
+        return serialize
+
+
+registry = SerializerRegistry()
+
+
+def serializer_for(model: type) -> Serializer:
+    """Return the default registry's serializer for ``model``."""
+    return registry.serializer_for(model)
+
+
+def _convert(obj: Any) -> Any:
+    if isinstance(obj, Row):
+        return dict(zip(obj._fields, obj))
+    if hasattr(obj, "__table__"):
+        return registry.serializer_for(type(obj))(obj)
+    return obj
+
+
+def to_dict(obj: Any) -> Any:
+    """Return ``obj`` with mapped instances and ``Row`` objects turned into dicts.
+
+    Dicts are walked recursively.  List items are converted one level deep,
+    so a page of rows costs one Python pass and its dicts are left as they are.
+    """
+    if isinstance(obj, dict):
+        return {key: to_dict(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_convert(item) for item in obj]
+    return _convert(obj)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Row) or hasattr(obj, "__table__"):
+        return _convert(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode ``obj`` to JSON bytes."""
+    options = DUMPS_OPTIONS | orjson.OPT_INDENT_2 if indent else DUMPS_OPTIONS
+    return orjson.dumps(to_dict(obj), default=_default, option=options)
+
+
+def dumps_lines(items: Iterable[Any]) -> bytes:
+    """Encode each of ``items`` as one newline-terminated JSON line (NDJSON)."""
+    options = DUMPS_OPTIONS | orjson.OPT_APPEND_NEWLINE
+    return b"".join(orjson.dumps(_convert(item), default=_default, option=options) for item in items)
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON ``data``."""
+    return orjson.loads(data)
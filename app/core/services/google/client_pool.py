@@ -0,0 +1,137 @@
+"""Pool of built Google API clients.
+
+``discovery.build()`` parses a ~200 KB discovery document on every call.  The
+pool parses each document once (from the static copy shipped with
+``googleapiclient``) and keeps one built client per API and credential
+identity.  ``httplib2.Http`` is not thread-safe, so each pooled client hands
+every thread its own authorized transport and reuses it for that thread's
+later requests.  Entries are keyed on credential identity plus access token,
+so a fresh credentials object per request still hits and a rotated token
+rebuilds the client.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import google_auth_httplib2
+import googleapiclient
+import httplib2
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.http import HttpRequest
+
+__all__ = ["ClientPool", "credential_fingerprint", "discovery_document", "get_client_pool"]
+
+_DOCUMENTS = Path(googleapiclient.__file__).parent / "discovery_cache" / "documents"
+
+
+@lru_cache(maxsize=None)
+def discovery_document(api: str, version: str) -> Optional[Dict[str, Any]]:
+    """Return the parsed static discovery document, or ``None`` if not bundled."""
+    path = _DOCUMENTS / f"{api}.{version}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def credential_fingerprint(credentials: Any) -> Tuple[Hashable, Optional[str]]:
+    """Return ``(identity, token)`` for ``credentials``.
+
+    The identity names the principal (service account or OAuth client plus
+    refresh token); the token changes whenever the credentials rotate.
+    """
+    identity = (
+        type(credentials).__name__,
+        getattr(credentials, "service_account_email", None) or getattr(credentials, "client_id", None),
+        getattr(credentials, "refresh_token", None),
+    )
+    return identity, getattr(credentials, "token", None)
+
+
+class _PerThreadHttp:
+    """``requestBuilder`` that gives every thread its own authorized transport."""
+
+    def __init__(self, credentials: Any) -> None:
+        self._credentials = credentials
+        self._local = threading.local()
+
+    def __call__(self, http: Any, *args: Any, **kwargs: Any) -> HttpRequest:
+        transport = getattr(self._local, "http", None)
+        if transport is None:
+            # ``http`` carries the scoped credentials ``build`` derived.
+            credentials = getattr(http, "credentials", self._credentials)
+            transport = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+            self._local.http = transport
+        return HttpRequest(transport, *args, **kwargs)
+
+
+class ClientPool:
+    """Thread-safe LRU of built clients keyed by name and credential identity."""
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Hashable, Hashable], Tuple[Optional[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: Hashable, credentials: Any, factory: Callable[[], Any]) -> Any:
+        """Return the pooled object for ``(name, credentials)``, building it with ``factory``.
+
+        Credentials with the same identity and token share an entry, whatever
+        object they arrive in; a different token rebuilds it.
+        """
+        identity, token = credential_fingerprint(credentials)
+        key = (name, identity)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == token:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        client = factory()
+        with self._lock:
+            self._entries[key] = (token, client)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return client
+
+    def service(self, api: str, version: str, credentials: Any) -> Any:
+        """Return a Google API client for ``api``/``version``."""
+        return self.get((api, version), credentials, lambda: self._build(api, version, credentials))
+
+    def evict(self, credentials: Any) -> None:
+        """Drop every entry built for the identity behind ``credentials``."""
+        identity, _ = credential_fingerprint(credentials)
+        with self._lock:
+            for key in [key for key in self._entries if key[1] == identity]:
+                del self._entries[key]
+
+    @staticmethod
+    def _build(api: str, version: str, credentials: Any) -> Any:
+        document = discovery_document(api, version)
+        request_builder = _PerThreadHttp(credentials)
+        if document is None:
+            return build(api, version, credentials=credentials, requestBuilder=request_builder)
+        return build_from_document(document, credentials=credentials, requestBuilder=request_builder)
+
+
+_pool: Optional[ClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide client pool."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ClientPool()
+    return _pool
@@ -1,12 +1,20 @@
 """Google Drive service."""
 
-from typing import Any, BinaryIO, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
 
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
 
+from .client_pool import get_client_pool
+from .folder_cache import FolderCache
+from .ratelimit import get_scheduler
+
+
+# Resumable uploads send the body in pieces of this size (a multiple of 256 KiB).
+UPLOAD_CHUNK_SIZE = 8 * 2**20
+UPLOAD_RETRIES = 5
+
 
 class DriveServiceDisabled(RuntimeError):
     """Raised when Drive operations are attempted without credentials."""
@@ -15,17 +23,22 @@ class DriveServiceDisabled(RuntimeError):
 class GoogleDriveService:
     """Service for interacting with Google Drive."""
 
-    def __init__(self, credentials: Credentials | None = None) -> None:
+    def __init__(
+        self, credentials: Credentials | None = None, folder_cache: FolderCache | None = None
+    ) -> None:
         """Initialize the Google Drive service.
 
         Args:
             credentials: Google API credentials or ``None`` to disable Drive access
+            folder_cache: Optional folder path -> ID cache used by
+                ``ensure_workspace``/``ensure_subfolder``
         """
+        self.folder_cache = folder_cache
         if credentials is None:
             self.service = None
             self.files = None
             return
-        self.service = build("drive", "v3", credentials=credentials)
+        self.service = get_client_pool().service("drive", "v3", credentials)
         self.files = self.service.files()
 
     @property
@@ -33,6 +46,10 @@ class GoogleDriveService:
         """Return ``True`` if Drive integration is active."""
         return self.files is not None
 
+    def _execute(self, request: Any) -> Any:
+        """Send ``request`` once the shared rate limiter admits it."""
+        return get_scheduler().execute(request)
+
     def _require_service(self) -> None:
         if not self.is_enabled:
             raise DriveServiceDisabled("Google Drive service not configured")
@@ -40,7 +57,7 @@ class GoogleDriveService:
     def list_files(self, query: str) -> List[Dict[str, Any]]:
         """List files matching the query."""
         self._require_service()
-        results = self.files.list(q=query, fields="files(id,name,parents)").execute()
+        results = self._execute(self.files.list(q=query, fields="files(id,name,parents)"))
         return results.get("files", [])
 
     def get_file(self, file_id: str, fields: str = "*") -> Dict[str, Any]:
@@ -58,7 +75,7 @@ class GoogleDriveService:
         """
         self._require_service()
         try:
-            return self.files.get(fileId=file_id, fields=fields).execute()
+            return self._execute(self.files.get(fileId=file_id, fields=fields))
         except HttpError as error:
             raise error
 
@@ -84,7 +101,7 @@ class GoogleDriveService:
             if parents:
                 file_metadata["parents"] = parents
 
-            return self.files.create(body=file_metadata, fields="id").execute()
+            return self._execute(self.files.create(body=file_metadata, fields="id"))
         except HttpError as error:
             raise error
 
@@ -112,7 +129,7 @@ class GoogleDriveService:
 
             media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
 
-            return self.files.create(body=file_metadata, media_body=media, fields="id").execute()
+            return self._execute(self.files.create(body=file_metadata, media_body=media, fields="id"))
         except HttpError as error:
             raise error
 
@@ -145,10 +162,50 @@ class GoogleDriveService:
 
             media = MediaIoBaseUpload(file_content, mimetype=mime_type, resumable=True)
 
-            return self.files.create(body=file_metadata, media_body=media, fields="id").execute()
+            return self._execute(self.files.create(body=file_metadata, media_body=media, fields="id"))
         except HttpError as error:
             raise error
 
+    def upload_stream(
+        self,
+        file_name: str,
+        stream: BinaryIO,
+        mime_type: str,
+        parents: Optional[List[str]] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """Upload a seekable stream in resumable chunks of ``chunk_size`` bytes.
+
+        Only one chunk is read into memory at a time.  Each chunk waits for a
+        rate-limiter token; transient failures are retried and the upload
+        resumes from the last byte Drive acknowledged.
+
+        Args:
+            file_name: Name of the file
+            stream: Binary stream positioned at the start of the content
+            mime_type: MIME type of the file
+            parents: Optional list of parent folder IDs
+            chunk_size: Bytes sent per request
+
+        Returns:
+            File metadata
+
+        Raises:
+            HttpError: If a chunk still fails after retries
+        """
+        self._require_service()
+        file_metadata = {"name": file_name, "mimeType": mime_type}
+        if parents:
+            file_metadata["parents"] = parents
+        media = MediaIoBaseUpload(stream, mimetype=mime_type, chunksize=chunk_size, resumable=True)
+        request = self.files.create(body=file_metadata, media_body=media, fields="id")
+        scheduler = get_scheduler()
+        response = None
+        while response is None:
+            scheduler.acquire()
+            _, response = request.next_chunk(num_retries=UPLOAD_RETRIES)
+        return response
+
     def update_file(self, file_id: str, file_path: str, mime_type: str) -> Dict[str, Any]:
         """Update an existing file in Google Drive.
 
@@ -167,7 +224,7 @@ class GoogleDriveService:
         try:
             media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
 
-            return self.files.update(fileId=file_id, media_body=media).execute()
+            return self._execute(self.files.update(fileId=file_id, media_body=media))
         except HttpError as error:
             raise error
 
@@ -182,7 +239,7 @@ class GoogleDriveService:
         """
         self._require_service()
         try:
-            self.files.delete(fileId=file_id).execute()
+            self._execute(self.files.delete(fileId=file_id))
         except HttpError as error:
             raise error
 
@@ -195,37 +252,52 @@ class GoogleDriveService:
         }
         if parent_id:
             metadata["parents"] = [parent_id]
-        return self.files.create(body=metadata, fields="id,name").execute()
+        return self._execute(self.files.create(body=metadata, fields="id,name"))
+
+    def _cached_folder(self, path: str, resolve: Callable[[], str]) -> str:
+        """Return the folder ID for ``path``, calling ``resolve`` only on a cache miss."""
+        if self.folder_cache is not None:
+            folder_id = self.folder_cache.get(path)
+            if folder_id:
+                return folder_id
+        folder_id = resolve()
+        if self.folder_cache is not None:
+            self.folder_cache.set(path, folder_id)
+        return folder_id
+
+    def forget_folder(self, folder_id: str) -> None:
+        """Drop ``folder_id`` (and folders beneath it) from the folder cache.
+
+        Call this when Drive answers 404 for a cached folder.
+        """
+        if self.folder_cache is not None:
+            self.folder_cache.invalidate(folder_id)
+
+    def _find_or_create_folder(self, name: str, parent_id: str | None = None) -> str:
+        clauses = [f"name = '{name}'"]
+        if parent_id:
+            clauses.append(f"'{parent_id}' in parents")
+        clauses.append("mimeType = 'application/vnd.google-apps.folder' and trashed = false")
+        existing = self.list_files(" and ".join(clauses))
+        if existing:
+            return existing[0]["id"]
+        return self.create_folder(name, parent_id)["id"]
 
     def ensure_subfolder(self, parent_id: str, name: str) -> str:
         """Return sub-folder ``name`` under ``parent_id``."""
         self._require_service()
-        query = (
-            f"name = '{name}' and '{parent_id}' in parents and "
-            "mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+        return self._cached_folder(
+            f"{parent_id}/{name}", lambda: self._find_or_create_folder(name, parent_id)
         )
-        existing = self.list_files(query)
-        if existing:
-            return existing[0]["id"]
-
-        folder = self.create_folder(name, parent_id)
-        return folder["id"]
 
     def ensure_workspace(self, name: str, *, channels: list[str] | None = None) -> str:
         """Ensure root and optional channel folders exist and return root ID."""
         if not self.is_enabled:
             return ""
         self._require_service()
-        query = f"name = '{name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
-        existing = self.list_files(query)
-        root_id = existing[0]["id"] if existing else self.create_folder(name)["id"]
+        root_id = self._cached_folder(name, lambda: self._find_or_create_folder(name))
 
         for ch in channels or []:
-            sub_q = (
-                f"name = '{ch}' and '{root_id}' in parents and "
-                "mimeType = 'application/vnd.google-apps.folder' and trashed = false"
-            )
-            if not self.list_files(sub_q):
-                self.create_folder(ch, parent_id=root_id)
+            self._cached_folder(f"{root_id}/{ch}", lambda ch=ch: self._find_or_create_folder(ch, root_id))
 
         return root_id
@@ -0,0 +1,134 @@
+"""Drive folder path -> ID cache."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.models.drive_folder import DriveFolder
+from app.extensions import db
+
+__all__ = ["FolderCache", "get_folder_cache"]
+
+
+class FolderCache:
+    """Resolve folder paths to Drive IDs without ``files.list`` round trips.
+
+    Lookups go to an in-process LRU (entries expire after ``ttl`` seconds) and
+    then to the ``drive_folders`` table; only a miss in both costs Drive
+    calls.  Entries are dropped with :meth:`invalidate` when Drive reports the
+    folder gone (404).
+    """
+
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        *,
+        maxsize: int = 256,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            session: Session used for the persistent layer, or ``None`` to
+                keep the cache in memory only
+            maxsize: Maximum number of in-process entries
+            ttl: Seconds an in-process entry is trusted before re-reading
+                the database
+            clock: Monotonic time source
+        """
+        self._session = session
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def get(self, path: str) -> Optional[str]:
+        """Return the cached folder ID for ``path`` or ``None``."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[0]
+
+        folder_id = None
+        if self._session is not None:
+            row = self._session.query(DriveFolder.folder_id).filter_by(path=path).first()
+            folder_id = row[0] if row else None
+
+        with self._lock:
+            if folder_id is None:
+                self._entries.pop(path, None)
+                self.misses += 1
+                return None
+            self.db_hits += 1
+            self._remember(path, folder_id, now)
+        return folder_id
+
+    def set(self, path: str, folder_id: str) -> None:
+        """Record ``folder_id`` for ``path`` in memory and in the database."""
+        with self._lock:
+            self._remember(path, folder_id, self._clock())
+        if self._session is not None:
+            row = self._session.query(DriveFolder).filter_by(path=path).first()
+            if row is None:
+                self._session.add(DriveFolder(path=path, folder_id=folder_id))
+            else:
+                row.folder_id = folder_id
+            self._session.flush()
+
+    def invalidate(self, folder_id: str) -> None:
+        """Forget ``folder_id`` and every path resolved beneath it."""
+        prefix = f"{folder_id}/"
+        with self._lock:
+            stale = [
+                path
+                for path, (cached_id, _) in self._entries.items()
+                if cached_id == folder_id or path.startswith(prefix)
+            ]
+            for path in stale:
+                del self._entries[path]
+        if self._session is not None:
+            self._session.query(DriveFolder).filter(
+                (DriveFolder.folder_id == folder_id) | DriveFolder.path.startswith(prefix)
+            ).delete(synchronize_session=False)
+            self._session.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters; every hit is a saved ``files.list`` call."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _remember(self, path: str, folder_id: str, now: float) -> None:
+        self._entries[path] = (folder_id, now + self._ttl)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+_shared_cache: Optional[FolderCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_folder_cache() -> FolderCache:
+    """Return the process-wide cache backed by the application session."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = FolderCache(db.session)
+    return _shared_cache
@@ -0,0 +1,223 @@
+"""Token-bucket scheduling for Google API requests.
+
+Every ``.execute()`` issued by the Sheets and Drive services goes through a
+:class:`RequestScheduler`, which waits for a token before sending the request.
+Waiting callers are served strictly by lane: interactive requests always run
+before background ones, and callers in the same lane run first come, first served.
+
+The bucket lives in process memory by default.  Set
+``GOOGLE_API_BUCKET_PATH`` to a SQLite file so that every worker process on
+the host draws from one bucket.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+__all__ = [
+    "INTERACTIVE",
+    "BACKGROUND",
+    "TokenBucket",
+    "SQLiteTokenBucket",
+    "RequestScheduler",
+    "background",
+    "get_scheduler",
+]
+
+INTERACTIVE = 0
+BACKGROUND = 1
+LANES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Sheets allows 60 write requests per minute per user.
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 10.0
+
+
+class Bucket(Protocol):
+    def try_acquire(self) -> float:
+        """Take one token; return 0 on success or the seconds until one is available."""
+
+
+class TokenBucket:
+    """Thread-safe in-process token bucket refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class SQLiteTokenBucket:
+    """Token bucket stored in a SQLite file and shared by every process using ``path``.
+
+    Refills use wall-clock time because monotonic clocks are not comparable
+    across processes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        capacity: float,
+        *,
+        name: str = "google",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity
+        self.name = name
+        self._clock = clock
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_bucket (name TEXT PRIMARY KEY, tokens REAL, updated REAL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO token_bucket VALUES (?, ?, ?)", (name, capacity, clock())
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def try_acquire(self) -> float:
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so read-modify-write is atomic.
+            conn.execute("BEGIN IMMEDIATE")
+            tokens, updated = conn.execute(
+                "SELECT tokens, updated FROM token_bucket WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = self._clock()
+            tokens = min(self.capacity, tokens + max(now - updated, 0.0) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            conn.execute(
+                "UPDATE token_bucket SET tokens = ?, updated = ? WHERE name = ?", (tokens, now, self.name)
+            )
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+
+
+class RequestScheduler:
+    """Admit requests through ``bucket`` one at a time, by lane and then arrival order."""
+
+    def __init__(self, bucket: Bucket, clock: Callable[[], float] = time.monotonic) -> None:
+        self.bucket = bucket
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._waiting: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._local = threading.local()
+        self._stats = {lane: {"requests": 0, "wait_total": 0.0, "wait_max": 0.0} for lane in LANES}
+
+    @property
+    def lane(self) -> int:
+        """Lane used by the calling thread (interactive unless inside :meth:`background`)."""
+        return getattr(self._local, "lane", INTERACTIVE)
+
+    @contextmanager
+    def background(self) -> Iterator[None]:
+        """Schedule requests made by this thread in the background lane."""
+        previous = self.lane
+        self._local.lane = BACKGROUND
+        try:
+            yield
+        finally:
+            self._local.lane = previous
+
+    def acquire(self, lane: Optional[int] = None) -> float:
+        """Block until a token is granted; return the seconds spent waiting."""
+        lane = self.lane if lane is None else lane
+        ticket = (lane, next(self._seq))
+        start = self._clock()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    if self._waiting[0] == ticket:
+                        delay = self.bucket.try_acquire()
+                        if not delay:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+            waited = self._clock() - start
+            stats = self._stats[lane]
+            stats["requests"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+        return waited
+
+    def execute(self, request: Any, lane: Optional[int] = None) -> Any:
+        """Wait for a token, then call ``request.execute()``."""
+        self.acquire(lane)
+        return request.execute()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Return queue depth and wait-time counters per lane."""
+        with self._cond:
+            result = {}
+            for lane, name in LANES.items():
+                stats = self._stats[lane]
+                result[name] = {
+                    "queue_depth": sum(1 for waiting, _ in self._waiting if waiting == lane),
+                    "requests": stats["requests"],
+                    "wait_total": stats["wait_total"],
+                    "wait_max": stats["wait_max"],
+                    "wait_avg": stats["wait_total"] / stats["requests"] if stats["requests"] else 0.0,
+                }
+            return result
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide scheduler configured from ``GOOGLE_API_*`` env vars."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                rate = float(os.environ.get("GOOGLE_API_RATE", DEFAULT_RATE))
+                burst = float(os.environ.get("GOOGLE_API_BURST", DEFAULT_BURST))
+                path = os.environ.get("GOOGLE_API_BUCKET_PATH")
+                bucket: Bucket = SQLiteTokenBucket(path, rate, burst) if path else TokenBucket(rate, burst)
+                _scheduler = RequestScheduler(bucket)
+    return _scheduler
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """Run Google requests made by this thread in the shared scheduler's background lane."""
+    with get_scheduler().background():
+        yield
@@ -1,10 +1,133 @@
 """Google Sheets service."""
 
-from typing import List, Dict, Any
+import json
+import logging
+import random
+import re
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .client_pool import get_client_pool
+from .ratelimit import get_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Google recommends keeping request payloads around 2 MB; hard limits are higher.
+MAX_BATCH_BYTES = 2_000_000
+APPEND_CHUNK_ROWS = 500
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class SheetsAppendError(RuntimeError):
+    """Raised when a chunked append gives up.
+
+    ``committed`` is the row offset written so far; pass it back as
+    ``start_offset`` to resume.
+    """
+
+    def __init__(self, message: str, committed: int) -> None:
+        super().__init__(message)
+        self.committed = committed
+
+
+_A1_START = re.compile(r"^(?:(?P<sheet>.+)!)?(?P<col>[A-Za-z]+)(?P<row>\d+)")
+
+
+def _offset_range(range_name: str, rows: int) -> str:
+    """Return the start cell of ``range_name`` moved down by ``rows`` rows."""
+    match = _A1_START.match(range_name)
+    if match is None:
+        raise ValueError(f"Cannot split range without a start cell: {range_name}")
+    cell = f"{match['col']}{int(match['row']) + rows}"
+    return f"{match['sheet']}!{cell}" if match["sheet"] else cell
+
+
+class SheetsBatchWriter:
+    """Coalesce value writes for one spreadsheet into ``values.batchUpdate`` calls.
+
+    Ranges from any number of tabs are queued with :meth:`add_values` and sent
+    together by :meth:`flush`.  Payloads larger than ``max_bytes`` are split
+    across several requests, cutting oversized ranges into row blocks.
+    Formatting requests queued with :meth:`add_request` are sent in a single
+    ``spreadsheets.batchUpdate`` call.
+    """
+
+    def __init__(
+        self,
+        spreadsheets: Any,
+        spreadsheet_id: str,
+        value_input_option: str = "RAW",
+        max_bytes: int = MAX_BATCH_BYTES,
+    ) -> None:
+        self._spreadsheets = spreadsheets
+        self.spreadsheet_id = spreadsheet_id
+        self.value_input_option = value_input_option
+        self.max_bytes = max_bytes
+        self._data: List[Dict[str, Any]] = []
+        self._requests: List[Dict[str, Any]] = []
+
+    def add_values(self, range_name: str, values: List[List[Any]]) -> "SheetsBatchWriter":
+        """Queue ``values`` to be written starting at ``range_name``."""
+        self._data.append({"range": range_name, "values": values})
+        return self
+
+    def add_request(self, request: Dict[str, Any]) -> "SheetsBatchWriter":
+        """Queue a ``spreadsheets.batchUpdate`` request (formatting, new tabs, ...)."""
+        self._requests.append(request)
+        return self
+
+    def _batches(self) -> List[List[Dict[str, Any]]]:
+        batches: List[List[Dict[str, Any]]] = [[]]
+        size = 0
+        for entry in self._data:
+            for part in self._split(entry):
+                part_size = len(json.dumps(part, default=str))
+                if batches[-1] and size + part_size > self.max_bytes:
+                    batches.append([])
+                    size = 0
+                batches[-1].append(part)
+                size += part_size
+        return [batch for batch in batches if batch]
+
+    def _split(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        values = entry["values"]
+        size = len(json.dumps(values, default=str))
+        if size <= self.max_bytes or len(values) < 2:
+            return [entry]
+        rows_per_part = max(1, len(values) * self.max_bytes // size)
+        return [
+            {"range": _offset_range(entry["range"], start), "values": values[start:start + rows_per_part]}
+            for start in range(0, len(values), rows_per_part)
+        ]
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Send everything queued and return the API responses.
+
+        Raises:
+            HttpError: If an API request fails
+        """
+        responses = []
+        if self._requests:
+            responses.append(
+                get_scheduler().execute(
+                    self._spreadsheets.batchUpdate(
+                        spreadsheetId=self.spreadsheet_id, body={"requests": self._requests}
+                    )
+                )
+            )
+        for batch in self._batches():
+            body = {"valueInputOption": self.value_input_option, "data": batch}
+            responses.append(
+                get_scheduler().execute(
+                    self._spreadsheets.values().batchUpdate(spreadsheetId=self.spreadsheet_id, body=body)
+                )
+            )
+        self._data, self._requests = [], []
+        return responses
+
 
 class GoogleSheetsService:
     """Service for interacting with Google Sheets."""
@@ -22,7 +145,7 @@ class GoogleSheetsService:
             self.spreadsheets = None
             return
 
-        self.service = build("sheets", "v4", credentials=credentials)
+        self.service = get_client_pool().service("sheets", "v4", credentials)
         self.spreadsheets = self.service.spreadsheets()
 
     @property
@@ -30,6 +153,10 @@ class GoogleSheetsService:
         """Return ``True`` if Sheets integration is active."""
         return self.spreadsheets is not None
 
+    def _execute(self, request: Any) -> Any:
+        """Send ``request`` once the shared rate limiter admits it."""
+        return get_scheduler().execute(request)
+
     def get_sheet_data(self, spreadsheet_id: str, range_name: str) -> List[List[Any]]:
         """Get data from a Google Sheet.
 
@@ -44,10 +171,9 @@ class GoogleSheetsService:
             HttpError: If the API request fails
         """
         try:
-            result = (
+            result = self._execute(
                 self.spreadsheets.values()
                 .get(spreadsheetId=spreadsheet_id, range=range_name)
-                .execute()
             )
             return result.get("values", [])
         except HttpError as error:
@@ -71,7 +197,7 @@ class GoogleSheetsService:
         """
         try:
             body = {"values": values}
-            result = (
+            result = self._execute(
                 self.spreadsheets.values()
                 .update(
                     spreadsheetId=spreadsheet_id,
@@ -79,12 +205,41 @@ class GoogleSheetsService:
                     valueInputOption="RAW",
                     body=body,
                 )
-                .execute()
             )
             return result
         except HttpError as error:
             raise error
 
+    def batch_writer(
+        self, spreadsheet_id: str, value_input_option: str = "RAW", max_bytes: int = MAX_BATCH_BYTES
+    ) -> SheetsBatchWriter:
+        """Return a :class:`SheetsBatchWriter` for ``spreadsheet_id``."""
+        return SheetsBatchWriter(self.spreadsheets, spreadsheet_id, value_input_option, max_bytes)
+
+    def batch_update_values(
+        self,
+        spreadsheet_id: str,
+        data: List[Tuple[str, List[List[Any]]]],
+        value_input_option: str = "RAW",
+    ) -> List[Dict[str, Any]]:
+        """Write several ranges with as few ``values.batchUpdate`` calls as possible.
+
+        Args:
+            spreadsheet_id: ID of the spreadsheet
+            data: ``(range_name, rows)`` pairs, possibly on different tabs
+            value_input_option: ``RAW`` or ``USER_ENTERED``
+
+        Returns:
+            Responses from the API, one per request sent
+
+        Raises:
+            HttpError: If the API request fails
+        """
+        writer = self.batch_writer(spreadsheet_id, value_input_option)
+        for range_name, values in data:
+            writer.add_values(range_name, values)
+        return writer.flush()
+
     def append_sheet_data(
         self, spreadsheet_id: str, range_name: str, values: List[List[Any]]
     ) -> Dict[str, Any]:
@@ -103,7 +258,7 @@ class GoogleSheetsService:
         """
         try:
             body = {"values": values}
-            result = (
+            result = self._execute(
                 self.spreadsheets.values()
                 .append(
                     spreadsheetId=spreadsheet_id,
@@ -112,7 +267,6 @@ class GoogleSheetsService:
                     insertDataOption="INSERT_ROWS",
                     body=body,
                 )
-                .execute()
             )
             return result
         except HttpError as error:
@@ -132,7 +286,7 @@ class GoogleSheetsService:
             API response payload.
         """
         body = {"values": rows}
-        result = (
+        result = self._execute(
             self.spreadsheets.values()
             .append(
                 spreadsheetId=spreadsheet_id,
@@ -141,10 +295,66 @@ class GoogleSheetsService:
                 insertDataOption="INSERT_ROWS",
                 body=body,
             )
-            .execute()
         )
         return result
 
+    def append_rows_chunked(
+        self,
+        spreadsheet_id: str,
+        rows: Iterable[List[Any]],
+        range_name: str = "Sheet1!A1",
+        *,
+        chunk_size: int = APPEND_CHUNK_ROWS,
+        start_offset: int = 0,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        on_commit: Optional[Callable[[int], None]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> int:
+        """Append ``rows`` in blocks of ``chunk_size``, retrying transient failures.
+
+        Blocks failing with 429/5xx are retried with jittered exponential
+        backoff.  Rows before ``start_offset`` are skipped, so an export that
+        failed can resume from the offset carried by :class:`SheetsAppendError`.
+
+        Args:
+            spreadsheet_id: Target spreadsheet ID
+            rows: Row values to append (any iterable, consumed lazily)
+            range_name: A1 range specifying the worksheet
+            chunk_size: Rows sent per request
+            start_offset: Number of leading rows already committed
+            max_retries: Retries per block before giving up
+            backoff: Base delay in seconds for the first retry
+            on_commit: Called with the committed offset after every block
+            sleep: Delay function (injectable for tests)
+
+        Returns:
+            Offset after the last committed row
+
+        Raises:
+            SheetsAppendError: If a block fails permanently or retries run out
+        """
+        committed = start_offset
+        remaining = islice(iter(rows), start_offset, None)
+        while block := list(islice(remaining, chunk_size)):
+            for attempt in range(max_retries + 1):
+                try:
+                    self.append_rows(spreadsheet_id, block, range_name)
+                    break
+                except HttpError as error:
+                    status = int(error.resp.status)
+                    if status not in RETRYABLE_STATUSES or attempt == max_retries:
+                        raise SheetsAppendError(
+                            f"append to {spreadsheet_id} failed at row {committed}: HTTP {status}", committed
+                        ) from error
+                    delay = backoff * 2**attempt * (1 + random.random())
+                    logger.info("Sheets append got HTTP %s; retrying in %.1fs", status, delay)
+                    sleep(delay)
+            committed += len(block)
+            if on_commit is not None:
+                on_commit(committed)
+        return committed
+
     def clear_sheet_data(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
         """Clear data from a Google Sheet.
 
@@ -159,10 +369,9 @@ class GoogleSheetsService:
             HttpError: If the API request fails
         """
         try:
-            result = (
+            result = self._execute(
                 self.spreadsheets.values()
                 .clear(spreadsheetId=spreadsheet_id, range=range_name)
-                .execute()
             )
             return result
         except HttpError as error:
@@ -182,7 +391,7 @@ class GoogleSheetsService:
         """
         try:
             spreadsheet = {"properties": {"title": title}}
-            result = self.spreadsheets.create(body=spreadsheet).execute()
+            result = self._execute(self.spreadsheets.create(body=spreadsheet))
             return result
         except HttpError as error:
             raise error
@@ -0,0 +1,168 @@
+"""Stream query results as NDJSON or CSV.
+
+Layer: core
+
+Rows come off the database cursor ``batch_size`` at a time (``yield_per``,
+which also asks the driver for a server-side cursor where it has one).  Each
+batch is encoded into one chunk and dropped before the next one is fetched,
+so memory stays at one batch however many rows the query returns.
+
+:func:`spool_csv` writes the same CSV stream (optionally gzip-compressed)
+into a spooled temporary file for uploads that need a seekable body.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import tempfile
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import IO, Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import Row, Select
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dumps, dumps_lines
+
+__all__ = [
+    "NDJSON",
+    "CSV",
+    "STREAM_MIMETYPES",
+    "BATCH_SIZE",
+    "stream_mimetype",
+    "iter_batches",
+    "ndjson_chunks",
+    "csv_chunks",
+    "stream_query",
+    "spool_csv",
+]
+
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+STREAM_MIMETYPES = (NDJSON, CSV)
+BATCH_SIZE = 1000
+# Bytes a spooled export keeps in memory before rolling over to a temporary file.
+SPOOL_SIZE = 8 * 2**20
+
+
+def stream_mimetype(accept: Any) -> Optional[str]:
+    """Return the streaming format a client asked for, or ``None`` for a plain JSON body.
+
+    Args:
+        accept: The request's parsed ``Accept`` header (``request.accept_mimetypes``)
+    """
+    best = accept.best_match(("application/json",) + STREAM_MIMETYPES, default="application/json")
+    return best if best in STREAM_MIMETYPES else None
+
+
+def iter_batches(session: Session, query: Select, batch_size: int = BATCH_SIZE) -> Iterator[Sequence[Row]]:
+    """Yield the rows of ``query`` in lists of at most ``batch_size``."""
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def ndjson_chunks(batches: Iterable[Sequence[Row]], fields: Sequence[str]) -> Iterator[bytes]:
+    """Yield one NDJSON chunk per batch, each row an object keyed by ``fields``."""
+    for rows in batches:
+        yield dumps_lines([dict(zip(fields, row)) for row in rows])
+
+
+# Types the csv module already writes as wanted (``None`` as an empty cell).
+_CSV_NATIVE = frozenset((str, int, float, bool, Decimal, type(None)))
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return value
+
+
+def _csv_rows(rows: Sequence[Row]) -> Iterable[Sequence[Any]]:
+    """Return ``rows`` with enums and dates converted, touching only the columns that hold them."""
+    columns = list(zip(*rows))
+    for i, column in enumerate(columns):
+        if not _CSV_NATIVE.issuperset(map(type, column)):
+            columns[i] = [_csv_value(value) for value in column]
+    return zip(*columns)
+
+
+def csv_chunks(batches: Iterable[Sequence[Row]], fields: Sequence[str]) -> Iterator[bytes]:
+    """Yield a header row, then one CSV chunk per batch.
+
+    ``None`` becomes an empty cell, enums their value, dates ISO 8601 and
+    JSON columns a JSON string.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue().encode()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_rows(rows))
+        yield buffer.getvalue().encode()
+
+
+def stream_query(
+    session: Session, query: Select, fields: Sequence[str], mimetype: str, batch_size: int = BATCH_SIZE
+) -> Iterator[bytes]:
+    """Yield the body of a ``mimetype`` response holding every row of ``query``.
+
+    Args:
+        session: Database session; must stay open until the iterator is exhausted
+        query: ``SELECT`` whose columns line up with ``fields``
+        fields: Output names for the selected columns
+        mimetype: ``NDJSON`` or ``CSV``
+        batch_size: Rows fetched and encoded per chunk
+    """
+    chunks = ndjson_chunks if mimetype == NDJSON else csv_chunks
+    return chunks(iter_batches(session, query, batch_size), fields)
+
+
+def spool_csv(
+    batches: Iterable[Sequence[Row]], fields: Sequence[str], *, compress: bool = False, max_size: int = SPOOL_SIZE
+) -> Tuple[IO[bytes], int]:
+    """Write ``batches`` as CSV into a spooled temporary file.
+
+    The file is kept in memory up to ``max_size`` bytes and then rolls over
+    to disk.  The caller owns (and closes) the returned file.
+
+    Args:
+        batches: Row batches, e.g. from :func:`iter_batches`
+        fields: Header names for the row columns
+        compress: Gzip the CSV as it is written
+        max_size: In-memory limit of the spooled file
+
+    Returns:
+        The file, rewound, and the number of data rows written
+    """
+    count = 0
+
+    def counted() -> Iterator[Sequence[Row]]:
+        nonlocal count
+        for rows in batches:
+            count += len(rows)
+            yield rows
+
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+    try:
+        out = gzip.GzipFile(fileobj=spool, mode="wb") if compress else spool
+        for chunk in csv_chunks(counted(), fields):
+            out.write(chunk)
+        if compress:
+            out.close()
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool, count
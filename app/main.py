@@ -6,8 +6,9 @@ from flask import Flask
 from flask_cors import CORS
 from flask_login import LoginManager
 
-from app.api import catalog_bp, export_bp, webhook_bp
+from app.api import catalog_bp, export_bp, insights_bp, webhook_bp
 from app.api.auth import bp as auth_bp
+from app.api.json_provider import OrjsonProvider
 from app.channels.woot.routes import bp as woot_bp
 from app.extensions import db
 
@@ -17,6 +18,7 @@ login_manager = LoginManager()
 def create_app(config_object: str | None = None) -> Flask:
     """Create and configure the Flask application."""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     if config_object == "testing":
         app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI="sqlite:///:memory:")
@@ -37,6 +39,7 @@ def create_app(config_object: str | None = None) -> Flask:
     app.register_blueprint(auth_bp)
     app.register_blueprint(catalog_bp)
     app.register_blueprint(export_bp)
+    app.register_blueprint(insights_bp)
     app.register_blueprint(webhook_bp)
     app.register_blueprint(woot_bp)
 
@@ -0,0 +1,117 @@
+"""Benchmark peak memory of the Drive CSV export.
+
+Fills ``inventory_records`` in a throwaway SQLite file and uploads it to a
+fake Drive resource that discards each chunk.  Two paths are compared:
+
+* the old in-memory path, which loads every ORM row, builds dicts, writes a
+  ``StringIO`` and copies it into a ``BytesIO``
+* ``spool_csv`` + ``GoogleDriveService.upload_stream``, plain and gzipped
+
+The old path is run on ``--legacy-rows`` only; at millions of rows it needs
+more memory than a small host has.
+
+Usage::
+
+    python -m benchmarks.drive_export --rows 2000000 --legacy-rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from app.core.logic.pagination import list_query, parse_fields
+from app.core.models import InventoryRecord
+from app.core.models.base import Base
+from app.core.services import DriveService
+from app.core.streaming import iter_batches, spool_csv
+from app.extensions import db
+from app.main import create_app
+
+from .streaming import populate
+
+
+class _Sink:
+    """Resumable upload that reads each chunk and throws it away."""
+
+    def __init__(self, media):
+        self.media, self.offset = media, 0
+
+    def next_chunk(self, num_retries=0):
+        self.offset += len(self.media.getbytes(self.offset, self.media.chunksize()))
+        return (object(), None) if self.offset < self.media.size() else (None, {"id": "file"})
+
+
+class _SinkFiles:
+    def create(self, body, media_body, fields):
+        return _Sink(media_body)
+
+
+def _drive() -> DriveService:
+    drive = DriveService(None)
+    drive.files = _SinkFiles()
+    return drive
+
+
+def _legacy(limit: int) -> int:
+    records = db.session.query(InventoryRecord).order_by(InventoryRecord.id).limit(limit).all()
+    data = [record.to_dict() for record in records]
+    output = StringIO()
+    writer = csv.DictWriter(output, fieldnames=data[0].keys())
+    writer.writeheader()
+    writer.writerows(data)
+    csv_bytes = BytesIO(output.getvalue().encode())
+    _drive().upload_stream("legacy.csv", csv_bytes, "text/csv")
+    return len(data)
+
+
+def _streamed(limit: int, compress: bool) -> int:
+    fields = parse_fields(None, InventoryRecord)
+    query = list_query(InventoryRecord, fields).limit(limit)
+    spool, rows = spool_csv(iter_batches(db.session, query), fields, compress=compress)
+    with spool:
+        _drive().upload_stream("inventory.csv", spool, "text/csv")
+    return rows
+
+
+def _measure(label: str, fn) -> None:
+    db.session.expunge_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<30} {rows:>10,} rows {elapsed:8.1f}s  peak {peak / 2**20:8.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "drive_export.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            populate(path, args.rows)
+
+            _measure("in-memory (old)", lambda: _legacy(args.legacy_rows))
+            _measure("spooled", lambda: _streamed(args.legacy_rows, False))
+            _measure("spooled", lambda: _streamed(args.rows, False))
+            _measure("spooled + gzip", lambda: _streamed(args.rows, True))
+
+
+if __name__ == "__main__":
+    main()
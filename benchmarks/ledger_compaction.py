@@ -0,0 +1,139 @@
+"""Benchmark inventory queries before and after ledger compaction.
+
+Builds a synthetic ``inventory_records`` ledger in a throwaway SQLite file.
+Deltas are spread over two years and across ``--products`` products and
+three sources.  It then times, before and after ``compact_inventory_ledger``:
+
+* ``InventoryInsights.slow_movers(60)``
+* on-hand by summing the ledger for a sample of products
+* on-hand from ``inventory_levels`` (``CatalogManager.get_on_hand``)
+
+Usage::
+
+    python -m benchmarks.ledger_compaction --rows 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.core.insights import InventoryInsights
+from app.core.logic.catalog import CatalogManager
+from app.core.logic.ledger import compact_inventory_ledger
+from app.core.models import InventoryRecord
+from app.core.models.base import Base
+from app.extensions import db
+from app.main import create_app
+
+SOURCES = ("woot", "amazon", "manual")
+INSERT_BATCH = 100_000
+
+
+def populate(path: Path, rows: int, products: int) -> None:
+    """Insert ``products`` products and ``rows`` random ledger rows into the SQLite file ``path``."""
+    now = datetime.utcnow()
+    # Products predate the whole ledger, so movement (not creation) decides who is slow.
+    created = str(now - timedelta(days=731))
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO master_products (id, sku, title, is_active, last_movement_at, created_at, updated_at) "
+        "VALUES (?, ?, ?, 1, ?, ?, ?)",
+        ((i, f"SKU-{i:07d}", f"Product {i}", created, created, created) for i in range(1, products + 1)),
+    )
+    rng = random.Random(7)
+    for start in range(0, rows, INSERT_BATCH):
+        batch = []
+        for _ in range(min(INSERT_BATCH, rows - start)):
+            at = str(now - timedelta(seconds=rng.randrange(730 * 86400)))
+            # Every 10th product stops moving 120 days ago so slow_movers has results.
+            product = rng.randrange(1, products + 1)
+            if product % 10 == 0:
+                at = str(now - timedelta(days=120 + rng.randrange(600)))
+            batch.append((product, rng.randrange(-5, 10), rng.choice(SOURCES), at, at))
+        conn.executemany(
+            "INSERT INTO inventory_records (product_id, quantity_delta, source, is_active, created_at, updated_at) "
+            "VALUES (?, ?, ?, 1, ?, ?)",
+            batch,
+        )
+        conn.commit()
+    conn.close()
+
+
+def _timed(label: str, fn) -> object:
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<36} {time.perf_counter() - start:9.3f}s")
+    return result
+
+
+def _measure(manager: CatalogManager, sample: list) -> None:
+    session = manager.db
+    count = session.execute(select(func.count()).select_from(InventoryRecord)).scalar_one()
+    print(f"  ledger rows                          {count:>12,}")
+    movers = _timed("slow_movers(60)", lambda: InventoryInsights(session).slow_movers(60))
+    print(f"  slow movers                          {len(movers):>12,}")
+    session.expunge_all()
+
+    def ledger_sums():
+        return [
+            session.execute(
+                select(func.sum(InventoryRecord.quantity_delta)).where(InventoryRecord.product_id == pid)
+            ).scalar()
+            for pid in sample
+        ]
+
+    sums = _timed(f"on-hand from ledger x{len(sample)}", ledger_sums)
+    levels = _timed(f"on-hand from levels x{len(sample)}", lambda: [manager.get_on_hand(pid) for pid in sample])
+    assert [s or 0 for s in sums] == levels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--retention-days", type=int, default=90)
+    parser.add_argument("--sample", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ledger.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            start = time.perf_counter()
+            populate(path, args.rows, args.products)
+            print(f"generated {args.rows:,} ledger rows in {time.perf_counter() - start:.1f}s")
+
+            manager = CatalogManager(db.session)
+            manager.rebuild_inventory_levels()
+            sample = random.Random(1).sample(range(1, args.products + 1), args.sample)
+
+            print("before compaction")
+            _measure(manager, sample)
+
+            horizon = datetime.utcnow() - timedelta(days=args.retention_days)
+            result = _timed(
+                "compact_inventory_ledger",
+                lambda: compact_inventory_ledger(db.session, horizon, Path(tmp) / "archive"),
+            )
+            archive_mb = Path(result["archive"]).stat().st_size / 2**20
+            print(f"  {result['rows']:,} rows -> {result['checkpoints']:,} checkpoints, archive {archive_mb:.1f} MiB")
+
+            print("after compaction")
+            _measure(manager, sample)
+
+
+if __name__ == "__main__":
+    main()
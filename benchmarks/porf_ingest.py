@@ -0,0 +1,82 @@
+"""Benchmark streaming PORF ingestion.
+
+Generates synthetic PORF CSV files on disk and ingests each one into a
+throwaway SQLite database, reporting throughput and peak RSS.  Every size runs
+in its own interpreter so ``ru_maxrss`` reflects only that run.
+
+Usage::
+
+    python -m benchmarks.porf_ingest                  # 10k / 100k / 1M rows
+    python -m benchmarks.porf_ingest --rows 100000 --single
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def _write_porf(path: Path, rows: int) -> None:
+    with open(path, "w", newline="") as fh:
+        fh.write("product_id,product_name,quantity,unit_price\n")
+        for i in range(rows):
+            fh.write(f"SKU-{i:07d},Synthetic product {i},{i % 50 + 1},{i % 997 + 0.99:.2f}\n")
+
+
+def _run_single(rows: int, chunk_size: int) -> None:
+    from app.channels.woot.logic import ingest_porf
+    from app.core.services import DriveService
+    from app.core.services.sheets import SheetsService
+    from app.extensions import db
+    from app.main import create_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "porf.csv"
+        _write_porf(csv_path, rows)
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{Path(tmp) / 'bench.db'}"
+
+        app = create_app(Config)
+        with app.app_context():
+            db.create_all()
+            baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            start = time.perf_counter()
+            with open(csv_path, "rb") as fh:
+                ingest_porf(fh, DriveService(None), SheetsService(None), chunk_size=chunk_size)
+            elapsed = time.perf_counter() - start
+            peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(
+        f"{rows:>10,} rows  {elapsed:8.2f}s  {rows / elapsed:>10,.0f} rows/s  "
+        f"peak RSS {peak_kb / 1024:7.1f} MiB  (+{(peak_kb - baseline_kb) / 1024:.1f} MiB)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="*", default=list(DEFAULT_SIZES))
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--single", action="store_true", help="run one size in-process")
+    args = parser.parse_args()
+
+    if args.single:
+        _run_single(args.rows[0], args.chunk_size)
+        return
+    for rows in args.rows:
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.porf_ingest", "--single",
+             "--rows", str(rows), "--chunk-size", str(args.chunk_size)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
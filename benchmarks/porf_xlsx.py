@@ -0,0 +1,81 @@
+"""Benchmark XLSX PORF parsing: read-only streaming vs. default openpyxl mode.
+
+``read-only`` walks the sheet with the same row iterator ``ingest_porf`` uses
+(``load_workbook(read_only=True)`` + ``iter_rows(values_only=True)``).
+``default`` loads the workbook the way ``SpreadsheetBuilder.write_excel`` does
+and then iterates it.  Each mode runs in its own interpreter so peak RSS is
+measured independently.
+
+Usage::
+
+    python -m benchmarks.porf_xlsx --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+MODES = ("read-only", "default")
+
+
+def _write_workbook(path: Path, rows: int) -> None:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["product_id", "product_name", "quantity", "unit_price"])
+    for i in range(rows):
+        sheet.append([f"SKU-{i:07d}", f"Synthetic product {i}", i % 50 + 1, round(i % 997 + 0.99, 2)])
+    workbook.save(path)
+
+
+def _run_single(path: Path, mode: str) -> None:
+    from app.channels.woot.logic import _iter_xlsx_rows
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(path, "rb") as fh:
+        if mode == "read-only":
+            count = sum(1 for _ in _iter_xlsx_rows(fh))
+        else:
+            workbook = load_workbook(fh)
+            count = sum(1 for _ in workbook.active.iter_rows(min_row=2, values_only=True))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(
+        f"{mode:>9}  {count:>10,} rows  {elapsed:8.2f}s  {count / elapsed:>10,.0f} rows/s  "
+        f"peak RSS {peak_kb / 1024:7.1f} MiB  (+{(peak_kb - baseline_kb) / 1024:.1f} MiB)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--mode", choices=MODES, help="run one mode in-process")
+    parser.add_argument("--path", type=Path, help="existing workbook (used with --mode)")
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_single(args.path, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "porf.xlsx"
+        _write_workbook(path, args.rows)
+        print(f"workbook: {path.stat().st_size / 2**20:.1f} MiB, {args.rows:,} rows")
+        for mode in MODES:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.porf_xlsx", "--mode", mode, "--path", str(path)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
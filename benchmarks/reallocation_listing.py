@@ -0,0 +1,108 @@
+"""Benchmark reallocation candidate pages at increasing depth.
+
+Fills a throwaway SQLite file with ``--candidates`` candidates spread over
+two channels.  It then times ``ReallocationService.candidate_page`` for the
+first page and for a page ``--depth`` pages in (reached through its cursor).
+An ``OFFSET`` query to the same depth is timed for comparison.
+
+Usage::
+
+    python -m benchmarks.reallocation_listing --candidates 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.core.insights import ReallocationService
+from app.core.models import ReallocationCandidate
+from app.core.models.base import Base
+from app.extensions import db
+from app.main import create_app
+
+CHANNELS = ("woot", "amazon")
+
+
+def populate(path: Path, candidates: int) -> None:
+    """Insert products and ``candidates`` candidates (two per product) into the SQLite file ``path``."""
+    now = datetime.utcnow()
+    products = (candidates + 1) // 2
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO master_products (id, sku, title, is_active, last_movement_at, created_at, updated_at) "
+        "VALUES (?, ?, ?, 1, ?, ?, ?)",
+        ((i, f"SKU-{i:07d}", f"Product {i}", str(now), str(now), str(now)) for i in range(1, products + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO reallocation_candidates (product_id, from_channel, reason, is_active, created_at, updated_at) "
+        "VALUES (?, ?, ?, 1, ?, ?)",
+        (
+            (i // 2 + 1, CHANNELS[i % 2], "slow mover", str(now - timedelta(seconds=candidates - i)), str(now))
+            for i in range(candidates)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _timed(label: str, fn) -> object:
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<36} {(time.perf_counter() - start) * 1000:9.2f}ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--depth", type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "candidates.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            populate(path, args.candidates)
+            print(f"{args.candidates:,} candidates, {args.page_size} per page")
+
+            service = ReallocationService(db.session)
+            service.candidate_page(limit=1)  # warm the statement cache
+            _timed("first page", lambda: service.candidate_page(limit=args.page_size))
+            _timed("first page, channel=woot", lambda: service.candidate_page(channel="woot", limit=args.page_size))
+
+            skip = args.page_size * args.depth
+            deep = db.session.execute(
+                select(ReallocationCandidate.created_at, ReallocationCandidate.id)
+                .order_by(ReallocationCandidate.created_at.desc(), ReallocationCandidate.id.desc())
+                .offset(skip - 1)
+                .limit(1)
+            ).one()
+            _timed(f"keyset page {args.depth:,}", lambda: service.candidate_page(limit=args.page_size, before=deep))
+            _timed(
+                f"OFFSET page {args.depth:,}",
+                lambda: db.session.execute(
+                    select(ReallocationCandidate)
+                    .options(joinedload(ReallocationCandidate.product))
+                    .order_by(ReallocationCandidate.created_at.desc(), ReallocationCandidate.id.desc())
+                    .offset(skip)
+                    .limit(args.page_size)
+                ).scalars().all(),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Microbenchmark JSON serialization of ``MasterProduct`` rows.
+
+Loads ``--rows`` products from a throwaway SQLite file once, then times
+turning them into a JSON body with:
+
+* the previous path: ``to_dict`` iterating ``__table__.columns`` with
+  ``getattr``, then Flask's default (stdlib ``json``) provider
+* precompiled registry serializers, then ``orjson``
+* projected Core ``Row`` objects handed straight to ``orjson``
+
+Usage::
+
+    python -m benchmarks.serialization --rows 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+
+from app.core.models import MasterProduct
+from app.core.models.base import Base
+from app.core.serialization import dumps, serializer_for
+from app.extensions import db
+from app.main import create_app
+
+
+def _timed(label: str, fn, repeat: int) -> bytes:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<44} {best * 1000:9.1f}ms  {len(body) / 2**20:6.1f} MiB")
+    return body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "products.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            now = str(datetime.utcnow())
+            conn = sqlite3.connect(path)
+            conn.executemany(
+                "INSERT INTO master_products (id, sku, title, description, extra_data, is_active, last_movement_at, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)",
+                (
+                    (i, f"SKU-{i:07d}", f"Product {i}", "A product", '{"color": "red"}', now, now, now)
+                    for i in range(1, args.rows + 1)
+                ),
+            )
+            conn.commit()
+            conn.close()
+
+            products = db.session.query(MasterProduct).all()
+            rows = db.session.execute(
+                select(MasterProduct.id, MasterProduct.sku, MasterProduct.title, MasterProduct.last_movement_at)
+            ).all()
+            print(f"{len(products):,} products")
+
+            legacy_provider = DefaultJSONProvider(app)
+            columns = MasterProduct.__table__.columns
+
+            def legacy():
+                items = [{column.name: getattr(p, column.name) for column in columns} for p in products]
+                return legacy_provider.dumps(items).encode()
+
+            serialize = serializer_for(MasterProduct)
+            _timed("to_dict (getattr per column) + stdlib json", legacy, args.repeat)
+            _timed("registry serializer + orjson", lambda: dumps([serialize(p) for p in products]), args.repeat)
+            _timed("ORM instances straight to orjson", lambda: dumps(products), args.repeat)
+            _timed("projected Core rows + orjson", lambda: dumps(rows), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark the Sheets catalogue export.
+
+Fills ``master_products`` in a throwaway SQLite file and exports it to a fake
+spreadsheet.  The fake JSON-encodes each append body, as the API client
+would, and then drops it.  Two paths are compared:
+
+* the old path: ORM ``to_dict()`` records turned into rows, 500 rows per append
+* ``export_schema`` with the ``PRODUCT_SHEET`` column mapping, ~2 MB per append
+
+For each it prints local time, the number of append requests, and the time
+those requests take at the Sheets limit of 60 writes per minute.
+
+Usage::
+
+    python -m benchmarks.sheets_export --rows 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Mapping
+
+from app.api.export import PRODUCT_SHEET
+from app.core.models import MasterProduct
+from app.core.models.base import Base
+from app.core.services.sheets import SheetsService
+from app.extensions import db
+from app.main import create_app
+
+INSERT_BATCH = 100_000
+WRITES_PER_MINUTE = 60
+# Time local work only; the write limit is applied arithmetically in the report.
+os.environ.setdefault("GOOGLE_API_RATE", "1000000")
+os.environ.setdefault("GOOGLE_API_BURST", "1000000")
+
+
+class _Request:
+    def __init__(self, fake, body):
+        self._fake, self._body = fake, body
+
+    def execute(self):
+        self._fake.requests += 1
+        self._fake.bytes += len(json.dumps(self._body))
+        return {}
+
+
+class _FakeSpreadsheets:
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+
+    def values(self):
+        return self
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        return _Request(self, body)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if value is None:
+        return ""
+    return value
+
+
+def _records_to_rows(records: Iterable[Mapping[str, Any]]) -> Iterator[List[Any]]:
+    """Yield a header row followed by one row per record, keyed by the first record."""
+    header = None
+    for record in records:
+        if header is None:
+            header = list(record.keys())
+            yield header
+        yield [_cell(record.get(key)) for key in header]
+
+
+def populate(path: Path, rows: int) -> None:
+    """Insert ``rows`` products into the SQLite file ``path``."""
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    for start in range(0, rows, INSERT_BATCH):
+        batch = []
+        for i in range(start, min(start + INSERT_BATCH, rows)):
+            at = str(now - timedelta(minutes=i))
+            batch.append((i + 1, f"SKU-{i:07d}", f"Product {i} in the catalogue", f"Description {i}", at, at, at))
+        conn.executemany(
+            "INSERT INTO master_products (id, sku, title, description, is_active, last_movement_at, created_at, "
+            "updated_at) VALUES (?, ?, ?, ?, 1, ?, ?, ?)",
+            batch,
+        )
+        conn.commit()
+    conn.close()
+
+
+def _service(fake: _FakeSpreadsheets) -> SheetsService:
+    service = SheetsService(None)
+    service.spreadsheets = fake
+    return service
+
+
+def _report(label: str, fake: _FakeSpreadsheets, rows: int, elapsed: float) -> None:
+    api_minutes = fake.requests / WRITES_PER_MINUTE
+    print(
+        f"  {label:<26} {elapsed:7.1f}s  {rows / elapsed:9,.0f} rows/s  {fake.requests:6,} requests"
+        f"  {fake.bytes / fake.requests / 2**20:5.2f} MiB/request  >= {api_minutes:6.1f} min at the write limit"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sheets_export.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            populate(path, args.rows)
+            print(f"{args.rows:,} products")
+
+            fake = _FakeSpreadsheets()
+            start = time.perf_counter()
+            products = db.session.query(MasterProduct).order_by(MasterProduct.id).yield_per(1000)
+            records = (product.to_dict() for product in products)
+            rows = _service(fake).append_rows_chunked("sheet", _records_to_rows(records))
+            _report("to_dict + 500-row appends", fake, rows, time.perf_counter() - start)
+            db.session.expunge_all()
+
+            fake = _FakeSpreadsheets()
+            report = _service(fake).export_schema(db.session, PRODUCT_SHEET, "sheet")
+            _report(f"schema, {report.chunk_rows:,}-row appends", fake, report.rows, report.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark slow-mover queries: ``NOT IN`` over the ledger vs. ``last_movement_at``.
+
+Builds the synthetic catalog and ledger from ``benchmarks.ledger_compaction``
+in a throwaway SQLite file.  It then times:
+
+* the original query (``NOT IN`` over ledger rows from the last ``days`` days)
+* ``InventoryInsights.slow_movers`` (full ORM list, index range)
+* the first page of ``InventoryInsights.slow_mover_page``
+* walking every page
+
+Usage::
+
+    python -m benchmarks.slow_movers --products 100000 --rows 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.core.insights import InventoryInsights
+from app.core.logic.catalog import CatalogManager
+from app.core.models import InventoryRecord, MasterProduct
+from app.core.models.base import Base
+from app.extensions import db
+from app.main import create_app
+from benchmarks.ledger_compaction import populate
+
+
+def _timed(label: str, fn) -> object:
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<32} {time.perf_counter() - start:9.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "catalog.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            start = time.perf_counter()
+            populate(path, args.rows, args.products)
+            CatalogManager(db.session).refresh_last_movement()
+            print(f"generated {args.products:,} products / {args.rows:,} ledger rows in "
+                  f"{time.perf_counter() - start:.1f}s")
+
+            session = db.session
+            insights = InventoryInsights(session)
+
+            def not_in():
+                cutoff = datetime.utcnow() - timedelta(days=args.days)
+                recent = session.query(InventoryRecord.product_id).filter(InventoryRecord.created_at >= cutoff)
+                return session.query(MasterProduct).filter(~MasterProduct.id.in_(recent)).all()
+
+            legacy = _timed("NOT IN over ledger", not_in)
+            session.expunge_all()
+            current = _timed("slow_movers (index range)", lambda: insights.slow_movers(args.days))
+            session.expunge_all()
+            assert {p.id for p in legacy} == {p.id for p in current}
+            _timed("first page", lambda: insights.slow_mover_page(args.days, args.page_size))
+
+            def walk():
+                pages, after = 0, None
+                while True:
+                    _, after = insights.slow_mover_page(args.days, args.page_size, after)
+                    pages += 1
+                    if after is None:
+                        return pages
+
+            pages = _timed("all pages", walk)
+            print(f"  {len(current):,} slow movers over {pages} pages")
+
+
+if __name__ == "__main__":
+    main()
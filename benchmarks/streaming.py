@@ -0,0 +1,102 @@
+"""Benchmark streamed NDJSON/CSV exports against building the whole JSON body.
+
+Fills ``inventory_records`` in a throwaway SQLite file, then reads every row
+of ``GET /api/catalog/inventory``'s query three ways and reports wall time
+and peak traced memory:
+
+* the whole result as one list of dicts, encoded with ``dumps``
+* ``stream_query`` as NDJSON
+* ``stream_query`` as CSV
+
+Usage::
+
+    python -m benchmarks.streaming --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.core.logic.pagination import list_query
+from app.core.models import InventoryRecord
+from app.core.models.base import Base
+from app.core.serialization import dumps
+from app.core.streaming import CSV, NDJSON, stream_query
+from app.extensions import db
+from app.main import create_app
+
+FIELDS = ["id", "product_id", "quantity_delta", "source", "notes", "created_at"]
+INSERT_BATCH = 100_000
+
+
+def populate(path: Path, rows: int) -> None:
+    """Insert one product and ``rows`` ledger rows into the SQLite file ``path``."""
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO master_products (id, sku, title, is_active, last_movement_at, created_at, updated_at) "
+        "VALUES (1, 'A', 'A', 1, ?, ?, ?)",
+        (str(now),) * 3,
+    )
+    for start in range(0, rows, INSERT_BATCH):
+        batch = [
+            (1, i % 17 - 8, "woot", str(now - timedelta(seconds=i)))
+            for i in range(start, min(start + INSERT_BATCH, rows))
+        ]
+        conn.executemany(
+            "INSERT INTO inventory_records (product_id, quantity_delta, source, is_active, created_at, updated_at) "
+            "VALUES (?, ?, ?, 1, ?, ?)",
+            [row + (row[-1],) for row in batch],
+        )
+        conn.commit()
+    conn.close()
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed:8.2f}s  peak {peak / 2**20:8.1f} MiB  body {size / 2**20:8.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "streaming.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            populate(path, args.rows)
+            print(f"{args.rows:,} inventory rows")
+            query = list_query(InventoryRecord, FIELDS, descending=True)
+
+            def whole_body() -> int:
+                rows = db.session.execute(query).all()
+                return len(dumps([dict(zip(FIELDS, row)) for row in rows]))
+
+            def streamed(mimetype: str) -> int:
+                return sum(len(chunk) for chunk in stream_query(db.session, query, FIELDS, mimetype))
+
+            _measure("list + dumps", whole_body)
+            _measure("stream NDJSON", lambda: streamed(NDJSON))
+            _measure("stream CSV", lambda: streamed(CSV))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark velocity, PORF suggestions and reallocation scoring over a large order history.
+
+Builds ``--skus`` products with stock on two channels in a throwaway SQLite
+file.  It adds ``--orders`` orders of one to three lines each, spread over
+the last 120 days, then times the SQL aggregation, the NumPy pass, a full
+``PorfSuggester.suggest`` draft and two ``generate_candidates`` runs (insert,
+then re-run upsert).
+
+Usage::
+
+    python -m benchmarks.velocity --skus 100000 --orders 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from app.channels.woot.suggest import PorfSuggester
+from app.core.insights import ReallocationService, VelocityEngine
+from app.core.models.base import Base
+from app.extensions import db
+from app.main import create_app
+
+CHANNELS = ("woot", "amazon")
+INSERT_BATCH = 100_000
+
+
+def populate(path: Path, skus: int, orders: int, as_of: date) -> None:
+    """Insert products, inventory levels and ``orders`` random orders into the SQLite file ``path``."""
+    now = str(datetime.utcnow())
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO master_products (id, sku, title, is_active, last_movement_at, created_at, updated_at) "
+        "VALUES (?, ?, ?, 1, ?, ?, ?)",
+        ((i, f"SKU-{i:07d}", f"Product {i}", now, now, now) for i in range(1, skus + 1)),
+    )
+    rng = random.Random(7)
+    conn.executemany(
+        "INSERT INTO inventory_levels (product_id, channel, on_hand, is_active, created_at, updated_at) "
+        "VALUES (?, ?, ?, 1, ?, ?)",
+        ((i, channel, rng.randrange(200), now, now) for i in range(1, skus + 1) for channel in CHANNELS),
+    )
+    end = datetime.combine(as_of + timedelta(days=1), datetime.min.time())
+    line_id = 0
+    for start in range(0, orders, INSERT_BATCH):
+        order_rows, line_rows = [], []
+        for order_id in range(start + 1, min(start + INSERT_BATCH, orders) + 1):
+            placed = str(end - timedelta(seconds=rng.randrange(120 * 86400)))
+            order_rows.append((order_id, str(order_id), rng.choice(CHANNELS), "shipped", "USD", "0", placed, now, now))
+            for _ in range(rng.randint(1, 3)):
+                line_id += 1
+                # Skew demand so a tenth of the catalogue sells most of the units.
+                sku = rng.randrange(1, skus // 10 + 1) if rng.random() < 0.7 else rng.randrange(1, skus + 1)
+                line_rows.append((line_id, order_id, f"SKU-{sku:07d}", rng.randint(1, 4), now, now))
+        conn.executemany(
+            "INSERT INTO order_records (id, ext_id, channel, status, currency, total, placed_at, created_at, "
+            "updated_at, is_active) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+            order_rows,
+        )
+        conn.executemany(
+            "INSERT INTO order_lines (id, order_id, sku, quantity, created_at, updated_at, is_active) "
+            "VALUES (?, ?, ?, ?, ?, ?, 1)",
+            line_rows,
+        )
+        conn.commit()
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    args = parser.parse_args()
+    as_of = date.today()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "orders.db"
+
+        class Config:
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+        app = create_app(Config)
+        with app.app_context():
+            Base.metadata.create_all(db.engine)
+            start = time.perf_counter()
+            populate(path, args.skus, args.orders, as_of)
+            print(f"generated {args.skus:,} SKUs / {args.orders:,} orders in {time.perf_counter() - start:.1f}s")
+
+            engine = VelocityEngine(db.session)
+            for label, kwargs in (("per channel", {}), ("combined", {"combine_channels": True})):
+                start = time.perf_counter()
+                sales = engine.daily_sales(as_of, combine_channels=kwargs.get("combine_channels", False))
+                sql = time.perf_counter() - start
+                start = time.perf_counter()
+                report = engine.compute(as_of, **kwargs)
+                total = time.perf_counter() - start
+                print(f"  {label:<12} {len(sales[0]):>10,} daily buckets  {len(report):>8,} pairs  "
+                      f"sql {sql:6.2f}s  compute {total:6.2f}s")
+
+            start = time.perf_counter()
+            draft = PorfSuggester(db.session).suggest(as_of)
+            print(f"  draft PORF   {len(draft['lines']):>10,} lines in {time.perf_counter() - start:.2f}s")
+
+            for run in ("first", "re-run"):
+                start = time.perf_counter()
+                result = ReallocationService(db.session).generate_candidates(as_of, engine=engine)
+                print(f"  realloc {run:<6} {result['upserted']:>8,} candidates in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark paged order fetches: ``WootClient`` vs. ``AsyncWootClient``.
+
+Both clients talk to the local stub server from the integration tests.  The
+stub adds ``--latency`` seconds per response to stand in for the network.
+The sync client walks the pages one by one over its ``requests.Session``.
+The async client fetches page 1 and then the remaining pages concurrently.
+
+Usage::
+
+    python -m benchmarks.woot_client --orders 20000 --latency 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.channels.woot.async_client import AsyncWootClient
+from app.channels.woot.client import WootClient
+from tests.integration.woot_stub import WootStubServer
+
+
+def _sync_fetch(url: str, page_size: int) -> int:
+    client = WootClient("bench", url)
+    count, page, total_pages = 0, 1, 1
+    while page <= total_pages:
+        body = client._make_request("GET", "/orders", params={"page": page, "per_page": page_size})
+        count += len(body["items"])
+        total_pages = body["total_pages"]
+        page += 1
+    return count
+
+
+async def _async_fetch(url: str, page_size: int, connections: int) -> int:
+    async with AsyncWootClient("bench", url, page_size=page_size, max_connections=connections) as client:
+        return len(await client.get_orders())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--connections", type=int, default=20)
+    args = parser.parse_args()
+
+    with WootStubServer(orders=args.orders, inventory=0, latency=args.latency) as stub:
+        runs = {
+            "sync": lambda: _sync_fetch(stub.url, args.page_size),
+            "async": lambda: asyncio.run(_async_fetch(stub.url, args.page_size, args.connections)),
+        }
+        for name, run in runs.items():
+            start = time.perf_counter()
+            count = run()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>5}  {count:>8,} orders  {elapsed:7.2f}s  {count / elapsed:>10,.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
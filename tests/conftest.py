@@ -3,23 +3,37 @@ import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Google calls in tests hit fakes; keep the shared rate limiter out of the way.
+os.environ.setdefault("GOOGLE_API_RATE", "1000")
+os.environ.setdefault("GOOGLE_API_BURST", "1000")
 
 import pytest
 
 from alembic import command
 from alembic.config import Config
+from app.core.models.base import Base
 from app.extensions import db
 from app.main import create_app
 
 TEST_DB = "sqlite:///:memory:"
+# Revisions up to 008 use ``now()`` defaults SQLite rejects.  ``migrated_app``
+# creates what 009+ alter or index, in its pre-009 shape, and stamps 008.
+PRE_009_TABLES = (
+    "CREATE TABLE master_products (id INTEGER PRIMARY KEY, sku VARCHAR(100) NOT NULL, title VARCHAR(255) NOT NULL, "
+    "description TEXT, extra_data JSON, is_active BOOLEAN NOT NULL, external_id VARCHAR(255) UNIQUE, "
+    "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)",
+    "CREATE TABLE inventory_records (id INTEGER PRIMARY KEY, product_id INTEGER NOT NULL, "
+    "created_at DATETIME NOT NULL)",
+    "CREATE TABLE woot_porfs (id INTEGER PRIMARY KEY, created_at DATETIME)",
+    "CREATE TABLE woot_pos (id INTEGER PRIMARY KEY, created_at DATETIME)",
+)
 
 
 @pytest.fixture(scope="session")
 def app():
     os.environ["DATABASE_URL"] = TEST_DB
     application = create_app("testing")
-    cfg = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
-    cfg.set_main_option("sqlalchemy.url", TEST_DB)
+    cfg = alembic_config(TEST_DB)
     with application.app_context():
         command.upgrade(cfg, "head")
     yield application
@@ -27,6 +41,46 @@ def app():
         db.drop_all()
 
 
+def alembic_config(url: str) -> Config:
+    cfg = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    cfg.set_main_option("sqlalchemy.url", url)
+    return cfg
+
+
+@pytest.fixture()
+def migrated_app(tmp_path):
+    """Application on a SQLite file migrated from revision 008 to head."""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+
+    class MigratedConfig:
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = url
+
+    application = create_app(MigratedConfig)
+    with application.app_context():
+        with db.engine.begin() as conn:
+            for statement in PRE_009_TABLES:
+                conn.exec_driver_sql(statement)
+        cfg = alembic_config(url)
+        command.stamp(cfg, "008_add_auth_models")
+        command.upgrade(cfg, "head")
+        yield application
+        db.session.remove()
+
+
 @pytest.fixture()
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture()
+def db_app():
+    """Fresh application whose tables are created straight from model metadata."""
+    application = create_app("testing")
+    with application.app_context():
+        db.create_all()
+        Base.metadata.create_all(db.engine)
+        yield application
+        db.session.remove()
+        db.drop_all()
+        Base.metadata.drop_all(db.engine)
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+from alembic import command
+from alembic.config import Config
+from app.extensions import db
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def test_reallocation_candidate_scores_migrate_on_sqlite(migrated_app) -> None:
+    inspector = sa.inspect(db.engine)
+    columns = {column["name"] for column in inspector.get_columns("reallocation_candidates")}
+    assert {"score", "is_active", "external_id", "updated_at"} <= columns
+    assert {constraint["name"] for constraint in inspector.get_unique_constraints("reallocation_candidates")} == {
+        "uq_reallocation_candidates_external_id",
+        "uq_reallocation_candidates_product_channel",
+    }
+
+    insert = sa.text(
+        "INSERT INTO reallocation_candidates (product_id, from_channel, reason, external_id, created_at) "
+        "VALUES (:product_id, 'woot', 'slow mover', 'X', CURRENT_TIMESTAMP)"
+    )
+    with db.engine.begin() as conn:
+        conn.execute(insert, {"product_id": 1})
+    with pytest.raises(sa.exc.IntegrityError), db.engine.begin() as conn:
+        conn.execute(insert, {"product_id": 2})
+
+    cfg = Config(str(ALEMBIC_INI))
+    cfg.set_main_option("sqlalchemy.url", str(db.engine.url))
+    command.downgrade(cfg, "016_add_product_last_movement")
+    command.upgrade(cfg, "head")
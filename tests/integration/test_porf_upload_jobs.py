@@ -0,0 +1,149 @@
+import hashlib
+from datetime import datetime, timedelta
+from functools import partial
+from io import BytesIO
+
+import pytest
+
+from app.channels.woot.jobs import get_ingest_queue
+from app.channels.woot.logic import ingest_porf
+from app.channels.woot.models import WootPorf, WootPorfIngestJob, WootPorfIngestStatus, WootPorfLine
+from app.channels.woot.validation import validate_chunk
+from app.extensions import db
+from app.main import create_app
+
+
+@pytest.fixture()
+def file_app(tmp_path):
+    class Config:
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'jobs.db'}"
+        PORF_UPLOAD_DIR = str(tmp_path)
+
+    application = create_app(Config)
+    with application.app_context():
+        db.create_all()
+    yield application
+    with application.app_context():
+        get_ingest_queue().shutdown()
+
+
+def test_porf_upload_is_queued_and_reports_progress(file_app, tmp_path):
+    client = file_app.test_client()
+    csv = b"product_id,product_name,quantity,unit_price\nP1,One,2,1.50\nP2,Two,3,2.00\n"
+
+    resp = client.post("/api/woot/porf-upload", data={"file": (BytesIO(csv), "porf.csv")})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    assert resp.headers["Location"].endswith(f"/api/woot/porf-upload/{job_id}")
+
+    with file_app.app_context():
+        get_ingest_queue().wait(job_id, timeout=10)
+
+    body = client.get(f"/api/woot/porf-upload/{job_id}").get_json()
+    assert body["status"] == "succeeded"
+    assert body["rows_parsed"] == 2
+    assert body["rows_stored"] == 2
+    assert body["sheet_rows_written"] == 0
+    assert body["porf_id"] is not None
+    assert body["errors"] == []
+    assert list(tmp_path.glob("porf-*")) == []
+
+
+def test_porf_upload_status_unknown_job(file_app):
+    resp = file_app.test_client().get("/api/woot/porf-upload/missing")
+    assert resp.status_code == 404
+
+
+def test_repeat_porf_upload_returns_original_porf(file_app):
+    client = file_app.test_client()
+    csv = b"product_id,product_name,quantity,unit_price\nP1,One,2,1.50\n"
+
+    first = client.post("/api/woot/porf-upload", data={"file": (BytesIO(csv), "porf.csv")})
+    with file_app.app_context():
+        get_ingest_queue().wait(first.get_json()["job_id"], timeout=10)
+    original = client.get(first.headers["Location"]).get_json()
+
+    again = client.post("/api/woot/porf-upload", data={"file": (BytesIO(csv), "again.csv")})
+    assert again.status_code == 200
+    body = again.get_json()
+    assert body["duplicate"] is True
+    assert body["status"] == "succeeded"
+    assert body["porf_id"] == original["porf_id"]
+    assert body["sha256"] == original["sha256"]
+
+
+def test_failed_ingest_discards_partial_porf(file_app, monkeypatch):
+    calls = []
+
+    def flaky_validate(chunk, first_row):
+        calls.append(first_row)
+        if len(calls) == 2:
+            raise RuntimeError("boom")
+        return validate_chunk(chunk, first_row=first_row)
+
+    monkeypatch.setattr("app.channels.woot.logic.validate_chunk", flaky_validate)
+    monkeypatch.setattr("app.channels.woot.jobs.ingest_porf", partial(ingest_porf, chunk_size=1))
+    csv = b"product_id,product_name,quantity,unit_price\nP1,One,2,1.50\nP2,Two,3,2.00\n"
+
+    client = file_app.test_client()
+    job_id = client.post("/api/woot/porf-upload", data={"file": (BytesIO(csv), "porf.csv")}).get_json()["job_id"]
+    with file_app.app_context():
+        get_ingest_queue().wait(job_id, timeout=10)
+
+    body = client.get(f"/api/woot/porf-upload/{job_id}").get_json()
+    assert body["status"] == "failed"
+    assert body["porf_id"] is None
+    with file_app.app_context():
+        assert db.session.query(WootPorf).count() == 0
+        assert db.session.query(WootPorfLine).count() == 0
+
+
+def test_queue_start_recovers_stale_jobs(file_app, tmp_path):
+    csv = b"product_id,product_name,quantity,unit_price\nP1,One,2,1.50\n"
+    spooled = tmp_path / "porf-left"
+    spooled.write_bytes(csv)
+    stale = datetime.utcnow() - timedelta(hours=1)
+    with file_app.app_context():
+        partial_porf = WootPorf(porf_no="UPLOAD-partial")
+        db.session.add(partial_porf)
+        db.session.flush()
+        db.session.add(WootPorfLine(porf_id=partial_porf.id, product_id="P0", product_name="Zero",
+                                    quantity=1, unit_price=1, total_price=1))
+        db.session.add_all([
+            WootPorfIngestJob(id="running", upload_path=str(spooled), status=WootPorfIngestStatus.RUNNING,
+                              porf_id=partial_porf.id, rows_parsed=1, updated_at=stale),
+            WootPorfIngestJob(id="lost", upload_path=str(tmp_path / "gone"), updated_at=stale),
+            WootPorfIngestJob(id="fresh", upload_path=str(tmp_path / "busy"), status=WootPorfIngestStatus.RUNNING),
+        ])
+        db.session.commit()
+
+        queue = get_ingest_queue()
+        queue.wait("running", timeout=10)
+        db.session.expire_all()
+
+        jobs = {job.id: job for job in db.session.query(WootPorfIngestJob)}
+        assert jobs["running"].status == WootPorfIngestStatus.SUCCEEDED
+        assert jobs["running"].rows_parsed == 1
+        assert jobs["lost"].status == WootPorfIngestStatus.FAILED
+        assert jobs["fresh"].status == WootPorfIngestStatus.RUNNING
+        assert db.session.query(WootPorf).filter_by(porf_no="UPLOAD-partial").count() == 0
+        assert [line.product_id for line in db.session.query(WootPorfLine)] == ["P1"]
+        assert not spooled.exists()
+
+
+def test_repeat_upload_while_pending_returns_pending_job(file_app, tmp_path):
+    csv = b"product_id,product_name,quantity,unit_price\nP1,One,2,1.50\n"
+    with file_app.app_context():
+        get_ingest_queue()
+        db.session.add(WootPorfIngestJob(id="pending", upload_path=str(tmp_path / "porf-pending"),
+                                         sha256=hashlib.sha256(csv).hexdigest()))
+        db.session.commit()
+
+    resp = file_app.test_client().post("/api/woot/porf-upload", data={"file": (BytesIO(csv), "again.csv")})
+
+    assert resp.status_code == 202
+    assert resp.get_json()["job_id"] == "pending"
+    with file_app.app_context():
+        assert db.session.query(WootPorfIngestJob).count() == 1
+    assert list(tmp_path.glob("porf-*")) == []
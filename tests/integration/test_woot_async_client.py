@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.channels.woot.async_client import AsyncWootClient
+from tests.integration.woot_stub import WootStubServer
+
+
+@pytest.fixture()
+def woot_stub():
+    with WootStubServer(orders=250, inventory=30) as server:
+        yield server
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_orders_are_fetched_concurrently_across_pages(woot_stub) -> None:
+    async def fetch():
+        async with AsyncWootClient("key", woot_stub.url, page_size=100) as client:
+            return await client.get_orders(), await client.get_inventory()
+
+    orders, inventory = _run(fetch())
+
+    assert [order["id"] for order in orders] == [f"O{i}" for i in range(250)]
+    assert len(inventory) == 30
+    assert sorted(path for path in woot_stub.requests if path.startswith("/orders")) == [
+        f"/orders?page={page}&per_page=100" for page in (1, 2, 3)
+    ]
+
+
+def test_rate_limited_request_waits_for_retry_after(woot_stub) -> None:
+    woot_stub.fail_next(429, {"Retry-After": "0"})
+    woot_stub.fail_next(503)
+
+    async def fetch():
+        async with AsyncWootClient("key", woot_stub.url, backoff=0.01) as client:
+            return await client.get_inventory()
+
+    assert len(_run(fetch())) == 30
+    assert len(woot_stub.requests) == 3
+
+
+def test_post_is_not_retried_on_server_error() -> None:
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(502)
+
+    async def create():
+        async with AsyncWootClient("key", "https://woot.test", transport=httpx.MockTransport(handler)) as client:
+            await client.create_order({"sku": "P1"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _run(create())
+    assert len(calls) == 1
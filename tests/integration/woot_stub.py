@@ -0,0 +1,98 @@
+"""Local stub of the Woot API for client tests and benchmarks.
+
+Serves paged ``/orders`` and ``/inventory`` over real HTTP/1.1 keep-alive
+connections.  Responses can be delayed to simulate network latency, and
+queued statuses (e.g. ``429``) can be injected ahead of normal responses.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+class WootStubServer:
+    """Threaded stub server; use as a context manager and read :attr:`url`."""
+
+    def __init__(self, orders: int = 1000, inventory: int = 500, latency: float = 0.0) -> None:
+        self.data = {
+            "/orders": [{"id": f"O{i}", "status": "shipped", "total": i} for i in range(orders)],
+            "/inventory": [{"product_id": f"P{i}", "quantity": i % 40} for i in range(inventory)],
+        }
+        self.latency = latency
+        self.failures: Deque[Tuple[int, Dict[str, str]]] = deque()
+        self.requests: List[str] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, status: int, headers: Optional[Dict[str, str]] = None) -> None:
+        """Answer the next request with ``status`` instead of data."""
+        self.failures.append((status, headers or {}))
+
+    def __enter__(self) -> "WootStubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: object, headers: Dict[str, str]) -> None:
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                with stub._lock:
+                    stub.requests.append(self.path)
+                    failure = stub.failures.popleft() if stub.failures else None
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if failure is not None:
+                    self._send(failure[0], {"error": "injected"}, failure[1])
+                    return
+                items = stub.data.get(url.path)
+                if items is None:
+                    self._send(404, {"error": "not found"}, {})
+                    return
+                query = parse_qs(url.query)
+                if "page" not in query:
+                    self._send(200, items, {})
+                    return
+                page, per_page = int(query["page"][0]), int(query.get("per_page", ["100"])[0])
+                start = (page - 1) * per_page
+                body = {
+                    "items": items[start:start + per_page],
+                    "page": page,
+                    "total_pages": max(1, -(-len(items) // per_page)),
+                }
+                self._send(200, body, {})
+
+        return Handler
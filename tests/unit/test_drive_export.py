@@ -0,0 +1,79 @@
+import csv
+import gzip
+import io
+
+from app.core.logic.catalog import CatalogManager
+from app.core.models import MasterProduct
+from app.core.services import DriveService
+from app.extensions import db
+
+
+class _Upload:
+    """Resumable upload request that reads the media one chunk at a time."""
+
+    def __init__(self, files, body, media):
+        self._files, self._body, self._media = files, body, media
+        self._offset = 0
+
+    def next_chunk(self, num_retries=0):
+        chunk = self._media.getbytes(self._offset, self._media.chunksize())
+        self._files.chunks.append(len(chunk))
+        self._files.content[self._body["name"]] = self._files.content.get(self._body["name"], b"") + chunk
+        self._offset += len(chunk)
+        if self._offset < self._media.size():
+            return object(), None
+        self._files.uploads[self._body["name"]] = self._body
+        return None, {"id": f"file-{len(self._files.uploads)}"}
+
+
+class _FakeFiles:
+    def __init__(self):
+        self.chunks = []
+        self.uploads = {}
+        self.content = {}
+
+    def create(self, body, media_body, fields):
+        return _Upload(self, body, media_body)
+
+
+def _drive(files):
+    drive = DriveService(None)
+    drive.files = files
+    return drive
+
+
+def test_upload_stream_sends_chunks(db_app) -> None:
+    files = _FakeFiles()
+    result = _drive(files).upload_stream("a.csv", io.BytesIO(b"x" * 1000), "text/csv", parents=["f"], chunk_size=256)
+
+    assert result == {"id": "file-1"}
+    assert files.chunks == [256, 256, 256, 232]
+    assert files.uploads["a.csv"] == {"name": "a.csv", "mimeType": "text/csv", "parents": ["f"]}
+
+
+def test_inventory_export_streams_gzipped_csv(db_app, monkeypatch) -> None:
+    files = _FakeFiles()
+    monkeypatch.setattr("app.api.export.DriveService", lambda credentials: _drive(files))
+    product = MasterProduct(sku="A", title="A", extra_data={"color": "red"})
+    db.session.add(product)
+    db.session.commit()
+    for delta in (3, -1):
+        CatalogManager(db.session).adjust_inventory(product.id, delta, "woot")
+
+    client = db_app.test_client()
+    response = client.post("/api/export/drive/inventory", json={"folder_id": "f", "gzip": True})
+    assert response.get_json()["rows_written"] == 2
+    assert files.uploads["inventory.csv.gz"]["mimeType"] == "application/gzip"
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(files.content["inventory.csv.gz"]).decode())))
+    assert [row["quantity_delta"] for row in rows] == ["3", "-1"]
+
+    response = client.post("/api/export/drive/products", json={"folder_id": "f"})
+    assert response.get_json()["rows_written"] == 1
+    (row,) = csv.DictReader(io.StringIO(files.content["products.csv"].decode()))
+    assert row["sku"] == "A" and row["extra_data"] == '{"color":"red"}' and row["description"] == ""
+
+
+def test_drive_export_skipped_when_disabled(db_app) -> None:
+    client = db_app.test_client()
+    assert client.post("/api/export/drive/products", json={}).status_code == 400
+    assert client.post("/api/export/drive/products", json={"folder_id": "f"}).status_code == 204
@@ -0,0 +1,80 @@
+from app.core.services import DriveService
+from app.core.services.google.folder_cache import FolderCache
+from app.extensions import db
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class _FakeFiles:
+    """Minimal ``files()`` resource that counts ``list`` calls."""
+
+    def __init__(self):
+        self.folders = {}
+        self.list_calls = 0
+
+    def list(self, q, fields):
+        self.list_calls += 1
+        name = q.split("'")[1]
+        return _Request({"files": [{"id": fid} for fid, fname in self.folders.items() if fname == name]})
+
+    def create(self, body, fields):
+        folder_id = f"id-{len(self.folders)}"
+        self.folders[folder_id] = body["name"]
+        return _Request({"id": folder_id, "name": body["name"]})
+
+
+def _drive(files, cache):
+    drive = DriveService(None, folder_cache=cache)
+    drive.files = files
+    return drive
+
+
+def test_folder_ids_are_served_from_cache(db_app) -> None:
+    files = _FakeFiles()
+    cache = FolderCache(db.session)
+    drive = _drive(files, cache)
+
+    root = drive.ensure_workspace("default", channels=["woot"])
+    porfs = drive.ensure_subfolder(root, "woot/porfs")
+    cold_calls = files.list_calls
+    assert cold_calls == 3
+
+    assert drive.ensure_workspace("default", channels=["woot"]) == root
+    assert drive.ensure_subfolder(root, "woot/porfs") == porfs
+    assert files.list_calls == cold_calls
+    assert cache.stats()["hits"] == 3
+
+    # A fresh process starts with an empty LRU but finds the persisted IDs.
+    restarted = FolderCache(db.session)
+    assert _drive(files, restarted).ensure_subfolder(root, "woot/porfs") == porfs
+    assert files.list_calls == cold_calls
+    assert restarted.stats()["db_hits"] == 1
+
+
+def test_forget_folder_drops_children(db_app) -> None:
+    files = _FakeFiles()
+    cache = FolderCache(db.session)
+    drive = _drive(files, cache)
+    root = drive.ensure_workspace("default")
+    drive.ensure_subfolder(root, "woot/porfs")
+
+    drive.forget_folder(root)
+
+    assert cache.get("default") is None
+    assert cache.get(f"{root}/woot/porfs") is None
+
+
+def test_in_process_entries_expire() -> None:
+    now = [0.0]
+    cache = FolderCache(ttl=10, clock=lambda: now[0])
+    cache.set("default", "abc")
+    assert cache.get("default") == "abc"
+    now[0] = 11
+    assert cache.get("default") is None
+    assert cache.stats() == {"hits": 1, "db_hits": 0, "misses": 1, "size": 0}
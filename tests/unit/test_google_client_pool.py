@@ -0,0 +1,38 @@
+import threading
+
+from google.oauth2.credentials import Credentials
+
+from app.core.services.google.client_pool import ClientPool
+
+
+def _credentials(token="token-1"):
+    return Credentials(token=token, refresh_token="refresh", client_id="client", client_secret="secret")
+
+
+def test_clients_are_reused_until_credentials_rotate() -> None:
+    pool = ClientPool()
+    credentials = _credentials()
+
+    first = pool.service("sheets", "v4", credentials)
+    assert pool.service("sheets", "v4", credentials) is first
+    assert pool.service("sheets", "v4", _credentials()) is first
+    assert pool.service("drive", "v3", credentials) is not first
+
+    rotated = pool.service("sheets", "v4", _credentials("token-2"))
+    assert rotated is not first
+    assert (pool.hits, pool.misses) == (2, 3)
+
+
+def test_each_thread_gets_its_own_reused_transport() -> None:
+    service = ClientPool().service("sheets", "v4", _credentials())
+
+    def transport():
+        return service.spreadsheets().get(spreadsheetId="sheet-1").http
+
+    main = transport()
+    assert transport() is main
+    other = []
+    worker = threading.Thread(target=lambda: other.append(transport()))
+    worker.start()
+    worker.join()
+    assert other[0] is not main
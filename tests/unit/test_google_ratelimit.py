@@ -0,0 +1,92 @@
+import threading
+import time
+
+from app.core.services.google.ratelimit import (
+    BACKGROUND,
+    RequestScheduler,
+    SQLiteTokenBucket,
+    TokenBucket,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _GateBucket:
+    def __init__(self):
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.tokens:
+                self.tokens -= 1
+                return 0.0
+            return 0.01
+
+
+def _wait_for(predicate):
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_token_bucket_spends_burst_then_refills() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == 0.5
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0.0
+
+
+def test_interactive_requests_jump_ahead_of_background() -> None:
+    bucket = _GateBucket()
+    scheduler = RequestScheduler(bucket)
+    order = []
+
+    def call(lane, name):
+        scheduler.acquire(lane)
+        order.append(name)
+
+    def depth():
+        return sum(lane["queue_depth"] for lane in scheduler.metrics().values())
+
+    export = threading.Thread(target=call, args=(BACKGROUND, "export"))
+    export.start()
+    _wait_for(lambda: depth() == 1)
+    with scheduler.background():
+        assert scheduler.lane == BACKGROUND
+    upload = threading.Thread(target=call, args=(None, "upload"))
+    upload.start()
+    _wait_for(lambda: depth() == 2)
+    assert scheduler.metrics()["background"]["queue_depth"] == 1
+
+    bucket.tokens = 2
+    export.join(5)
+    upload.join(5)
+
+    assert order == ["upload", "export"]
+    metrics = scheduler.metrics()
+    assert metrics["interactive"]["requests"] == 1
+    assert metrics["background"]["wait_max"] > 0
+
+
+def test_sqlite_bucket_is_shared_between_instances(tmp_path) -> None:
+    clock = _Clock()
+    path = str(tmp_path / "bucket.db")
+    first = SQLiteTokenBucket(path, rate=1.0, capacity=2, clock=clock)
+    second = SQLiteTokenBucket(path, rate=1.0, capacity=2, clock=clock)
+
+    assert first.try_acquire() == 0.0
+    assert second.try_acquire() == 0.0
+    assert first.try_acquire() == 1.0
+    clock.now = 1.0
+    assert second.try_acquire() == 0.0
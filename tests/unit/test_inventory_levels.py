@@ -0,0 +1,51 @@
+from app.core.logic.catalog import CatalogManager
+from app.core.models import InventoryLevel, InventoryRecord, MasterProduct
+from app.extensions import db
+
+
+def _product(sku):
+    product = MasterProduct(sku=sku, title=sku)
+    db.session.add(product)
+    db.session.commit()
+    return product
+
+
+def test_adjust_inventory_maintains_levels(db_app) -> None:
+    manager = CatalogManager(db.session)
+    first, second = _product("SKU1"), _product("SKU2")
+
+    manager.adjust_inventory(first.id, 10, "woot")
+    manager.adjust_inventory(first.id, -3, "woot")
+    last = manager.adjust_inventory(first.id, 5, "amazon")
+    manager.adjust_inventory(second.id, 7, "woot")
+
+    level = db.session.query(InventoryLevel).filter_by(product_id=first.id, channel="woot").one()
+    assert level.on_hand == 7
+    assert manager.get_on_hand(first.id) == 12
+    assert manager.get_on_hand(first.id, "amazon") == 5
+    assert manager.get_inventory_levels(product_id=first.id, channel="amazon")[0].last_record_id == last.id
+
+
+def test_rebuild_matches_incremental_levels(db_app) -> None:
+    manager = CatalogManager(db.session)
+    product = _product("SKU1")
+    manager.adjust_inventory(product.id, 4, "woot")
+    manager.adjust_inventory(product.id, 6, "woot")
+    # A ledger row written behind the manager's back is picked up by a rebuild.
+    db.session.add(InventoryRecord(product_id=product.id, quantity_delta=-1, source="woot"))
+    db.session.commit()
+
+    assert manager.rebuild_inventory_levels() == 1
+    db.session.expire_all()
+    assert manager.get_on_hand(product.id) == 9
+
+
+def test_inventory_levels_endpoint(db_app) -> None:
+    product = _product("SKU1")
+    client = db_app.test_client()
+
+    resp = client.post("/api/catalog/inventory", json={"product_id": product.id, "quantity_delta": 3, "source": "woot"})
+    assert resp.status_code == 201
+
+    levels = client.get(f"/api/catalog/inventory/levels?product_id={product.id}").get_json()
+    assert [(level["channel"], level["on_hand"]) for level in levels] == [("woot", 3)]
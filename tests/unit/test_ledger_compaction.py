@@ -0,0 +1,51 @@
+import csv
+import gzip
+import hashlib
+from datetime import datetime, timedelta
+
+from app.core.logic.catalog import CatalogManager
+from app.core.logic.ledger import CHECKPOINT_NOTE, compact_inventory_ledger
+from app.core.models import InventoryRecord, MasterProduct
+from app.extensions import db
+
+
+def test_compaction_keeps_balances_and_archives_rows(db_app, tmp_path) -> None:
+    product = MasterProduct(sku="SKU1", title="One")
+    db.session.add(product)
+    db.session.commit()
+    now = datetime.utcnow()
+    old = [
+        InventoryRecord(
+            product_id=product.id, quantity_delta=delta, source=source, created_at=now - timedelta(days=age)
+        )
+        for delta, source, age in ((10, "woot", 400), (-4, "woot", 390), (3, "amazon", 380))
+    ]
+    db.session.add_all(old)
+    db.session.add(InventoryRecord(product_id=product.id, quantity_delta=2, source="woot", created_at=now))
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    manager.rebuild_inventory_levels()
+    before = manager.get_on_hand(product.id)
+
+    result = compact_inventory_ledger(db.session, now - timedelta(days=365), tmp_path)
+
+    assert (result["rows"], result["checkpoints"]) == (3, 2)
+    checkpoint = db.session.query(InventoryRecord).filter_by(notes=CHECKPOINT_NOTE, source="woot").one()
+    assert checkpoint.quantity_delta == 6
+    assert checkpoint.created_at == now - timedelta(days=390)
+    assert db.session.query(InventoryRecord).count() == 3
+    manager.rebuild_inventory_levels()
+    assert manager.get_on_hand(product.id) == before == 11
+
+    with gzip.open(result["archive"], "rt") as fh:
+        archived = list(csv.DictReader(fh))
+    assert [row["quantity_delta"] for row in archived] == ["3", "10", "-4"]
+    woot_rows = [row for row in archived if row["source"] == "woot"]
+    audit = "".join(f"{r['id']},{r['product_id']},{r['quantity_delta']},woot,{r['created_at']}\n" for r in woot_rows)
+    digest = hashlib.sha256(audit.encode()).hexdigest()
+    assert checkpoint.extra_data["checkpoint"]["sha256"] == digest
+
+
+def test_compaction_without_old_rows_is_a_no_op(db_app, tmp_path) -> None:
+    assert compact_inventory_ledger(db.session, datetime.utcnow(), tmp_path)["archive"] is None
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.channels.woot.models import WootPo, WootPorf, WootPorfStatus
+from app.core.logic.catalog import CatalogManager
+from app.core.models import MasterProduct
+from app.extensions import db
+
+
+def _walk(client, url):
+    pages, cursor = [], None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else "")).get_json()
+        pages.append(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_products_page_by_id_with_projection(db_app) -> None:
+    db.session.add_all([MasterProduct(sku=f"SKU{i}", title=f"Product {i}") for i in range(5)])
+    db.session.commit()
+    client = db_app.test_client()
+
+    pages = _walk(client, "/api/catalog/products?limit=2&fields=sku,id")
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [item["sku"] for page in pages for item in page] == [f"SKU{i}" for i in range(5)]
+    assert set(pages[0][0]) == {"sku", "id"}
+
+    assert "title" in client.get("/api/catalog/products").get_json()["items"][0]
+    assert client.get("/api/catalog/products?fields=sku,secret").status_code == 400
+    assert client.get("/api/catalog/products?cursor=bogus").status_code == 400
+
+
+def test_inventory_newest_first_and_filtered(db_app) -> None:
+    first, second = MasterProduct(sku="A", title="A"), MasterProduct(sku="B", title="B")
+    db.session.add_all([first, second])
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    for delta in (1, 2, 3):
+        manager.adjust_inventory(first.id, delta, "woot")
+    manager.adjust_inventory(second.id, 9, "woot")
+    client = db_app.test_client()
+
+    pages = _walk(client, f"/api/catalog/inventory?limit=2&product_id={first.id}&fields=quantity_delta")
+    assert [item["quantity_delta"] for page in pages for item in page] == [3, 2, 1]
+
+
+def test_woot_porfs_and_pos_pages(db_app) -> None:
+    db_app.config["LOGIN_DISABLED"] = True
+    start = datetime(2024, 1, 1)
+    porfs = [
+        WootPorf(porf_no=f"P-{i}", total_value=i, created_at=start + timedelta(days=i // 2),
+                 status=WootPorfStatus.APPROVED if i % 2 else WootPorfStatus.DRAFT)
+        for i in range(5)
+    ]
+    db.session.add_all(porfs)
+    db.session.flush()
+    db.session.add(WootPo(po_no="PO-1", porf_id=porfs[0].id, total_ordered=3))
+    db.session.commit()
+    client = db_app.test_client()
+
+    pages = _walk(client, "/api/woot/porfs?limit=2")
+    assert [item["porf_no"] for page in pages for item in page] == ["P-4", "P-3", "P-2", "P-1", "P-0"]
+    assert pages[0][0]["status"] == "draft" and pages[0][0]["total_value"] == "4.00"
+    approved = client.get("/api/woot/porfs?status=approved&fields=porf_no").get_json()["items"]
+    assert approved == [{"porf_no": "P-3"}, {"porf_no": "P-1"}]
+    assert client.get("/api/woot/porfs?status=bogus").status_code == 400
+
+    assert client.get("/api/woot/pos").get_json()["items"][0]["po_no"] == "PO-1"
@@ -0,0 +1,99 @@
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from app.channels.woot.logic import hash_upload, ingest_porf
+from app.channels.woot.models import WootPorf, WootPorfLine, WootPorfUpload
+from app.core.services import DriveService
+from app.core.services.sheets import SheetsService
+from app.extensions import db
+
+
+def _porf_csv(rows: int) -> BytesIO:
+    lines = ["product_id,product_name,quantity,unit_price"]
+    lines += [f"P{i},Product {i},{i + 1},2.50" for i in range(rows)]
+    return BytesIO("\n".join(lines).encode())
+
+
+def test_ingest_porf_streams_in_chunks(db_app) -> None:
+    upload = _porf_csv(25)
+    result = ingest_porf(upload, DriveService(None), SheetsService(None), chunk_size=10)
+
+    porf = db.session.get(WootPorf, int(result["porf_id"]))
+    assert porf is not None
+    assert result["sheet_url"] == ""
+    assert db.session.query(WootPorfLine).filter_by(porf_id=porf.id).count() == 25
+    last = db.session.query(WootPorfLine).filter_by(product_id="P24").one()
+    assert last.quantity == 25
+    assert float(last.total_price) == 62.5
+    # The caller's stream is left open for reuse.
+    assert not upload.closed
+
+
+def test_ingest_porf_reports_bad_rows_and_keeps_exact_totals(db_app) -> None:
+    upload = BytesIO(
+        b"product_id,product_name,quantity,unit_price\n"
+        b"P1,One,3,0.10\n"
+        b"P2,Two,many,1.00\n"
+        b"P3,Three,1,1.005\n"
+        b",Four,1,1.00\n"
+    )
+    result = ingest_porf(upload, DriveService(None), SheetsService(None))
+
+    assert result["errors"] == [
+        {"row": 3, "column": "quantity", "reason": "not a non-negative whole number"},
+        {"row": 4, "column": "unit_price", "reason": "not a non-negative amount with at most 2 decimals"},
+        {"row": 5, "column": "product_id", "reason": "required"},
+    ]
+    line = db.session.query(WootPorfLine).one()
+    assert str(line.total_price) == "0.30"
+    assert str(db.session.get(WootPorf, int(result["porf_id"])).total_value) == "0.30"
+
+
+def test_ingest_porf_accepts_xlsx(db_app) -> None:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["product_id", "product_name", "quantity", "unit_price"])
+    sheet.append(["X1", "Excel one", 4, 2.25])
+    sheet.append(["X2", "Excel two", 1.0, 10])
+    upload = BytesIO()
+    workbook.save(upload)
+    upload.seek(0)
+
+    result = ingest_porf(upload, DriveService(None), SheetsService(None))
+
+    assert result["errors"] == []
+    lines = db.session.query(WootPorfLine).order_by(WootPorfLine.product_id).all()
+    assert [(line.product_id, line.quantity, str(line.total_price)) for line in lines] == [
+        ("X1", 4, "9.00"),
+        ("X2", 1, "10.00"),
+    ]
+
+
+def test_ingest_porf_returns_existing_porf_for_identical_bytes(db_app) -> None:
+    first = ingest_porf(_porf_csv(3), DriveService(None), SheetsService(None))
+    again = ingest_porf(_porf_csv(3), DriveService(None), SheetsService(None))
+
+    assert first["duplicate"] is False
+    assert again["duplicate"] is True
+    assert again["porf_id"] == first["porf_id"]
+    assert db.session.query(WootPorf).count() == 1
+    assert db.session.query(WootPorfLine).count() == 3
+
+
+def test_ingest_porf_yields_to_identical_upload_finishing_first(db_app) -> None:
+    upload = _porf_csv(3)
+    sha256 = hash_upload(upload)
+    winner = WootPorf(porf_no="WINNER")
+    db.session.add(winner)
+    db.session.commit()
+
+    def finish_twin(**counts) -> None:
+        db.session.add(WootPorfUpload(sha256=sha256, porf_id=winner.id, sheet_url=""))
+
+    result = ingest_porf(upload, DriveService(None), SheetsService(None), progress=finish_twin)
+
+    assert result["duplicate"] is True
+    assert result["porf_id"] == str(winner.id)
+    assert [porf.porf_no for porf in db.session.query(WootPorf)] == ["WINNER"]
+    assert db.session.query(WootPorfLine).count() == 0
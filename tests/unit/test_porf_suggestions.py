@@ -0,0 +1,61 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.channels.woot.models import WootPo, WootPoLine, WootPorf, WootPorfLine, WootPoStatus
+from app.channels.woot.suggest import PorfSuggester
+from app.core.insights import VelocityEngine
+from app.core.logic.catalog import CatalogManager
+from app.core.models import MasterProduct, OrderLine, OrderRecord
+from app.extensions import db
+
+AS_OF = date(2024, 3, 31)
+
+
+def _seed():
+    # FAST sells 2/day on every day of the last 90; SLOW sold once long ago.
+    for days_ago in range(90):
+        placed = datetime.combine(AS_OF - timedelta(days=days_ago), datetime.min.time(), timezone.utc)
+        order = OrderRecord(ext_id=str(days_ago), channel="woot", status="shipped", total="0", placed_at=placed)
+        order.lines = [OrderLine(sku="FAST", quantity=2)]
+        db.session.add(order)
+    fast, slow = MasterProduct(sku="FAST", title="Fast seller"), MasterProduct(sku="SLOW", title="Slow seller")
+    db.session.add_all([fast, slow])
+    porf = WootPorf(porf_no="P-1", total_value=0)
+    porf.lines = [
+        WootPorfLine(product_id="FAST", product_name="Fast", quantity=1, unit_price="2.00", total_price="2.00"),
+        WootPorfLine(product_id="FAST", product_name="Fast", quantity=1, unit_price="2.50", total_price="2.50"),
+    ]
+    db.session.add(porf)
+    db.session.flush()
+    for status, quantity in ((WootPoStatus.APPROVED, 10), (WootPoStatus.COMPLETED, 500)):
+        po = WootPo(po_no=f"PO-{status.value}", porf_id=porf.id, status=status)
+        po.lines = [WootPoLine(product_id="FAST", product_name="Fast", quantity=quantity, unit_price=2, total_price=0)]
+        db.session.add(po)
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    manager.adjust_inventory(fast.id, 20, "woot")
+    manager.adjust_inventory(slow.id, 3, "woot")
+
+
+def test_suggestion_nets_stock_and_open_pos(db_app) -> None:
+    _seed()
+    # A flat history makes the EWMA exactly 2/day: 2 * (21 + 30 + 7) - 20 on hand - 10 on open POs.
+    draft = PorfSuggester(db.session, engine=VelocityEngine(db.session, halflife=1e9)).suggest(as_of=AS_OF)
+
+    assert [line["product_id"] for line in draft["lines"]] == ["FAST"]
+    line = draft["lines"][0]
+    assert line["quantity"] == 86
+    assert line["on_order"] == 10 and line["on_hand"] == 20
+    assert line["product_name"] == "Fast seller"
+    assert str(line["unit_price"]) == "2.50" and str(line["total_price"]) == "215.00"
+    assert str(draft["total_value"]) == "215.00"
+
+
+def test_draft_endpoint(db_app) -> None:
+    _seed()
+    db_app.config["LOGIN_DISABLED"] = True
+    client = db_app.test_client()
+
+    draft = client.get("/api/woot/porfs/draft?as_of=2024-03-31&lead_time_days=0&cover_days=5&safety_days=0")
+    assert draft.status_code == 200
+    assert draft.get_json()["lines"] == []
+    assert client.get("/api/woot/porfs/draft?as_of=bogus").status_code == 400
@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+from app.channels.woot.validation import validate_chunk
+
+
+def test_validate_chunk_parses_fixed_point_columns() -> None:
+    rows = [
+        {"product_id": "A", "product_name": "a", "quantity": "3", "unit_price": "19.99"},
+        {"product_id": "B", "product_name": "b", "quantity": "2.0", "unit_price": ".5"},
+        {"product_id": "C", "product_name": "c", "quantity": "-1", "unit_price": "1e3"},
+    ]
+    chunk = validate_chunk(rows, first_row=2)
+
+    assert chunk.valid.tolist() == [True, True, False]
+    assert chunk.quantity.tolist()[:2] == [3, 2]
+    assert chunk.unit_cents.tolist()[:2] == [1999, 50]
+    assert chunk.total_cents.tolist()[:2] == [5997, 100]
+    assert [(e["row"], e["column"]) for e in chunk.errors] == [(4, "quantity"), (4, "unit_price")]
+
+    lines = chunk.lines(porf_id=7)
+    assert lines[0]["total_price"] == Decimal("59.97")
+    assert lines[1]["unit_price"] == Decimal("0.50")
+
+
+def test_validate_chunk_rejects_totals_outside_numeric_10_2() -> None:
+    rows = [{"product_id": "A", "quantity": "2000000", "unit_price": "99999.99"}]
+    chunk = validate_chunk(rows, first_row=2)
+
+    assert not chunk.valid.any()
+    assert chunk.errors == [{"row": 2, "column": "total_price", "reason": "exceeds Numeric(10, 2)"}]
@@ -0,0 +1,108 @@
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.insights import ReallocationService, VelocityEngine
+from app.core.logic.catalog import CatalogManager
+from app.core.logic.pagination import encode_cursor
+from app.core.models import (
+    MasterProduct,
+    OrderLine,
+    OrderRecord,
+    PurchaseOrder,
+    PurchaseOrderItem,
+    ReallocationCandidate,
+)
+from app.extensions import db
+
+AS_OF = date(2024, 3, 31)
+
+
+def _seed():
+    idle, busy, heavy = (
+        MasterProduct(sku=sku, title=sku, last_movement_at=datetime(2023, 12, 1)) for sku in ("IDLE", "BUSY", "HEAVY")
+    )
+    db.session.add_all([idle, busy, heavy])
+    db.session.flush()
+    po = PurchaseOrder(po_number="PO-1", supplier="ACME", total_amount=0)
+    db.session.add(po)
+    db.session.flush()
+    db.session.add(PurchaseOrderItem(order_id=po.id, product_id=heavy.id, quantity=1, unit_price=4.0, total_price=4.0))
+    for days_ago in range(30):
+        placed = datetime.combine(AS_OF - timedelta(days=days_ago), datetime.min.time(), timezone.utc)
+        order = OrderRecord(ext_id=str(days_ago), channel="woot", status="shipped", total="0", placed_at=placed)
+        order.lines = [OrderLine(sku="BUSY", quantity=1), OrderLine(sku="HEAVY", quantity=1)]
+        db.session.add(order)
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    manager.adjust_inventory(idle.id, 5, "amazon")
+    manager.adjust_inventory(busy.id, 10, "woot")
+    manager.adjust_inventory(heavy.id, 1000, "woot")
+    return idle, busy, heavy
+
+
+def test_generate_scores_and_is_rerunnable(db_app) -> None:
+    idle, busy, heavy = _seed()
+    service = ReallocationService(db.session)
+    engine = VelocityEngine(db.session)
+
+    assert service.generate_candidates(as_of=AS_OF, engine=engine)["upserted"] == 2
+    assert service.generate_candidates(as_of=AS_OF, engine=engine)["upserted"] == 2
+    rows = {c.product_id: c for c in db.session.query(ReallocationCandidate)}
+
+    assert set(rows) == {idle.id, heavy.id}
+    assert rows[idle.id].from_channel == "amazon" and rows[idle.id].days_of_cover is None
+    assert rows[heavy.id].days_of_cover == 1000.0
+    # 1000 on hand minus 30 days at 1/day, at the $4 PO price.
+    assert rows[heavy.id].value_at_risk == 3880.0
+    assert rows[heavy.id].score > rows[idle.id].score
+
+
+def test_candidates_that_recover_are_deactivated(db_app) -> None:
+    idle, _, heavy = _seed()
+    service = ReallocationService(db.session)
+    service.add_candidate(heavy, from_channel="manual", reason="hand picked")
+    service.generate_candidates(as_of=AS_OF)
+
+    CatalogManager(db.session).adjust_inventory(heavy.id, -990, "woot")
+    result = service.generate_candidates(as_of=AS_OF)
+
+    assert result["deactivated"] == 1
+    active = {(c.product_id, c.from_channel) for c in db.session.query(ReallocationCandidate).filter_by(is_active=True)}
+    assert active == {(idle.id, "amazon"), (heavy.id, "manual")}
+
+
+def test_candidate_pages_filter_and_eager_load_products(db_app) -> None:
+    service = ReallocationService(db.session)
+    products = [MasterProduct(sku=f"SKU{i}", title=f"Product {i}") for i in range(5)]
+    db.session.add_all(products)
+    db.session.flush()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i, product in enumerate(products):
+        db.session.add(
+            ReallocationCandidate(
+                product=product,
+                from_channel="woot" if i % 2 else "amazon",
+                reason="slow mover" if i < 4 else "damaged",
+                created_at=start + timedelta(hours=i // 2),  # pairs share a timestamp; id breaks the tie
+            )
+        )
+    db.session.commit()
+    db.session.expunge_all()
+
+    seen, before = [], None
+    while True:
+        page, before = service.candidate_page(limit=2, before=before, reason="slow")
+        assert all("product" in row.__dict__ for row in page)
+        seen += [row.product.sku for row in page]
+        if before is None:
+            break
+    assert seen == ["SKU3", "SKU2", "SKU1", "SKU0"]
+    assert [row.product.sku for row in service.candidate_page(channel="woot")[0]] == ["SKU3", "SKU1"]
+
+    client = db_app.test_client()
+    page = client.get("/api/insights/reallocation-candidates?limit=3").get_json()
+    assert [item["product"]["sku"] for item in page["items"]] == ["SKU4", "SKU3", "SKU2"]
+    page = client.get(f"/api/insights/reallocation-candidates?limit=3&cursor={page['next_cursor']}").get_json()
+    assert [item["product"]["sku"] for item in page["items"]] == ["SKU1", "SKU0"]
+    assert page["next_cursor"] is None
+    assert len(client.get("/api/insights/reallocation-candidates?limit=-5").get_json()["items"]) == 1
+    assert client.get(f"/api/insights/reallocation-candidates?cursor={encode_cursor([1, 2, 3])}").status_code == 400
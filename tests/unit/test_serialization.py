@@ -0,0 +1,52 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.channels.woot.models import WootPorfStatus
+from app.core.models import MasterProduct
+from app.core.serialization import SerializerRegistry, dumps, loads, to_dict
+from app.extensions import db
+
+
+def test_registry_compiles_column_getters(db_app) -> None:
+    product = MasterProduct(sku="SKU1", title="Thing", extra_data={"color": "red"})
+    db.session.add(product)
+    db.session.commit()
+
+    assert product.to_dict()["sku"] == "SKU1"
+    assert set(product.to_dict()) == {column.name for column in MasterProduct.__table__.columns}
+
+    registry = SerializerRegistry()
+    registry.register(MasterProduct, fields=["id", "sku", "title"], exclude=["title"])
+    assert registry.serializer_for(MasterProduct)(product) == {"id": product.id, "sku": "SKU1"}
+
+
+def test_dumps_handles_decimal_datetime_enum_and_rows(db_app) -> None:
+    db.session.add(MasterProduct(sku="SKU1", title="Thing"))
+    db.session.commit()
+    row = db.session.execute(select(MasterProduct.sku, MasterProduct.title)).one()
+
+    payload = {
+        "price": Decimal("2.50"),
+        "at": datetime(2024, 1, 2, 3, 4, 5),
+        "status": WootPorfStatus.DRAFT,
+        "row": row,
+        "product": db.session.query(MasterProduct).one(),
+    }
+    decoded = loads(dumps(payload))
+
+    assert decoded["price"] == "2.50" and decoded["at"] == "2024-01-02T03:04:05"
+    assert decoded["status"] == "draft" and decoded["row"] == {"sku": "SKU1", "title": "Thing"}
+    assert decoded["product"]["sku"] == "SKU1"
+    assert to_dict([row]) == [{"sku": "SKU1", "title": "Thing"}]
+
+
+def test_flask_responses_use_the_fast_provider(db_app) -> None:
+    db.session.add(MasterProduct(sku="SKU1", title="Thing"))
+    db.session.commit()
+
+    resp = db_app.test_client().get("/api/catalog/products?fields=sku,created_at")
+    assert resp.mimetype == "application/json"
+    item = resp.get_json()["items"][0]
+    assert item["sku"] == "SKU1" and datetime.fromisoformat(item["created_at"])
@@ -0,0 +1,64 @@
+from app.core.services.google.sheets import GoogleSheetsService
+
+
+class _Request:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class _FakeSpreadsheets:
+    def __init__(self):
+        self.value_batches = []
+        self.requests = []
+
+    def values(self):
+        return self
+
+    def batchUpdate(self, spreadsheetId, body):
+        if "requests" in body:
+            self.requests.append(body["requests"])
+        else:
+            self.value_batches.append(body["data"])
+        return _Request({"spreadsheetId": spreadsheetId})
+
+
+def _service(fake):
+    service = GoogleSheetsService(None)
+    service.spreadsheets = fake
+    return service
+
+
+def test_ranges_on_several_tabs_share_one_request() -> None:
+    fake = _FakeSpreadsheets()
+    responses = _service(fake).batch_update_values(
+        "sheet-1",
+        [
+            ("Lines!A1:C1", [["a", "b", "c"]]),
+            ("Lines!A2", [[1, 2, 3], [4, 5, 6]]),
+            ("Summary!A1", [["total", 21]]),
+        ],
+    )
+
+    assert len(responses) == 1
+    assert [entry["range"] for entry in fake.value_batches[0]] == ["Lines!A1:C1", "Lines!A2", "Summary!A1"]
+    assert fake.requests == []
+
+
+def test_oversized_payload_is_split_by_rows() -> None:
+    fake = _FakeSpreadsheets()
+    rows = [[f"row-{i}", i] for i in range(100)]
+    writer = _service(fake).batch_writer("sheet-1", max_bytes=400)
+    writer.add_values("Data!B5", rows)
+    writer.add_request({"repeatCell": {}})
+    writer.flush()
+
+    assert len(fake.requests) == 1
+    assert len(fake.value_batches) > 1
+    written = [row for batch in fake.value_batches for entry in batch for row in entry["values"]]
+    assert written == rows
+    first, second = fake.value_batches[0][0], fake.value_batches[1][0]
+    assert first["range"] == "Data!B5"
+    assert second["range"] == f"Data!B{5 + len(first['values'])}"
@@ -0,0 +1,67 @@
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.core.services.google.sheets import GoogleSheetsService, SheetsAppendError
+
+
+class _Request:
+    def __init__(self, fake, body):
+        self._fake = fake
+        self._body = body
+
+    def execute(self):
+        if self._fake.failures:
+            status = self._fake.failures.pop(0)
+            raise HttpError(httplib2.Response({"status": status}), b"{}")
+        self._fake.appended.append(self._body["values"])
+        return {}
+
+
+class _FakeSpreadsheets:
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.appended = []
+
+    def values(self):
+        return self
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        return _Request(self, body)
+
+
+def _service(fake):
+    service = GoogleSheetsService(None)
+    service.spreadsheets = fake
+    return service
+
+
+def test_rows_are_sent_in_blocks_and_transient_errors_retried() -> None:
+    fake = _FakeSpreadsheets(failures=[429, 503])
+    delays = []
+    offsets = []
+    rows = ([i] for i in range(7))
+
+    committed = _service(fake).append_rows_chunked(
+        "sheet-1", rows, chunk_size=3, sleep=delays.append, on_commit=offsets.append
+    )
+
+    assert committed == 7
+    assert fake.appended == [[[0], [1], [2]], [[3], [4], [5]], [[6]]]
+    assert offsets == [3, 6, 7]
+    assert len(delays) == 2 and delays[1] > delays[0] / 2
+
+
+def test_failed_append_reports_offset_and_resumes() -> None:
+    rows = [[i] for i in range(5)]
+    fake = _FakeSpreadsheets()
+    service = _service(fake)
+    service.append_rows_chunked("sheet-1", rows[:2], chunk_size=2)
+    fake.failures = [400]
+
+    with pytest.raises(SheetsAppendError) as excinfo:
+        service.append_rows_chunked("sheet-1", rows, chunk_size=2, start_offset=2, sleep=lambda _: None)
+    assert excinfo.value.committed == 2
+
+    assert service.append_rows_chunked("sheet-1", rows, chunk_size=2, start_offset=excinfo.value.committed) == 5
+    assert [row for block in fake.appended for row in block] == rows
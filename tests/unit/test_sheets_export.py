@@ -0,0 +1,108 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.channels.woot.models import WootPorf, WootPorfStatus
+from app.channels.woot.service import WootOrderService
+from app.core.models import MasterProduct
+from app.core.services.sheets import SheetColumn, SheetSchema, SheetsService
+from app.extensions import db
+
+
+class _Request:
+    def __init__(self, fake, body):
+        self._fake, self._body = fake, body
+
+    def execute(self):
+        self._fake.appended.append(self._body["values"])
+        return {}
+
+
+class _FakeSpreadsheets:
+    def __init__(self):
+        self.appended = []
+
+    def values(self):
+        return self
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        return _Request(self, body)
+
+
+def _service(fake):
+    service = SheetsService(None)
+    service.spreadsheets = fake
+    return service
+
+
+PORF_SHEET = SheetSchema(WootPorf, [
+    SheetColumn("No", "porf_no"),
+    SheetColumn("Status", "status"),
+    SheetColumn("Total", "total_value"),
+    SheetColumn("Created", "created_at"),
+    SheetColumn("Extra", "extra_data"),
+])
+
+
+def test_rows_are_mapped_and_formatted(db_app) -> None:
+    db.session.add_all([
+        WootPorf(porf_no="P1", status=WootPorfStatus.APPROVED, total_value=Decimal("12.50"),
+                 created_at=datetime(2024, 3, 1, 9, 30, 5, 123), extra_data={"a": 1}),
+        WootPorf(porf_no="P2", total_value=0, created_at=datetime(2024, 3, 2)),
+    ])
+    db.session.commit()
+    fake = _FakeSpreadsheets()
+
+    report = _service(fake).export_schema(db.session, PORF_SHEET, "sheet-1")
+
+    assert fake.appended == [[
+        ["No", "Status", "Total", "Created", "Extra"],
+        ["P1", "approved", 12.5, "2024-03-01 09:30:05", '{"a":1}'],
+        ["P2", "draft", 0.0, "2024-03-02 00:00:00", ""],
+    ]]
+    assert (report.committed, report.rows, report.requests) == (3, 3, 1)
+    assert report.as_dict()["rows_written"] == 3
+
+
+def test_blocks_are_sized_by_bytes_and_resume(db_app) -> None:
+    db.session.add_all([MasterProduct(sku=f"SKU{i:03d}", title="x" * 40) for i in range(50)])
+    db.session.commit()
+    schema = SheetSchema(MasterProduct, [SheetColumn("SKU", "sku"), SheetColumn("Title", "title")])
+    fake = _FakeSpreadsheets()
+
+    report = _service(fake).export_schema(db.session, schema, "sheet-1", max_bytes=600, batch_size=7)
+
+    assert report.committed == 51 and report.requests == len(fake.appended) > 1
+    assert all(len(block) == report.chunk_rows for block in fake.appended[:-1])
+    assert [row[0] for block in fake.appended for row in block] == ["SKU"] + [f"SKU{i:03d}" for i in range(50)]
+
+    fake.appended.clear()
+    resumed = _service(fake).export_schema(db.session, schema, "sheet-1", start_offset=41)
+    assert resumed.rows == 10
+    assert [row[0] for row in fake.appended[0]] == [f"SKU{i:03d}" for i in range(40, 50)]
+
+
+def test_products_route_reports_throughput(db_app, monkeypatch) -> None:
+    fake = _FakeSpreadsheets()
+    monkeypatch.setattr("app.api.export.SheetsService", lambda credentials: _service(fake))
+    db.session.add(MasterProduct(sku="A", title="A"))
+    db.session.commit()
+
+    response = db_app.test_client().post(
+        "/api/export/sheets/products", json={"spreadsheet_id": "s", "range_name": "Products!A1"}
+    )
+
+    body = response.get_json()
+    assert body["rows_written"] == 2 and body["requests"] == 1 and "rows_per_second" in body
+    assert fake.appended[0][0][:3] == ["ID", "SKU", "Title"]
+    assert fake.appended[0][1][1:4] == ["A", "A", ""]
+
+
+def test_woot_order_export_uses_order_sheet(db_app) -> None:
+    db.session.add(WootPorf(porf_no="P9", total_value=5))
+    db.session.commit()
+    fake = _FakeSpreadsheets()
+
+    report = WootOrderService(db.session, _service(fake)).export_to_sheets("s", "Orders!A1")
+
+    assert report.committed == 2
+    assert fake.appended[0][1][1:4] == ["P9", "draft", 5.0]
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app.core.insights import InventoryInsights
+from app.core.logic.catalog import CatalogManager
+from app.core.logic.pagination import encode_cursor
+from app.core.models import InventoryRecord, MasterProduct
+from app.extensions import db
+
+
+def _catalog():
+    now = datetime.utcnow()
+    stale = MasterProduct(sku="STALE", title="Never moved", created_at=now - timedelta(days=200))
+    old = MasterProduct(sku="OLD", title="Moved long ago", created_at=now - timedelta(days=300))
+    busy = MasterProduct(sku="BUSY", title="Moves", created_at=now - timedelta(days=300))
+    db.session.add_all([stale, old, busy])
+    db.session.flush()
+    moved = now - timedelta(days=100)
+    db.session.add(InventoryRecord(product_id=old.id, quantity_delta=5, source="woot", created_at=moved))
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    manager.refresh_last_movement()
+    manager.adjust_inventory(busy.id, 1, "woot")
+    return stale, old, busy
+
+
+def test_slow_mover_pages_follow_last_movement(db_app) -> None:
+    stale, old, busy = _catalog()
+    insights = InventoryInsights(db.session)
+
+    first, after = insights.slow_mover_page(days=60, limit=1)
+    second, end = insights.slow_mover_page(days=60, limit=1, after=after)
+
+    assert [row.sku for row in first + second] == ["STALE", "OLD"]
+    assert end is None
+    assert {product.sku for product in insights.slow_movers(60)} == {"STALE", "OLD"}
+
+
+def test_adjust_inventory_moves_last_movement_forward(db_app) -> None:
+    stale, _, _ = _catalog()
+    CatalogManager(db.session).adjust_inventory(stale.id, -1, "amazon")
+    db.session.expire_all()
+
+    assert [row.sku for row in InventoryInsights(db.session).slow_mover_page(days=60)[0]] == ["OLD"]
+
+
+def test_slow_movers_endpoint_pages_with_cursor(db_app) -> None:
+    _catalog()
+    client = db_app.test_client()
+
+    page = client.get("/api/insights/slow-movers?days=60&limit=1").get_json()
+    assert [item["sku"] for item in page["items"]] == ["STALE"]
+    page = client.get(f"/api/insights/slow-movers?days=60&limit=1&cursor={page['next_cursor']}").get_json()
+    assert [item["sku"] for item in page["items"]] == ["OLD"]
+    assert page["next_cursor"] is None
+    assert client.get("/api/insights/slow-movers?cursor=%%%").status_code == 400
+    assert client.get(f"/api/insights/slow-movers?cursor={encode_cursor([1])}").status_code == 400
+    assert len(client.get("/api/insights/slow-movers?days=60&limit=0").get_json()["items"]) == 1
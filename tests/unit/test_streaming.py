@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.channels.woot.models import WootPorf
+from app.core.logic.catalog import CatalogManager
+from app.core.models import InventoryRecord, MasterProduct
+from app.core.streaming import CSV, NDJSON, csv_chunks, iter_batches
+from app.extensions import db
+
+
+def _seed(count: int = 5) -> MasterProduct:
+    product = MasterProduct(sku="A", title="A")
+    db.session.add(product)
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    for delta in range(1, count + 1):
+        manager.adjust_inventory(product.id, delta, "woot")
+    return product
+
+
+def test_inventory_streams_ndjson_newest_first(db_app) -> None:
+    product = _seed()
+    response = db_app.test_client().get(
+        f"/api/catalog/inventory?product_id={product.id}&fields=id,quantity_delta,created_at&limit=2",
+        headers={"Accept": NDJSON},
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == NDJSON
+    assert response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["quantity_delta"] for row in rows] == [5, 4, 3, 2, 1]
+    assert set(rows[0]) == {"id", "quantity_delta", "created_at"}
+
+
+def test_inventory_streams_csv_with_header(db_app) -> None:
+    _seed(3)
+    response = db_app.test_client().get(
+        "/api/catalog/inventory?fields=quantity_delta,source,notes", headers={"Accept": CSV}
+    )
+
+    assert response.mimetype == CSV
+    assert list(csv.reader(io.StringIO(response.get_data(as_text=True)))) == [
+        ["quantity_delta", "source", "notes"],
+        ["3", "woot", ""],
+        ["2", "woot", ""],
+        ["1", "woot", ""],
+    ]
+
+
+def test_json_stays_default_and_bad_fields_rejected(db_app) -> None:
+    _seed(2)
+    client = db_app.test_client()
+
+    assert "items" in client.get("/api/catalog/inventory", headers={"Accept": "*/*"}).get_json()
+    response = client.get("/api/catalog/inventory?fields=secret", headers={"Accept": NDJSON})
+    assert response.status_code == 400
+
+
+def test_batches_are_bounded(db_app) -> None:
+    _seed(5)
+    query = select(InventoryRecord.id, InventoryRecord.quantity_delta).order_by(InventoryRecord.id)
+
+    batches = list(iter_batches(db.session, query, batch_size=2))
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    chunks = list(csv_chunks(batches, ["id", "quantity_delta"]))
+    assert chunks[0] == b"id,quantity_delta\r\n"
+    assert len(chunks) == 4
+
+
+def test_woot_orders_stream_porf_columns(db_app) -> None:
+    db_app.config["LOGIN_DISABLED"] = True
+    db.session.add_all([
+        WootPorf(porf_no="P1", total_value=Decimal("12.50"), created_at=datetime(2024, 3, 1)),
+        WootPorf(porf_no="P2", total_value=0, created_at=datetime(2024, 3, 5)),
+        WootPorf(porf_no="LATE", total_value=0, created_at=datetime(2024, 4, 1)),
+    ])
+    db.session.commit()
+    client = db_app.test_client()
+    url = "/api/woot/orders?start_date=2024-03-01&end_date=2024-03-31"
+
+    response = client.get(f"{url}&fields=porf_no,status,total_value", headers={"Accept": NDJSON})
+    assert response.status_code == 200 and response.is_streamed
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert rows == [
+        {"porf_no": "P1", "status": "draft", "total_value": "12.50"},
+        {"porf_no": "P2", "status": "draft", "total_value": "0.00"},
+    ]
+
+    response = client.get(url, headers={"Accept": CSV})
+    (header, *lines) = csv.reader(io.StringIO(response.get_data(as_text=True)))
+    assert "porf_no" in header and len(lines) == 2
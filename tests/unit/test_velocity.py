@@ -0,0 +1,68 @@
+import math
+from datetime import date, datetime, timedelta, timezone
+
+from app.core.insights import VelocityEngine
+from app.core.logic.catalog import CatalogManager
+from app.core.models import MasterProduct, OrderLine, OrderRecord
+from app.extensions import db
+
+AS_OF = date(2024, 3, 31)
+
+
+def _order(channel, days_ago, lines, status="shipped"):
+    placed = datetime.combine(AS_OF - timedelta(days=days_ago), datetime.min.time(), timezone.utc) + timedelta(hours=12)
+    order = OrderRecord(ext_id=f"{channel}-{days_ago}-{len(lines)}", channel=channel, status=status, total="0",
+                        placed_at=placed)
+    order.lines = [OrderLine(sku=sku, quantity=qty) for sku, qty in lines]
+    db.session.add(order)
+
+
+def _seed():
+    for days_ago in range(30):
+        _order("woot", days_ago, [("A", 2)])
+    _order("woot", 0, [("B", 7)])
+    _order("woot", 1, [("B", 100)], status="cancelled")
+    _order("woot", 120, [("B", 50)])
+    _order("amazon", 3, [("A", 14)])
+    db.session.commit()
+    a, c = MasterProduct(sku="A", title="A"), MasterProduct(sku="C", title="C")
+    db.session.add_all([a, c])
+    db.session.commit()
+    manager = CatalogManager(db.session)
+    manager.adjust_inventory(a.id, 60, "woot")
+    manager.adjust_inventory(c.id, 5, "woot")
+
+
+def test_velocity_cover_and_sell_through_per_channel(db_app) -> None:
+    _seed()
+    report = VelocityEngine(db.session).compute(as_of=AS_OF)
+    rows = {(row["channel"], row["sku"]): row for row in report.rows()}
+
+    assert set(rows) == {("amazon", "A"), ("woot", "A"), ("woot", "B"), ("woot", "C")}
+    woot_a = rows[("woot", "A")]
+    assert woot_a["velocity_7d"] == 2 and woot_a["velocity_30d"] == 2
+    assert math.isclose(woot_a["velocity_90d"], 60 / 90)
+    assert woot_a["on_hand"] == 60 and woot_a["days_of_cover"] == 30
+    assert woot_a["sell_through"] == 0.5
+    assert 0 < woot_a["ewma"] < 2
+    # Cancelled and out-of-window orders are ignored; unsold stock has no finite cover.
+    assert rows[("woot", "B")]["velocity_7d"] == 1
+    assert rows[("woot", "C")]["days_of_cover"] is None
+    assert rows[("amazon", "A")]["on_hand"] == 0 and rows[("amazon", "A")]["days_of_cover"] == 0
+
+
+def test_combined_channels_and_channel_filter(db_app) -> None:
+    _seed()
+    engine = VelocityEngine(db.session, windows=(7,), cover_window=7)
+
+    combined = {row["sku"]: row for row in engine.compute(as_of=AS_OF, combine_channels=True).rows()}
+    assert combined["A"]["velocity_7d"] == 4
+    assert combined["A"]["on_hand"] == 60
+
+    amazon = engine.compute(as_of=AS_OF, channel="amazon")
+    assert list(amazon.sku) == ["A"] and len(amazon) == 1
+
+
+def test_empty_history(db_app) -> None:
+    report = VelocityEngine(db.session).compute(as_of=AS_OF)
+    assert len(report) == 0 and report.rows() == []
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.channels.woot.models import WootPorf, WootPorfLine
+from app.extensions import db
+
+
+@contextmanager
+def _count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def _porfs(count, lines_each, prefix="P"):
+    for i in range(count):
+        porf = WootPorf(porf_no=f"{prefix}-{i}", total_value=0)
+        porf.lines = [
+            WootPorfLine(product_id=f"SKU{j}", product_name="x", quantity=j + 1, unit_price=2, total_price=2 * (j + 1))
+            for j in range(lines_each)
+        ]
+        db.session.add(porf)
+    db.session.commit()
+
+
+def test_line_modes_use_constant_queries(db_app) -> None:
+    db_app.config["LOGIN_DISABLED"] = True
+    client = db_app.test_client()
+    _porfs(3, 2)
+    with _count_queries() as small:
+        client.get("/api/woot/porfs?lines=full&limit=1000")
+    _porfs(60, 3, prefix="Q")
+    with _count_queries() as large:
+        page = client.get("/api/woot/porfs?lines=full&limit=1000").get_json()
+
+    assert len(large) == len(small) == 2
+    assert len(page["items"]) == 63
+    assert sum(len(item["lines"]) for item in page["items"]) == 3 * 2 + 60 * 3
+
+
+def test_line_summary_is_computed_in_sql(db_app) -> None:
+    db_app.config["LOGIN_DISABLED"] = True
+    _porfs(2, 3)
+    db.session.add(WootPorf(porf_no="EMPTY", total_value=0))
+    db.session.commit()
+    client = db_app.test_client()
+
+    items = client.get("/api/woot/porfs?lines=summary&fields=porf_no").get_json()["items"]
+    summary = {item["porf_no"]: (item["line_count"], item["line_quantity"], item["line_total"]) for item in items}
+    assert summary == {"P-0": (3, 6, 12.0), "P-1": (3, 6, 12.0), "EMPTY": (0, 0, 0.0)}
+    assert "lines" not in items[0]
+    assert client.get("/api/woot/porfs?lines=everything").status_code == 400
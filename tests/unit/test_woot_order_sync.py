@@ -0,0 +1,86 @@
+from app.channels.woot.sync import WootOrderSync
+from app.core.models import OrderLine, OrderRecord, SyncCursor
+from app.extensions import db
+
+
+class _FakeWoot:
+    def __init__(self, orders, per_page=None):
+        self.orders = orders
+        self.per_page = per_page
+        self.calls = []
+
+    def get_orders(self, start_date=None, updated_since=None, page=None):
+        if page == 1:
+            self.calls.append(updated_since)
+        orders = self.orders
+        if updated_since is not None:
+            orders = [order for order in orders if order["updated_at"] >= updated_since.isoformat()]
+        if self.per_page is None:
+            return list(orders)
+        start = (page - 1) * self.per_page
+        return {"items": orders[start:start + self.per_page], "total_pages": -(-len(orders) // self.per_page)}
+
+
+def _order(ext_id, updated_at, status="paid", quantity=1):
+    return {
+        "id": ext_id,
+        "status": status,
+        "total": "10.00",
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "updated_at": updated_at,
+        "items": [{"sku": f"SKU-{ext_id}", "quantity": quantity, "unit_price": "10.00"}],
+    }
+
+
+def test_first_sync_writes_everything_in_batches(db_app) -> None:
+    woot = _FakeWoot([_order(f"W{i}", f"2024-01-0{i + 1}T00:00:00+00:00") for i in range(5)])
+
+    result = WootOrderSync(db.session, woot, batch_size=2).run()
+
+    assert result["synced"] == 5
+    assert woot.calls == [None]
+    assert db.session.query(OrderRecord).filter_by(channel="woot").count() == 5
+    assert db.session.query(OrderLine).count() == 5
+    cursor = db.session.query(SyncCursor).filter_by(channel="woot").one()
+    assert cursor.last_ext_id == "W4"
+
+
+def test_steady_state_sync_writes_only_changed_orders(db_app) -> None:
+    woot = _FakeWoot([_order("W1", "2024-01-01T00:00:00+00:00"), _order("W2", "2024-01-02T00:00:00+00:00")])
+    sync = WootOrderSync(db.session, woot)
+    sync.run()
+
+    assert sync.run()["synced"] == 0
+
+    woot.orders[0] = _order("W1", "2024-01-03T00:00:00+00:00", status="shipped", quantity=4)
+    result = sync.run()
+
+    # The inclusive bound refetches W2, but only W1 moved past the cursor.
+    assert (result["fetched"], result["synced"], result["cursor"]["ext_id"]) == (2, 1, "W1")
+    assert woot.calls[-1].isoformat() == "2024-01-02T00:00:00+00:00"
+    record = db.session.query(OrderRecord).filter_by(ext_id="W1").one()
+    assert record.status == "shipped"
+    assert [line.quantity for line in db.session.query(OrderLine).filter_by(order_id=record.id)] == [4]
+    assert db.session.query(OrderRecord).count() == 2
+
+
+def test_sync_reads_every_page(db_app) -> None:
+    woot = _FakeWoot([_order(f"W{i}", f"2024-01-0{9 - i}T00:00:00+00:00") for i in range(5)], per_page=2)
+
+    result = WootOrderSync(db.session, woot).run()
+
+    assert (result["fetched"], result["synced"], result["cursor"]["ext_id"]) == (5, 5, "W0")
+    assert db.session.query(OrderRecord).count() == 5
+
+
+def test_sync_runs_on_migrated_schema(migrated_app) -> None:
+    woot = _FakeWoot([_order("W1", "2024-01-01T00:00:00+00:00"), _order("W2", "2024-01-02T00:00:00+00:00")])
+    sync = WootOrderSync(db.session, woot)
+    sync.run()
+
+    woot.orders[0] = _order("W1", "2024-01-03T00:00:00+00:00", status="shipped", quantity=4)
+    assert sync.run()["synced"] == 1
+
+    record = db.session.query(OrderRecord).filter_by(ext_id="W1").one()
+    assert record.status == "shipped" and record.is_active
+    assert [line.quantity for line in record.lines] == [4]